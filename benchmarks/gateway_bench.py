@@ -0,0 +1,158 @@
+"""
+Gateway benchmark: latency, throughput, compression and micro-cache hit rate through nginx.
+
+Scenarios (all authenticated):
+  history-cached    GET /v1/search/history           same URI, served by the 5s micro-cache
+  history-proxied   GET /v1/search/history?n=<i>     unique URI per request, always proxied
+                                                     (measures upstream keep-alive)
+  search            POST /v1/search/linkedin         opt-in with --include-search (spends Exa/Gemini quota)
+
+Reproducing the before/after comparison:
+    # new gateway (docker-compose up -d) on :8000, backends on :8001/:8002
+    git show <baseline-rev>:docker/nginx.conf > /tmp/nginx.baseline.conf
+    docker run -d --rm -p 8080:8000 --add-host host.docker.internal:host-gateway \\
+        -v /tmp/nginx.baseline.conf:/etc/nginx/nginx.conf:ro nginx:alpine
+    python benchmarks/gateway_bench.py --url http://localhost:8000 --baseline-url http://localhost:8080 \\
+        --jwt-secret "$SUPABASE_JWT_SECRET"
+
+Requires httpx (and python-jose for --jwt-secret), both already in the service requirements.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from collections import Counter
+from typing import Dict, List
+
+import httpx
+
+
+def mint_token(secret: str, sub: str, ttl: int = 3600) -> str:
+    from jose import jwt
+
+    claims = {"sub": sub, "aud": "authenticated", "exp": int(time.time()) + ttl}
+    return jwt.encode(claims, secret, algorithm="HS256")
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run_scenario(
+    base_url: str,
+    scenario: str,
+    token: str,
+    requests: int,
+    concurrency: int,
+    query: str
+) -> Dict:
+    headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": "gzip"}
+    latencies: List[float] = []
+    wire_bytes: List[int] = []
+    cache_status: Counter = Counter()
+    statuses: Counter = Counter()
+    counter = iter(range(requests))
+
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        headers=headers,
+        timeout=60.0,
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+    ) as client:
+
+        async def one(i: int) -> None:
+            if scenario == "history-cached":
+                request = client.build_request("GET", "/v1/search/history", params={"limit": 10})
+            elif scenario == "history-proxied":
+                request = client.build_request("GET", "/v1/search/history", params={"limit": 10, "n": i})
+            else:
+                request = client.build_request("POST", "/v1/search/linkedin", json={"query": query, "limit": 10})
+            started = time.perf_counter()
+            response = await client.send(request)
+            await response.aread()
+            latencies.append((time.perf_counter() - started) * 1000)
+            wire_bytes.append(response.num_bytes_downloaded)
+            statuses[response.status_code] += 1
+            cache_status[response.headers.get("x-cache-status", "-")] += 1
+
+        async def worker() -> None:
+            for i in counter:
+                await one(i)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    hits = cache_status.get("HIT", 0) + cache_status.get("UPDATING", 0) + cache_status.get("STALE", 0)
+    return {
+        "target": base_url,
+        "scenario": scenario,
+        "requests": requests,
+        "concurrency": concurrency,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 0.50), 2),
+        "p95_ms": round(_percentile(latencies, 0.95), 2),
+        "p99_ms": round(_percentile(latencies, 0.99), 2),
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+        "avg_wire_bytes": round(statistics.fmean(wire_bytes)) if wire_bytes else 0,
+        "cache_hit_pct": round(100 * hits / requests, 1),
+        "statuses": dict(statuses),
+    }
+
+
+def _print_table(results: List[Dict]) -> None:
+    columns = ["scenario", "target", "rps", "p50_ms", "p95_ms", "p99_ms", "avg_wire_bytes", "cache_hit_pct", "statuses"]
+    print(" | ".join(columns))
+    for row in results:
+        print(" | ".join(str(row[column]) for column in columns))
+
+
+async def main_async(args: argparse.Namespace) -> List[Dict]:
+    token = args.token or os.environ.get("BENCH_TOKEN")
+    if args.jwt_secret:
+        token = mint_token(args.jwt_secret, args.user)
+    if not token:
+        raise SystemExit("Provide --token, BENCH_TOKEN or --jwt-secret")
+
+    scenarios = ["history-cached", "history-proxied"] + (["search"] if args.include_search else [])
+    targets = [args.url] + ([args.baseline_url] if args.baseline_url else [])
+    results = []
+    for scenario in scenarios:
+        requests = args.search_requests if scenario == "search" else args.requests
+        for target in targets:
+            # --- Warm connections (and the cache) before measuring ---
+            await run_scenario(target, scenario, token, min(args.concurrency, requests), args.concurrency, args.query)
+            results.append(await run_scenario(target, scenario, token, requests, args.concurrency, args.query))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000", help="gateway under test")
+    parser.add_argument("--baseline-url", help="second gateway (e.g. the previous config) to compare against")
+    parser.add_argument("--token", help="bearer token (or set BENCH_TOKEN)")
+    parser.add_argument("--jwt-secret", help="mint an HS256 token with this Supabase JWT secret instead")
+    parser.add_argument("--user", default="gateway-bench-user", help="subject for a minted token")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--include-search", action="store_true", help="also benchmark POST /v1/search/linkedin")
+    parser.add_argument("--search-requests", type=int, default=20)
+    parser.add_argument("--query", default="machine learning engineers in Berlin")
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Model construction benchmark for parsed Exa results.
+
+Isolates, per page of N raw Exa results (microseconds per page):
+  extract      text parsing only (regexes and splits in PersonResultParser)
+  per_object   validating every WorkExperienceItem / EducationItem / PersonResult as it is
+               built, then wrapping in ExaSearchResponse and SearchResponse (previous path)
+  construct    the same objects built with model_construct (no validation, for reference)
+  page_once    the extracted dicts validated as one List[PersonResult] (current path)
+  end_to_end   SearchResponse.from_exa_response on the raw page (extract + page_once + wrappers)
+
+    python benchmarks/model_construction_bench.py --results 50 --iterations 200
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+SEARCH_SERVICE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "services", "search-service")
+sys.path.insert(0, SEARCH_SERVICE)
+
+from app.models.parsers import PersonResultParser, _person_results_adapter  # noqa: E402
+from app.models.search import (  # noqa: E402
+    EducationItem,
+    ExaSearchResponse,
+    PersonResult,
+    SearchMetadata,
+    SearchResponse,
+    WorkExperienceItem,
+)
+
+
+class RawPage:
+    """Shape of the Exa SDK response the parser consumes."""
+
+    def __init__(self, results: List[dict]):
+        self.results = results
+        self.auto_date = None
+        self.autoprompt_string = None
+        self.resolved_search_type = "neural"
+        self.cost_dollars = {"total": 0.005}
+
+
+def build_raw_page(results: int, jobs: int, degrees: int) -> RawPage:
+    raw = []
+    for i in range(results):
+        experience = "".join(
+            f"- ### Senior Engineer {j} at [Company {(i + j) % 400}]\n{2012 + j} - {2014 + j} • 2 years\n"
+            for j in range(jobs)
+        )
+        education = "".join(
+            f"- ### Master's degree || Computer Science {k} at [University {(i + k) % 90}]\n"
+            for k in range(degrees)
+        )
+        skills = ", ".join(f"Skill{(i * 7 + s) % 60}" for s in range(12))
+        text = (
+            f"# Person {i} [us]\n## About me\nBuilds search and ranking systems, profile {i}.\n"
+            f"## Experience\n{experience}## Education\n{education}skills: [{skills}]\n"
+        )
+        raw.append({
+            "id": f"https://www.linkedin.com/in/person-{i}",
+            "url": f"https://www.linkedin.com/in/person-{i}",
+            "title": f"Person {i} - Senior Engineer",
+            "author": f"Person {i}",
+            "image": f"https://media.licdn.com/person-{i}.jpg",
+            "text": text,
+        })
+    return RawPage(raw)
+
+
+def extract(page: RawPage) -> List[dict]:
+    """Run only the text extraction, returning plain field dicts."""
+    return [PersonResultParser.extract_fields(result) for result in page.results]
+
+
+def wrap(people: List[PersonResult]) -> SearchResponse:
+    wrapped = ExaSearchResponse(results=people, resolved_search_type="neural", cost_dollars={"total": 0.005})
+    metadata = SearchMetadata(total_results=len(people), search_time_ms=0.0, enhanced_query=None)
+    return SearchResponse(results=wrapped.results, metadata=metadata)
+
+
+def build_per_object(extracted: List[dict], construct: bool = False) -> SearchResponse:
+    def make(model, **fields):
+        return model.model_construct(**fields) if construct else model(**fields)
+
+    people = [
+        make(
+            PersonResult,
+            **{key: value for key, value in person.items() if key not in ("work_experience", "education")},
+            work_experience=[make(WorkExperienceItem, **item) for item in person["work_experience"]],
+            education=[make(EducationItem, **item) for item in person["education"]],
+        )
+        for person in extracted
+    ]
+    return wrap(people)
+
+
+def build_page_once(extracted: List[dict]) -> SearchResponse:
+    return wrap(_person_results_adapter.validate_python(extracted))
+
+
+def us_per_page(fn: Callable[[], object], iterations: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def run(results: int, jobs: int, degrees: int, iterations: int) -> Dict:
+    page = build_raw_page(results, jobs, degrees)
+    extracted = extract(page)
+
+    expected = build_per_object(extracted).model_dump()
+    assert build_per_object(extracted, construct=True).model_dump() == expected, "construction paths disagree"
+    assert build_page_once(extracted).model_dump() == expected, "construction paths disagree"
+    assert SearchResponse.from_exa_response(page).model_dump()["results"] == expected["results"], "parser disagrees"
+
+    return {
+        "results": results,
+        "work_items_per_result": jobs,
+        "education_items_per_result": degrees,
+        "iterations": iterations,
+        "us_per_page": {
+            "extract": round(us_per_page(lambda: extract(page), iterations)),
+            "per_object": round(us_per_page(lambda: build_per_object(extracted), iterations)),
+            "construct": round(us_per_page(lambda: build_per_object(extracted, construct=True), iterations)),
+            "page_once": round(us_per_page(lambda: build_page_once(extracted), iterations)),
+            "end_to_end": round(us_per_page(lambda: SearchResponse.from_exa_response(page), iterations)),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", type=int, default=50, help="raw results per page")
+    parser.add_argument("--jobs", type=int, default=6, help="work experience entries per profile")
+    parser.add_argument("--degrees", type=int, default=2, help="education entries per profile")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    args = parser.parse_args()
+
+    report = run(args.results, args.jobs, args.degrees, args.iterations)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{report['results']} results/page, {args.jobs} jobs + {args.degrees} degrees each, {args.iterations} iterations")
+    for stage, value in report["us_per_page"].items():
+        print(f"{stage:<11} {value:>8} us/page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Local profile index benchmark (local_first searches).
+
+Builds an index of N synthetic parsed profiles in a temporary directory, then reports:
+  build_ms           full build (embedding every profile) and an incremental build of 1% new profiles
+  search_ms          p50 / p95 / p99 per query for term-filtered, cosine-ranked local searches
+  local_hit_pct      share of the sample queries answered locally (the rest would go to Exa)
+  snapshot_mb        on-disk (and shared, memory-mapped) snapshot size
+
+    python benchmarks/profile_index_bench.py --profiles 20000 --queries 500
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+SEARCH_SERVICE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "services", "search-service")
+sys.path.insert(0, SEARCH_SERVICE)
+os.environ.setdefault("EXA_API_KEY", "bench")
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:1")
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_JWT_SECRET", "bench")
+
+from app.services.profile_index import ProfileIndex  # noqa: E402
+
+ROLES = ["Software Engineer", "Data Scientist", "Product Manager", "ML Engineer", "Backend Developer",
+         "Frontend Engineer", "DevOps Engineer", "Data Engineer", "Designer", "Engineering Manager"]
+SKILLS = ["Python", "Go", "Rust", "Java", "React", "TypeScript", "Kubernetes", "SQL", "PyTorch", "Spark",
+          "AWS", "Docker", "FastAPI", "Django", "Figma", "Airflow", "Kafka", "Terraform", "Scala", "C++"]
+CITIES = ["Berlin, Germany", "Paris, France", "London, UK", "Munich, Germany", "Amsterdam, Netherlands", "Remote"]
+
+
+class ProfileSource:
+    """Profiles as ProfileCacheService.updated_since returns them."""
+
+    def __init__(self):
+        self.docs: List[Dict] = []
+
+    def add(self, count: int, rng: random.Random) -> None:
+        start = datetime.utcnow()
+        for _ in range(count):
+            i = len(self.docs)
+            role = rng.choice(ROLES)
+            self.docs.append({
+                "_id": f"linkedin.com/in/person-{i}",
+                "updated_at": start + timedelta(microseconds=i),
+                "fields": {
+                    "id": f"https://www.linkedin.com/in/person-{i}", "url": f"https://www.linkedin.com/in/person-{i}",
+                    "title": f"{rng.choice(['Senior ', 'Staff ', 'Lead ', ''])}{role}", "author": f"Person {i}",
+                    "location": rng.choice(CITIES), "summary": f"{role} building products with {rng.choice(SKILLS)}.",
+                    "image": None, "skills": rng.sample(SKILLS, 6),
+                    "work_experience": [
+                        {"title": role, "company": f"Company {rng.randrange(2000)}", "duration": None, "location": None}
+                        for _ in range(4)
+                    ],
+                    "education": [{"institution": f"University {rng.randrange(300)}", "degree": "MSc", "field_of_study": "Computer Science"}],
+                },
+            })
+
+    def updated_since(self, since, limit):
+        return [doc for doc in self.docs if doc["updated_at"] > since][:limit]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run(profiles: int, queries: int, limit: int, dim: int) -> Dict:
+    rng = random.Random(7)
+    source = ProfileSource()
+    source.add(profiles, rng)
+    directory = tempfile.mkdtemp(prefix="profile-index-bench-")
+    try:
+        index = ProfileIndex(directory, source, dim=dim)
+        started = time.perf_counter()
+        index.refresh()
+        full_build_ms = (time.perf_counter() - started) * 1000
+
+        source.add(max(1, profiles // 100), rng)
+        started = time.perf_counter()
+        index.refresh()
+        incremental_build_ms = (time.perf_counter() - started) * 1000
+
+        samples = [
+            f"{rng.choice(ROLES)} {rng.choice(SKILLS)} in {rng.choice(CITIES).split(',')[0]}".lower()
+            for _ in range(queries)
+        ]
+        timings, hits = [], 0
+        for query in samples:
+            started = time.perf_counter()
+            hits += index.search(query, limit) is not None
+            timings.append((time.perf_counter() - started) * 1000)
+
+        snapshot_bytes = sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, names in os.walk(directory) for name in names
+        )
+        return {
+            "profiles": index.size,
+            "queries": queries,
+            "limit": limit,
+            "dim": dim,
+            "build_ms": {"full": round(full_build_ms), "incremental_1pct": round(incremental_build_ms)},
+            "search_ms": {
+                "p50": round(statistics.median(timings), 2),
+                "p95": round(percentile(timings, 95), 2),
+                "p99": round(percentile(timings, 99), 2),
+            },
+            "local_hit_pct": round(100 * hits / queries, 1),
+            "snapshot_mb": round(snapshot_bytes / 1e6, 1),
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=10, help="results per search")
+    parser.add_argument("--dim", type=int, default=512, help="hashed embedding dimensions")
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    args = parser.parse_args()
+
+    report = run(args.profiles, args.queries, args.limit, args.dim)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{report['profiles']} profiles, dim {report['dim']}, snapshot {report['snapshot_mb']} MB")
+    print(f"build: full {report['build_ms']['full']} ms, incremental (1% new) {report['build_ms']['incremental_1pct']} ms")
+    print("search: " + ", ".join(f"{k}={v} ms" for k, v in report["search_ms"].items())
+          + f" ({report['local_hit_pct']}% answered locally)")
+
+
+if __name__ == "__main__":
+    main()
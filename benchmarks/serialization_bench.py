@@ -0,0 +1,168 @@
+"""
+Serialization benchmark for POST /search/linkedin responses.
+
+Compares, for a SearchResponse of N fully populated PersonResults:
+  default   endpoint returns the model; FastAPI re-validates it against response_model and
+            serializes it (recent FastAPI dumps JSON in pydantic-core; older releases ran
+            jsonable_encoder + json.dumps, shown as the `legacy` serialize-only row)
+  direct    endpoint returns PydanticJSONResponse: no re-validation, one pydantic-core dump
+
+Reports CPU time per call (serialization alone and a full request through the ASGI app,
+without a network or test-client thread), payload bytes and gzip-compressed bytes.
+
+    python benchmarks/serialization_bench.py --results 50 --iterations 500
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict
+
+SEARCH_SERVICE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "services", "search-service")
+sys.path.insert(0, SEARCH_SERVICE)
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from app.core.responses import PydanticJSONResponse  # noqa: E402
+from app.models.search import (  # noqa: E402
+    EducationItem,
+    PersonResult,
+    QueryPath,
+    SearchMetadata,
+    SearchResponse,
+    WorkExperienceItem,
+)
+
+
+def build_response(results: int) -> SearchResponse:
+    people = [
+        PersonResult(
+            id=f"https://www.linkedin.com/in/person-{i}",
+            url=f"https://www.linkedin.com/in/person-{i}",
+            title=f"Senior Machine Learning Engineer at Company {i * 7919 % 1000}",
+            author=f"Person {i * 104729 % 100000}",
+            location=["Berlin, Germany", "Paris, France", "London, UK", "Remote"][i % 4],
+            summary=" ".join(f"{word}{(i * k) % 97}" for k, word in enumerate(
+                "builds recommendation search ranking systems previously led data platform team at".split() * 3
+            )),
+            image=f"https://media.licdn.com/dms/image/person-{i}.jpg",
+            work_experience=[
+                WorkExperienceItem(title=f"Engineer {i}-{j}", company=f"Company {(i + j) * 31 % 500}",
+                                   duration=f"{2010 + j} - {2012 + j}", location="Berlin")
+                for j in range(5)
+            ],
+            education=[
+                EducationItem(institution="Technical University of Munich", degree="MSc", field_of_study="Computer Science")
+                for _ in range(2)
+            ],
+            skills=["Python", "PyTorch", "Kubernetes", "SQL", "Spark", "Airflow", "FastAPI", "Go", "Rust", "MLOps"],
+        )
+        for i in range(results)
+    ]
+    return SearchResponse(
+        results=people,
+        metadata=SearchMetadata(
+            total_results=results,
+            search_time_ms=842.5,
+            enhanced_query="machine learning engineers in Berlin",
+            query_path=QueryPath.ENHANCED,
+            enhancement_ms=310.2,
+        ),
+    )
+
+
+def build_app(payload: SearchResponse) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/default", response_model=SearchResponse)
+    async def default():
+        return payload
+
+    @app.post("/direct", response_model=SearchResponse, response_class=PydanticJSONResponse)
+    async def direct():
+        return PydanticJSONResponse(payload)
+
+    return app
+
+
+def cpu_us_per_call(fn: Callable[[], object], iterations: int) -> float:
+    fn()
+    started = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - started) / iterations * 1_000_000
+
+
+def asgi_caller(app: FastAPI, path: str) -> Callable[[], None]:
+    """Drive one POST through the ASGI app in-process (routing, endpoint, serialization)."""
+    loop = asyncio.new_event_loop()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200
+
+    return lambda: loop.run_until_complete(app(scope, receive, send))
+
+
+def run(results: int, iterations: int) -> Dict:
+    payload = build_response(results)
+
+    def legacy_serialize() -> bytes:
+        return json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def direct_serialize() -> bytes:
+        return PydanticJSONResponse(payload).body
+
+    assert json.loads(legacy_serialize()) == json.loads(direct_serialize()), "serialization paths disagree"
+
+    app = build_app(payload)
+    body = direct_serialize()
+    report = {
+        "results": results,
+        "iterations": iterations,
+        "bytes": len(body),
+        "gzip_bytes": len(gzip.compress(body, compresslevel=5)),
+        "serialize_cpu_us": {
+            "legacy": round(cpu_us_per_call(legacy_serialize, iterations)),
+            "direct": round(cpu_us_per_call(direct_serialize, iterations)),
+        },
+        "request_cpu_us": {
+            "default": round(cpu_us_per_call(asgi_caller(app, "/default"), iterations)),
+            "direct": round(cpu_us_per_call(asgi_caller(app, "/direct"), iterations)),
+        },
+    }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", type=int, default=50, help="PersonResults per response")
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    args = parser.parse_args()
+
+    report = run(args.results, args.iterations)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"SearchResponse with {report['results']} results, {report['iterations']} iterations")
+    print(f"payload: {report['bytes']} bytes, {report['gzip_bytes']} bytes gzipped (level 5)")
+    for metric in ("serialize_cpu_us", "request_cpu_us"):
+        print(f"{metric}: " + ", ".join(f"{path}={value}" for path, value in report[metric].items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+Startup profile for the backend services.
+
+Reports, per service:
+  - import-time breakdown of `import main` by top-level package (python -X importtime)
+  - which heavy SDKs are loaded at import time vs deferred to first use
+  - standalone import cost (time and RSS) of each heavy SDK
+  - time-to-first-request and steady-state RSS per uvicorn worker (Linux /proc)
+
+Usage (from the repository root, with the service's requirements installed):
+    python benchmarks/startup_profile.py --service search
+    python benchmarks/startup_profile.py --service resume --workers 2 --json
+
+Set WARM_UP_CLIENTS=false (search) or WARM_UP_SDKS=false (resume) to measure workers that only
+load SDKs on first use.
+
+Required settings missing from the environment (and from the service's .env) are filled with
+placeholders, so no upstream is contacted at import time; the warm-up may log connection failures.
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SERVICES = {
+    "search": {
+        "dir": ROOT / "services" / "search-service",
+        "health_path": "/",
+        "placeholders": {
+            "EXA_API_KEY": "placeholder",
+            "MONGODB_URI": "mongodb://127.0.0.1:1",
+            "SUPABASE_URL": "http://127.0.0.1:1",
+            "SUPABASE_JWT_SECRET": "placeholder",
+        },
+    },
+    "resume": {
+        "dir": ROOT / "services" / "resume-service",
+        "health_path": "/health",
+        "placeholders": {
+            "JOB_STORE_PATH": str(Path(tempfile.gettempdir()) / "startup_profile_jobs.sqlite3"),
+            "SUPABASE_URL": "http://127.0.0.1:1",
+            "SUPABASE_KEY": "placeholder",
+            "SUPABASE_JWT_SECRET": "placeholder",
+            "LANDING_AI_API_KEY": "placeholder",
+            "GEMINI_API_KEY": "placeholder",
+            "FIRE_CRAWL_API_KEY": "placeholder",
+        },
+    },
+}
+
+HEAVY_SDKS = ["google.genai", "exa_py", "supabase", "agentic_doc.parse", "pymongo"]
+
+
+def _service_env(service: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env_file = SERVICES[service]["dir"] / ".env"
+    defined = set(env)
+    if env_file.exists():
+        for line in env_file.read_text().splitlines():
+            key = line.split("=", 1)[0].strip()
+            if key and not key.startswith("#"):
+                defined.add(key)
+    for key, value in SERVICES[service]["placeholders"].items():
+        if key not in defined:
+            env[key] = value
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return env
+
+
+def _run_python(service: str, args: List[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=SERVICES[service]["dir"],
+        env=_service_env(service),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def import_breakdown(service: str, top: int) -> Dict:
+    """Self import time of `import main`, grouped by top-level package."""
+    proc = _run_python(service, ["-X", "importtime", "-c", "import main"])
+    per_package: Dict[str, int] = defaultdict(int)
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        package = name.strip().split(".")[0]
+        per_package[package] += int(self_us)
+        total_us += int(self_us)
+    ranked = sorted(per_package.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "total_ms": round(total_us / 1000, 1),
+        "packages": [{"package": name, "self_ms": round(us / 1000, 1)} for name, us in ranked],
+    }
+
+
+def loaded_sdks(service: str) -> Dict[str, List[str]]:
+    """Which heavy SDKs `import main` pulls in eagerly."""
+    code = (
+        "import json, sys, main; "
+        f"print(json.dumps([m for m in {HEAVY_SDKS!r} if m in sys.modules]))"
+    )
+    loaded = json.loads(_run_python(service, ["-c", code]).stdout.strip().splitlines()[-1])
+    return {"eager": loaded, "deferred": [m for m in HEAVY_SDKS if m not in loaded]}
+
+
+def sdk_costs(service: str) -> List[Dict]:
+    """Standalone import time and RSS growth of each installed heavy SDK."""
+    code = (
+        "import importlib, json, resource, sys, time; "
+        "before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss; "
+        "start = time.perf_counter(); importlib.import_module(sys.argv[1]); "
+        "elapsed = time.perf_counter() - start; "
+        "print(json.dumps({'ms': elapsed * 1000, 'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before}))"
+    )
+    costs = []
+    for module in HEAVY_SDKS:
+        try:
+            result = json.loads(_run_python(service, ["-c", code, module]).stdout.strip().splitlines()[-1])
+        except subprocess.CalledProcessError:
+            continue  # --- Not installed for this service ---
+        costs.append({"module": module, "import_ms": round(result["ms"], 1), "rss_mb": round(result["rss_kb"] / 1024, 1)})
+    return costs
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _rss_mb(pid: int) -> Optional[float]:
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        return None
+    return None
+
+
+def _children(pid: int) -> List[int]:
+    children = []
+    for task in Path(f"/proc/{pid}/task").glob("*"):
+        try:
+            children.extend(int(child) for child in (task / "children").read_text().split())
+        except OSError:
+            continue
+    return children
+
+
+def serve_profile(service: str, workers: int, requests: int, timeout: float, settle: float) -> Dict:
+    """Spawn uvicorn, time the first successful health check, then sample RSS after a short load."""
+    port = _free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=SERVICES[service]["dir"],
+        env=_service_env(service),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}{SERVICES[service]['health_path']}"
+    first_request_ms = None
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        first_request_ms = round((time.perf_counter() - started) * 1000, 1)
+                        break
+            except OSError:
+                time.sleep(0.02)
+        if first_request_ms is None:
+            raise RuntimeError(f"{service} did not answer {url} within {timeout}s")
+
+        for _ in range(requests):
+            urllib.request.urlopen(url, timeout=5).read()
+        time.sleep(settle)  # --- Let the background warm-up finish before sampling ---
+
+        pids = _children(proc.pid) if workers > 1 else [proc.pid]
+        return {
+            "workers": workers,
+            "time_to_first_request_ms": first_request_ms,
+            "worker_rss_mb": [_rss_mb(pid) for pid in pids],
+            "supervisor_rss_mb": _rss_mb(proc.pid) if workers > 1 else None,
+        }
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def profile(service: str, args: argparse.Namespace) -> Dict:
+    report = {
+        "service": service,
+        "imports": import_breakdown(service, args.top),
+        "sdks": loaded_sdks(service),
+        "sdk_costs": sdk_costs(service),
+    }
+    if not args.skip_serve:
+        report["serve"] = serve_profile(service, args.workers, args.requests, args.timeout, args.settle)
+    return report
+
+
+def _print_report(report: Dict) -> None:
+    print(f"\n=== {report['service']}-service ===")
+    imports = report["imports"]
+    print(f"import main: {imports['total_ms']} ms total (self time by package)")
+    for row in imports["packages"]:
+        print(f"  {row['package']:<28} {row['self_ms']:>8.1f} ms")
+    print(f"heavy SDKs imported eagerly: {', '.join(report['sdks']['eager']) or 'none'}")
+    print(f"heavy SDKs deferred:         {', '.join(report['sdks']['deferred']) or 'none'}")
+    print("standalone SDK cost:")
+    for row in report["sdk_costs"]:
+        print(f"  {row['module']:<28} {row['import_ms']:>8.1f} ms  {row['rss_mb']:>6.1f} MB")
+    serve = report.get("serve")
+    if serve:
+        print(f"time to first request: {serve['time_to_first_request_ms']} ms ({serve['workers']} worker(s))")
+        print(f"RSS per worker (MB):   {serve['worker_rss_mb']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--service", choices=["search", "resume", "all"], default="all")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers to spawn")
+    parser.add_argument("--requests", type=int, default=20, help="health-check requests before sampling RSS")
+    parser.add_argument("--top", type=int, default=15, help="packages to show in the import breakdown")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for the first response")
+    parser.add_argument("--settle", type=float, default=5.0, help="seconds to wait before sampling RSS")
+    parser.add_argument("--skip-serve", action="store_true", help="only profile imports")
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    args = parser.parse_args()
+
+    services = ["search", "resume"] if args.service == "all" else [args.service]
+    reports = [profile(service, args) for service in services]
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        for report in reports:
+            _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
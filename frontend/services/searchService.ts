@@ -19,4 +19,21 @@ export const searchLinkedIn = async (
     console.error('API searchLinkedIn failed:', error);
     throw error;
   }
-};
\ No newline at end of file
+};
+
+export const loadMoreResults = async (
+  cursor: string,
+  limit: number = 10
+): Promise<SearchResponse> => {
+  try {
+    const params = new URLSearchParams({ cursor, limit: String(limit) });
+    const responseData = await apiCall<SearchResponse>(`/search/linkedin/next?${params}`, {
+      method: 'GET',
+    });
+
+    return searchResponseSchema.parse(responseData);
+  } catch (error) {
+    console.error('API loadMoreResults failed:', error);
+    throw error;
+  }
+};
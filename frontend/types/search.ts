@@ -26,16 +26,27 @@ export const personResultSchema = z.object({
   skills: z.array(z.string()),
 });
 
+export const searchFiltersSchema = z.object({
+  skills: z.array(z.string()).max(20).optional(),
+  location: z.string().max(100).nullable().optional(),
+  companies: z.array(z.string()).max(20).optional(),
+  title_keywords: z.array(z.string()).max(20).optional(),
+  strict: z.boolean().optional(),
+});
+
 export const searchRequestSchema = z.object({
   query: z.string().min(3, "Query must be at least 3 characters long.").max(500),
   category: z.enum(["linkedin profile", "company", "job offers", "pages"]),
   limit: z.number().min(1).max(50),
+  local_first: z.boolean().optional(),
+  filters: searchFiltersSchema.optional(),
 });
 
 export const searchMetadataSchema = z.object({
   total_results: z.number(),
   search_time_ms: z.number(),
   enhanced_query: z.string().nullable(),
+  next_cursor: z.string().nullable().optional(),
 });
 
 export const searchResponseSchema = z.object({
@@ -46,6 +57,7 @@ export const searchResponseSchema = z.object({
 export type WorkExperienceItem = z.infer<typeof workExperienceItemSchema>;
 export type EducationItem = z.infer<typeof educationItemSchema>;
 export type PersonResult = z.infer<typeof personResultSchema>;
+export type SearchFilters = z.infer<typeof searchFiltersSchema>;
 export type SearchRequest = z.infer<typeof searchRequestSchema>;
 export type SearchMetadata = z.infer<typeof searchMetadataSchema>;
 export type SearchResponse = z.infer<typeof searchResponseSchema>;
\ No newline at end of file
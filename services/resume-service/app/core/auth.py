@@ -2,25 +2,39 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
 from app.core.config import settings
+from app.core.token_cache import VerifiedTokenCache
 
 security = HTTPBearer()
 
+# --- Per-worker cache of verified tokens; a session reuses one token across many requests ---
+token_cache = VerifiedTokenCache(
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+    max_ttl=settings.AUTH_CACHE_MAX_TTL_SECONDS
+)
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> str:
-    """Simple HS256 JWT validation for Supabase tokens."""
+    """HS256 JWT validation for Supabase tokens, verified once per token and then served from cache."""
+    token = credentials.credentials
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
+
     try:
         payload = jwt.decode(
-            credentials.credentials,
+            token,
             settings.SUPABASE_JWT_SECRET,
             algorithms=["HS256"],
             audience="authenticated",
             issuer=f"{settings.SUPABASE_URL}/auth/v1"
         )
-        return payload["sub"]  
-        
     except JWTError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Invalid token: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+    user_id = payload["sub"]  # user_id
+    token_cache.put(token, user_id, payload.get("exp"))
+    return user_id
@@ -7,12 +7,86 @@ class Settings(BaseSettings):
     SUPABASE_URL: str = Field(..., description="Supabase project URL")
     SUPABASE_KEY: str = Field(..., description="Supabase service role key")
     SUPABASE_JWT_SECRET: str = Field(..., description="Supabase JWT secret for token validation")
+    AUTH_CACHE_MAX_ENTRIES: int = Field(10000, ge=0, description="Verified tokens kept in the per-worker LRU (0 disables caching)")
+    AUTH_CACHE_MAX_TTL_SECONDS: float = Field(300.0, gt=0, description="Upper bound on how long a verified token is trusted without re-verification")
 
     #  ---  External APIs --- 
     LANDING_AI_API_KEY: str = Field(..., description="Landing AI API key for PDF parsing")
     GEMINI_API_KEY: str = Field(..., description="Google Gemini API key for analysis")
     FIRE_CRAWL_API_KEY: str = Field(..., description="FireCrawl API key for URL scraping")
 
+    #  ---  Upstream Rate Limits (match provider quotas) ---
+    GEMINI_REQUESTS_PER_SECOND: float = Field(2.0, gt=0, description="Sustained Gemini request rate")
+    GEMINI_BURST: int = Field(5, ge=1, description="Gemini requests allowed in a burst")
+    GEMINI_MAX_CONCURRENCY: int = Field(5, ge=1, description="Upper bound for concurrent Gemini calls")
+    FIRECRAWL_REQUESTS_PER_SECOND: float = Field(2.0, gt=0, description="Sustained Firecrawl request rate")
+    FIRECRAWL_BURST: int = Field(5, ge=1, description="Firecrawl requests allowed in a burst")
+    FIRECRAWL_MAX_CONCURRENCY: int = Field(5, ge=1, description="Upper bound for concurrent Firecrawl scrapes")
+    LANDING_AI_REQUESTS_PER_SECOND: float = Field(1.0, gt=0, description="Sustained Landing AI parse rate")
+    LANDING_AI_BURST: int = Field(2, ge=1, description="Landing AI parses allowed in a burst")
+    LANDING_AI_MAX_CONCURRENCY: int = Field(2, ge=1, description="Upper bound for concurrent Landing AI parses")
+    LIMITER_QUEUE_TIMEOUT_SECONDS: float = Field(10.0, ge=0, description="Max time a call waits for admission before 503")
+    LIMITER_MAX_QUEUE: int = Field(50, ge=0, description="Max calls waiting per provider before fast 503s")
+    LIMITER_LATENCY_TOLERANCE: float = Field(2.0, gt=1, description="Latency over this multiple of the best observed latency shrinks the concurrency limit")
+
+    #  ---  Upstream Resilience ---
+    RETRY_MAX_ATTEMPTS: int = Field(3, ge=1, description="Attempts per upstream call, including the first")
+    RETRY_BASE_DELAY_SECONDS: float = Field(0.5, ge=0, description="Base delay for full-jitter exponential backoff")
+    RETRY_MAX_DELAY_SECONDS: float = Field(8.0, ge=0, description="Cap on a single backoff delay")
+    HEDGE_ENABLED: bool = Field(True, description="Send a hedged second request for slow idempotent calls")
+    HEDGE_PERCENTILE: float = Field(0.95, gt=0, le=1, description="Latency percentile after which a hedge is sent")
+    HEDGE_MIN_SAMPLES: int = Field(20, ge=1, description="Latency samples required before hedging starts")
+    CIRCUIT_FAILURE_THRESHOLD: int = Field(5, ge=1, description="Consecutive transient failures that open a provider circuit")
+    CIRCUIT_RESET_TIMEOUT_SECONDS: float = Field(30.0, gt=0, description="Time an open circuit waits before a probe call")
+
+    #  ---  Server / Process Model ---
+    HOST: str = Field("0.0.0.0", description="Interface uvicorn binds to")
+    PORT: int = Field(8002, description="Port uvicorn binds to")
+    WORKERS: int = Field(1, ge=1, description="uvicorn worker processes (one per core in production)")
+    RELOAD: bool = Field(False, description="Auto-reload on code changes (development only; forces a single worker)")
+    KEEP_ALIVE_SECONDS: int = Field(75, ge=1, description="Idle keep-alive timeout; must exceed the gateway's upstream keepalive_timeout")
+    GRACEFUL_SHUTDOWN_SECONDS: int = Field(30, ge=0, description="Time in-flight requests and streams get to finish after SIGTERM")
+    PROCESS_COUNT: int = Field(1, ge=1, description="Processes sharing the provider quotas (replicas x workers); per-process rate limits are divided by it")
+
+    #  ---  Startup ---
+    WARM_UP_SDKS: bool = Field(True, description="Import the Gemini, Supabase and Landing AI SDKs in the background after boot instead of on first use")
+
+    #  ---  Analysis Jobs ---
+    JOB_STORE_PATH: str = Field("analysis_jobs.sqlite3", description="SQLite file backing the analysis job queue")
+    ANALYSIS_WORKERS: int = Field(2, ge=1, description="Number of concurrent analysis workers per process")
+    JOB_QUEUE_MAX_PENDING: int = Field(100, ge=1, description="Queued jobs allowed before new submissions are rejected with 503")
+    JOB_LEASE_SECONDS: int = Field(300, ge=30, description="Lease on a running job; the worker renews it every third of this while the job runs, and a job whose lease lapses may be reclaimed")
+    JOB_MAX_ATTEMPTS: int = Field(2, ge=1, description="Attempts per job before it is marked failed")
+    JOB_POLL_INTERVAL_SECONDS: float = Field(2.0, gt=0, description="Idle workers re-check the store at this interval")
+
+    #  ---  Resume Storage ---
+    STORAGE_BACKEND: str = Field("supabase", pattern="^(supabase|local)$", description="Where resumes are stored: Supabase Storage, or a local directory for development and tests")
+    LOCAL_STORAGE_DIR: str = Field("storage", description="Directory of the local storage backend")
+    LOCAL_STORAGE_BASE_URL: str = Field("http://localhost:8002", description="Public base URL of this service, used in local-backend signed URLs")
+    SIGNED_URL_EXPIRES_SECONDS: int = Field(600, ge=10, description="Lifetime of signed download URLs (and local-backend upload URLs; Supabase upload URLs last 2h)")
+
+    #  ---  Resume Parsing ---
+    LOCAL_PARSE_ENABLED: bool = Field(True, description="Extract text-layer PDFs locally and send only poor extractions to Landing AI")
+    LOCAL_PARSE_MIN_CHARS_PER_PAGE: int = Field(200, ge=0, description="Minimum non-space characters per page for a local extraction to be used")
+    LOCAL_PARSE_MIN_SECTIONS: int = Field(2, ge=0, description="Minimum resume section headings (Experience, Education, ...) found locally")
+    LOCAL_PARSE_MAX_GARBLED_RATIO: float = Field(0.02, ge=0, le=1, description="Maximum share of unprintable or replacement characters in a local extraction")
+    LOCAL_PARSE_MAX_PAGES: int = Field(10, ge=1, description="Longer PDFs go straight to Landing AI")
+
+    #  ---  Uploads ---
+    MAX_UPLOAD_BYTES: int = Field(10 * 1024 * 1024, ge=1, description="Largest resume accepted; bigger uploads are rejected with 413 as soon as the limit is crossed")
+    UPLOAD_CHUNK_BYTES: int = Field(64 * 1024, ge=1024, description="Size of each read from the incoming upload stream")
+    RESUME_STORE_PATH: str = Field("resumes.sqlite3", description="SQLite file mapping file_ids to content hashes and caching parsed resumes")
+    UPLOAD_SPOOL_MAX_BYTES: int = Field(1024 * 1024, ge=0, description="Upload bytes buffered in memory before spooling to a temp file")
+
+    #  ---  Analysis Prompt ---
+    PROMPT_COMPACTION_ENABLED: bool = Field(True, description="Strip scraped boilerplate and fit job and resume into token budgets before calling Gemini")
+    PROMPT_JOB_TOKEN_BUDGET: int = Field(2500, ge=100, description="Estimated tokens of job posting content sent to Gemini")
+    PROMPT_RESUME_TOKEN_BUDGET: int = Field(3000, ge=100, description="Estimated tokens of resume content sent to Gemini")
+
+    #  ---  Batch Analysis ---
+    BATCH_SCRAPE_CONCURRENCY: int = Field(5, ge=1, description="Job postings scraped in parallel per batch request")
+    BATCH_ANALYSIS_CONCURRENCY: int = Field(3, ge=1, description="Gemini analyses run in parallel per batch request")
+
     model_config = SettingsConfigDict(
         env_file=".env", 
         env_file_encoding="utf-8",
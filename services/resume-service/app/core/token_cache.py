@@ -0,0 +1,64 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.core.metrics import metrics
+
+
+class VerifiedTokenCache:
+    """
+    LRU cache of already-verified JWTs, so repeat requests with the same bearer token
+    skip signature and claim validation.
+
+    - Keyed by the SHA-256 digest of the token (raw tokens are never stored).
+    - An entry lives until the token's `exp`, capped at max_ttl so a rotated secret
+      or revoked session is honoured within max_ttl seconds.
+    - Only successful verifications are cached.
+    """
+
+    def __init__(self, max_entries: int, max_ttl: float):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[str]:
+        """Return the cached subject for a still-valid token, or None."""
+        key = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                metrics.increment("auth_token_cache_total", result="hit")
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+        metrics.increment("auth_token_cache_total", result="miss")
+        return None
+
+    def put(self, token: str, subject: str, exp: Optional[float]) -> None:
+        """Cache a verified token; tokens without `exp` are not cached."""
+        if exp is None or self.max_entries <= 0:
+            return
+        expires_at = min(float(exp), time.time() + self.max_ttl)
+        if expires_at <= time.time():
+            return
+        key = self._digest(token)
+        with self._lock:
+            self._entries[key] = (expires_at, subject)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,5 +1,7 @@
+from enum import Enum
+from datetime import datetime
 from uuid import UUID
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -8,6 +10,28 @@ class UploadResponse(BaseModel):
     message: str = Field(..., description="A confirmation message.")
 
 
+class UploadUrlRequest(BaseModel):
+    sha256: str = Field(..., pattern="^[0-9a-f]{64}$", description="Lowercase hex SHA-256 of the PDF, computed by the client.")
+    size: int = Field(..., gt=0, description="Size of the PDF in bytes.")
+
+
+class UploadUrlResponse(BaseModel):
+    file_id: UUID = Field(..., description="The resume's ID; register it with /resume/upload-complete after uploading.")
+    upload_url: Optional[str] = Field(None, description="Signed URL to PUT the PDF to; null when this PDF is already uploaded.")
+    token: Optional[str] = Field(None, description="Upload token embedded in upload_url.")
+    expires_in: Optional[int] = Field(None, description="Seconds until upload_url expires.")
+
+
+class UploadCompleteRequest(BaseModel):
+    file_id: UUID = Field(..., description="The ID returned by /resume/upload-url.")
+
+
+class DownloadUrlResponse(BaseModel):
+    file_id: UUID = Field(..., description="The resume the URL downloads.")
+    download_url: str = Field(..., description="Signed URL to GET the PDF from storage.")
+    expires_in: int = Field(..., description="Seconds until download_url expires.")
+
+
 class AnalysisRequest(BaseModel):
     file_id: UUID = Field(..., description="The ID of the uploaded resume from the /resume/upload endpoint.")
     job_title: str = Field(..., description="The title of the job you are applying for.")
@@ -23,6 +47,11 @@ class AutoAnalysisRequest(BaseModel):
     job_url: str = Field(..., description="The URL of the job posting to scrape and analyze against.", example="https://www.linkedin.com/jobs/view/1234567890/")
 
 
+class BatchAnalysisRequest(BaseModel):
+    file_id: UUID = Field(..., description="The ID of the uploaded resume from the /resume/upload endpoint.")
+    job_urls: List[str] = Field(..., min_length=1, max_length=20, description="Job posting URLs to analyze the resume against.")
+
+
 class KeywordAnalysis(BaseModel):
     matched_keywords: List[str] = Field(..., description="Keywords from the job description found in the resume.")
     missing_keywords: List[str] = Field(..., description="Important keywords missing from the resume.")
@@ -57,3 +86,42 @@ class AnalysisReport(BaseModel):
     keyword_analysis: KeywordAnalysis = Field(..., description="Analysis of keyword coverage.")
     experience_match: List[ExperienceMatchItem] = Field(..., description="Details on how experience aligns with job requirements.")
     suggestions: List[str] = Field(..., description="Actionable suggestions for improving the resume.")
+
+class BatchAnalysisItem(BaseModel):
+    job_url: str = Field(..., description="The job posting URL this result belongs to.")
+    report: Optional[AnalysisReport] = Field(None, description="The analysis report, if this posting was analyzed successfully.")
+    error: Optional[str] = Field(None, description="Why this posting could not be analyzed.")
+    status_code: Optional[int] = Field(None, description="HTTP-style status code for the failure.")
+
+class BatchAnalysisResponse(BaseModel):
+    file_id: UUID = Field(..., description="The resume that was analyzed.")
+    results: List[BatchAnalysisItem] = Field(..., description="Results ranked by match score; failed postings come last.")
+
+class AnalysisStage(str, Enum):
+    STARTED = "started"
+    RESUME_PARSED = "resume_parsed"
+    JOB_SCRAPED = "job_scraped"
+    ANALYSIS_TOKEN = "analysis_token"
+    REPORT = "report"
+    JOB_RESULT = "job_result"
+    COMPLETED = "completed"
+    ERROR = "error"
+
+class AnalysisStreamEvent(BaseModel):
+    event: AnalysisStage = Field(..., description="The pipeline stage this event reports.")
+    data: Dict[str, Any] = Field(default_factory=dict, description="Stage payload; the final 'report' event carries the full AnalysisReport.")
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class AnalysisJobResponse(BaseModel):
+    job_id: UUID = Field(..., description="Identifier to poll with GET /resume/jobs/{job_id}.")
+    status: JobStatus = Field(..., description="Current job status.")
+    created_at: datetime = Field(..., description="When the job was submitted.")
+    updated_at: datetime = Field(..., description="When the job last changed status.")
+    attempts: int = Field(0, description="How many times a worker has picked up this job.")
+    result: Optional[AnalysisReport] = Field(None, description="The analysis report once the job has succeeded.")
+    error: Optional[str] = Field(None, description="Failure reason once the job has failed.")
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
+from app.core.metrics import metrics
 
 router = APIRouter()
 
@@ -17,3 +18,8 @@ async def health_check():
         version="1.0.0"
     )
 
+
+@router.get("/metrics")
+async def get_metrics():
+    """In-process metrics for this worker (limiter state, upstream latency, rejections)."""
+    return metrics.snapshot()
@@ -1,16 +1,60 @@
+import json
 from fastapi import APIRouter, HTTPException, UploadFile, File, Depends
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator
 from uuid import UUID
 from app.models.resume import (
     UploadResponse,
+    UploadUrlRequest,
+    UploadUrlResponse,
+    UploadCompleteRequest,
+    DownloadUrlResponse,
     AutoAnalysisRequest,
-    AnalysisReport
+    AnalysisReport,
+    AnalysisStreamEvent,
+    AnalysisJobResponse,
+    BatchAnalysisRequest,
+    BatchAnalysisResponse
+)
+from app.core.config import settings
+from app.services.storage_service import (
+    InvalidPDFError,
+    UploadNotFoundError,
+    UploadTooLargeError,
+    upload_resume,
+    create_upload_url,
+    complete_upload,
+    create_download_url
+)
+from app.services.analysis_service import (
+    analyze_resume_against_job_url,
+    stream_analysis_against_job_url,
+    analyze_resume_against_job_urls,
+    stream_batch_analysis
+)
+from app.services.job_service import (
+    JobQueueFullError,
+    submit_analysis_job,
+    get_analysis_job
 )
-from app.services.storage_service import upload_resume
-from app.services.analysis_service import analyze_resume_against_job_url 
 from app.core.auth import get_current_user  
 
 router = APIRouter(prefix="/resume", tags=["Resume"])
 
+# --- Headers that keep proxies (nginx) from buffering event streams ---
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+async def _to_sse(events: AsyncIterator[AnalysisStreamEvent]) -> AsyncIterator[str]:
+    """Format pipeline events as Server-Sent Events frames."""
+    async for event in events:
+        payload = json.dumps(event.model_dump(mode="json")["data"])
+        yield f"event: {event.event.value}\ndata: {payload}\n\n"
+
+
 @router.post("/upload", response_model=UploadResponse)
 async def upload_resume_endpoint(
     file: UploadFile = File(...),
@@ -22,15 +66,72 @@ async def upload_resume_endpoint(
         raise HTTPException(status_code=400, detail="Only PDF files are allowed.")
     
     try:
-        file_id = await upload_resume(file)
-        # TODO: Optionally use user_id to scope the upload (e.g., in Supabase Storage RLS)
+        file_id = await upload_resume(file, user_id)
         return UploadResponse(
             file_id=UUID(file_id),
             message="Resume uploaded successfully. Ready for analysis."
         )
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidPDFError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
+@router.post("/upload-url", response_model=UploadUrlResponse)
+async def create_resume_upload_url(
+    request: UploadUrlRequest,
+    user_id: str = Depends(get_current_user)
+):
+    """
+    Issue a short-lived signed URL so the client uploads the PDF straight to storage.
+    Call /resume/upload-complete afterwards; no URL is returned if this PDF is already uploaded.
+    """
+    try:
+        file_id, signed = await create_upload_url(user_id, request.sha256, request.size)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    if signed is None:
+        return UploadUrlResponse(file_id=UUID(file_id))
+    return UploadUrlResponse(
+        file_id=UUID(file_id),
+        upload_url=signed.url,
+        token=signed.token,
+        expires_in=signed.expires_in
+    )
+
+
+@router.post("/upload-complete", response_model=UploadResponse)
+async def complete_resume_upload(
+    request: UploadCompleteRequest,
+    user_id: str = Depends(get_current_user)
+):
+    try:
+        await complete_upload(user_id, str(request.file_id))
+    except UploadNotFoundError:
+        raise HTTPException(status_code=404, detail="No uploaded file found for this file_id.")
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidPDFError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return UploadResponse(
+        file_id=request.file_id,
+        message="Resume uploaded successfully. Ready for analysis."
+    )
+
+
+@router.get("/{file_id}/download-url", response_model=DownloadUrlResponse)
+async def get_resume_download_url(
+    file_id: UUID,
+    user_id: str = Depends(get_current_user)
+):
+    try:
+        url = await create_download_url(user_id, str(file_id))
+    except UploadNotFoundError:
+        raise HTTPException(status_code=404, detail="Resume not found.")
+    return DownloadUrlResponse(file_id=file_id, download_url=url, expires_in=settings.SIGNED_URL_EXPIRES_SECONDS)
+
+
 @router.post("/analyze-auto", response_model=AnalysisReport)
 async def analyze_resume_auto(
     request: AutoAnalysisRequest,
@@ -46,4 +147,92 @@ async def analyze_resume_auto(
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Auto-analysis failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Auto-analysis failed: {str(e)}")
+
+@router.post("/analyze-auto/stream")
+async def analyze_resume_auto_stream(
+    request: AutoAnalysisRequest,
+    user_id: str = Depends(get_current_user)
+):
+    """
+    Server-Sent Events variant of /analyze-auto.
+    Emits started, resume_parsed, job_scraped, analysis_token and report (or error) events.
+    """
+    events = stream_analysis_against_job_url(
+        file_id=str(request.file_id),
+        job_url=request.job_url
+    )
+    return StreamingResponse(
+        _to_sse(events),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
+@router.post("/analyze-batch", response_model=BatchAnalysisResponse)
+async def analyze_resume_batch(
+    request: BatchAnalysisRequest,
+    user_id: str = Depends(get_current_user)
+):
+    """Analyze one resume against up to 20 job postings; results are ranked by match score."""
+    try:
+        results = await analyze_resume_against_job_urls(
+            file_id=str(request.file_id),
+            job_urls=request.job_urls
+        )
+        return BatchAnalysisResponse(file_id=request.file_id, results=results)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch analysis failed: {str(e)}")
+
+
+@router.post("/analyze-batch/stream")
+async def analyze_resume_batch_stream(
+    request: BatchAnalysisRequest,
+    user_id: str = Depends(get_current_user)
+):
+    """
+    Server-Sent Events variant of /analyze-batch.
+    Emits one job_result event per posting as it completes, then a completed event with the ranking.
+    """
+    events = stream_batch_analysis(
+        file_id=str(request.file_id),
+        job_urls=request.job_urls
+    )
+    return StreamingResponse(
+        _to_sse(events),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
+@router.post("/jobs", response_model=AnalysisJobResponse, status_code=202)
+async def create_analysis_job(
+    request: AutoAnalysisRequest,
+    user_id: str = Depends(get_current_user)
+):
+    """Queue an auto-analysis job. Poll GET /resume/jobs/{job_id} for the result."""
+    try:
+        return await submit_analysis_job(
+            user_id=user_id,
+            file_id=str(request.file_id),
+            job_url=request.job_url
+        )
+    except JobQueueFullError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Analysis queue is full. Please retry later.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+
+@router.get("/jobs/{job_id}", response_model=AnalysisJobResponse)
+async def get_analysis_job_status(
+    job_id: UUID,
+    user_id: str = Depends(get_current_user)
+):
+    job = await get_analysis_job(str(job_id), user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analysis job not found.")
+    return job
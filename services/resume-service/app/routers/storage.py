@@ -0,0 +1,50 @@
+import tempfile
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.services.storage_service import LocalStorage, get_storage
+
+# --- Stand-in for Supabase signed URLs; mounted only when STORAGE_BACKEND=local ---
+router = APIRouter(prefix="/resume/storage")
+
+
+def _local_storage() -> LocalStorage:
+    storage = get_storage()
+    if not isinstance(storage, LocalStorage):
+        raise HTTPException(status_code=404, detail="Not found.")
+    return storage
+
+
+@router.put("/{path:path}")
+async def put_object(path: str, token: str, request: Request):
+    """Upload target of local signed upload URLs; the request body is the file."""
+    storage = _local_storage()
+    if not storage.verify(path, "upload", token):
+        raise HTTPException(status_code=403, detail="Invalid or expired upload token.")
+
+    with tempfile.SpooledTemporaryFile(max_size=settings.UPLOAD_SPOOL_MAX_BYTES) as spool:
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > settings.MAX_UPLOAD_BYTES:
+                raise HTTPException(status_code=413, detail="File exceeds the upload limit.")
+            spool.write(chunk)
+        spool.seek(0)
+        await run_in_threadpool(storage.upload, path, spool, {})
+    return {"Key": path}
+
+
+@router.get("/{path:path}")
+async def get_object(path: str, token: str):
+    """Target of local signed download URLs."""
+    storage = _local_storage()
+    if not storage.verify(path, "download", token):
+        raise HTTPException(status_code=403, detail="Invalid or expired download token.")
+    try:
+        target = storage.local_path(path)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Not found.")
+    if not target.exists():
+        raise HTTPException(status_code=404, detail="Not found.")
+    return FileResponse(target, media_type="application/pdf")
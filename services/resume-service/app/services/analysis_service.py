@@ -1,12 +1,57 @@
 from app.services.pdf_parser_service import parse_resume_from_storage
 from app.services.scrape_service import scrape_job_posting
-from app.services.gemini_service import generate_automated_analysis  
-from app.models.resume import AnalysisReport
+from app.services.storage_service import InvalidPDFError
+from app.services.gemini_service import (
+    generate_automated_analysis,
+    stream_automated_analysis,
+    parse_analysis_response,
+)
+from app.models.resume import AnalysisReport, AnalysisStage, AnalysisStreamEvent, BatchAnalysisItem
+from app.core.config import settings
+from app.core.limiter import ProviderOverloadedError
 from fastapi import HTTPException
+from typing import AsyncIterator, List
+import asyncio
 import logging
+import math
 
 logger = logging.getLogger(__name__)
 
+
+def _overloaded(e: ProviderOverloadedError) -> HTTPException:
+    """Translate an upstream limiter rejection into a fast 503 the client can retry."""
+    return HTTPException(
+        status_code=503,
+        detail=f"Upstream provider {e.provider} is overloaded. Please retry shortly.",
+        headers={"Retry-After": str(math.ceil(e.retry_after))}
+    )
+
+
+async def _parse_resume(file_id: str) -> str:
+    logger.info(f"Parsing resume for file_id: {file_id}")
+    try:
+        resume_content = await parse_resume_from_storage(file_id)
+    except InvalidPDFError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not resume_content.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="Failed to extract meaningful content from resume PDF."
+        )
+    return resume_content
+
+
+async def _scrape_job(job_url: str) -> str:
+    logger.info(f"Scraping job posting: {job_url}")
+    job_content = await scrape_job_posting(job_url)
+    if not job_content.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="Failed to extract content from job posting URL."
+        )
+    return job_content
+
+
 async def analyze_resume_against_job_url(file_id: str, job_url: str) -> AnalysisReport:
     """
     End-to-end analysis pipeline:
@@ -16,22 +61,10 @@ async def analyze_resume_against_job_url(file_id: str, job_url: str) -> Analysis
     """
     try:
         # --- Step 1: Parse Resume ---
-        logger.info(f"Parsing resume for file_id: {file_id}")
-        resume_content = await parse_resume_from_storage(file_id)
-        if not resume_content.strip():
-            raise HTTPException(
-                status_code=400,
-                detail="Failed to extract meaningful content from resume PDF."
-            )
+        resume_content = await _parse_resume(file_id)
 
         # --- Step 2: Scrape Job Posting ---
-        logger.info(f"Scraping job posting: {job_url}")
-        job_content = await scrape_job_posting(job_url)
-        if not job_content.strip():
-            raise HTTPException(
-                status_code=400,
-                detail="Failed to extract content from job posting URL."
-            )
+        job_content = await _scrape_job(job_url)
 
         # --- Step 3: Generate AI Analysis ---
         logger.info("Generating AI analysis report...")
@@ -46,9 +79,196 @@ async def analyze_resume_against_job_url(file_id: str, job_url: str) -> Analysis
     except HTTPException:
         # Re-raise known HTTP errors
         raise
+    except ProviderOverloadedError as e:
+        raise _overloaded(e)
     except Exception as e:
         logger.error(f"Unexpected error in analysis pipeline: {e}", exc_info=True)
         raise HTTPException(
             status_code=500,
             detail="An unexpected error occurred during resume analysis. Please try again later."
-        )
\ No newline at end of file
+        )
+
+
+async def stream_analysis_against_job_url(file_id: str, job_url: str) -> AsyncIterator[AnalysisStreamEvent]:
+    """
+    Streaming variant of analyze_resume_against_job_url.
+
+    Yields an event as soon as each stage completes: started, resume_parsed,
+    job_scraped, one analysis_token per Gemini chunk, then the final report.
+    Failures are reported as a terminal error event instead of raising, since
+    the HTTP status has already been sent once streaming starts.
+    """
+    yield AnalysisStreamEvent(event=AnalysisStage.STARTED, data={"file_id": file_id, "job_url": job_url})
+
+    try:
+        # --- Step 1: Parse Resume ---
+        resume_content = await _parse_resume(file_id)
+        yield AnalysisStreamEvent(
+            event=AnalysisStage.RESUME_PARSED,
+            data={"characters": len(resume_content)}
+        )
+
+        # --- Step 2: Scrape Job Posting ---
+        job_content = await _scrape_job(job_url)
+        yield AnalysisStreamEvent(
+            event=AnalysisStage.JOB_SCRAPED,
+            data={"url": job_url, "characters": len(job_content)}
+        )
+
+        # --- Step 3: Stream AI Analysis ---
+        logger.info("Streaming AI analysis report...")
+        chunks = []
+        async for chunk in stream_automated_analysis(
+            parsed_resume_content=resume_content,
+            scraped_job_content=job_content
+        ):
+            chunks.append(chunk)
+            yield AnalysisStreamEvent(event=AnalysisStage.ANALYSIS_TOKEN, data={"text": chunk})
+
+        report = parse_analysis_response("".join(chunks))
+        logger.info(f"Streaming analysis complete. Match score: {report.match_score}%")
+        yield AnalysisStreamEvent(event=AnalysisStage.REPORT, data=report.model_dump())
+
+    except HTTPException as e:
+        yield AnalysisStreamEvent(
+            event=AnalysisStage.ERROR,
+            data={"status_code": e.status_code, "detail": e.detail}
+        )
+    except ProviderOverloadedError as e:
+        yield AnalysisStreamEvent(
+            event=AnalysisStage.ERROR,
+            data={"status_code": 503, "detail": _overloaded(e).detail, "retry_after": math.ceil(e.retry_after)}
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error in streaming analysis pipeline: {e}", exc_info=True)
+        yield AnalysisStreamEvent(
+            event=AnalysisStage.ERROR,
+            data={
+                "status_code": 500,
+                "detail": "An unexpected error occurred during resume analysis. Please try again later."
+            }
+        )
+
+
+async def _analyze_posting(
+    job_url: str,
+    resume_content: str,
+    scrape_semaphore: asyncio.Semaphore,
+    analysis_semaphore: asyncio.Semaphore
+) -> BatchAnalysisItem:
+    """Scrape and analyze one posting of a batch; failures become an item instead of raising."""
+    try:
+        async with scrape_semaphore:
+            job_content = await _scrape_job(job_url)
+        async with analysis_semaphore:
+            report = await generate_automated_analysis(
+                parsed_resume_content=resume_content,
+                scraped_job_content=job_content
+            )
+        return BatchAnalysisItem(job_url=job_url, report=report)
+
+    except HTTPException as e:
+        return BatchAnalysisItem(job_url=job_url, error=str(e.detail), status_code=e.status_code)
+    except ProviderOverloadedError as e:
+        return BatchAnalysisItem(job_url=job_url, error=_overloaded(e).detail, status_code=503)
+    except Exception as e:
+        logger.error(f"Batch analysis failed for {job_url}: {e}", exc_info=True)
+        return BatchAnalysisItem(
+            job_url=job_url,
+            error="An unexpected error occurred while analyzing this job posting.",
+            status_code=500
+        )
+
+
+def rank_batch_results(items: List[BatchAnalysisItem]) -> List[BatchAnalysisItem]:
+    """Order by match score (best first); failed postings go last in their original order."""
+    return sorted(items, key=lambda item: (item.report is None, -(item.report.match_score if item.report else 0.0)))
+
+
+def _start_batch(job_urls: List[str], resume_content: str) -> List[asyncio.Task]:
+    # --- Duplicate URLs would only repeat identical scrapes and Gemini calls ---
+    unique_urls = list(dict.fromkeys(job_urls))
+    scrape_semaphore = asyncio.Semaphore(settings.BATCH_SCRAPE_CONCURRENCY)
+    analysis_semaphore = asyncio.Semaphore(settings.BATCH_ANALYSIS_CONCURRENCY)
+    return [
+        asyncio.create_task(_analyze_posting(url, resume_content, scrape_semaphore, analysis_semaphore))
+        for url in unique_urls
+    ]
+
+
+async def analyze_resume_against_job_urls(file_id: str, job_urls: List[str]) -> List[BatchAnalysisItem]:
+    """
+    Batch analysis pipeline:
+    1. Parse the resume once
+    2. Scrape postings with bounded fan-out (BATCH_SCRAPE_CONCURRENCY)
+    3. Run Gemini analyses under BATCH_ANALYSIS_CONCURRENCY
+    4. Rank the reports by match score
+    """
+    try:
+        resume_content = await _parse_resume(file_id)
+    except HTTPException:
+        raise
+    except ProviderOverloadedError as e:
+        raise _overloaded(e)
+    except Exception as e:
+        logger.error(f"Unexpected error parsing resume for batch analysis: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="An unexpected error occurred during resume analysis. Please try again later."
+        )
+
+    logger.info(f"Analyzing resume {file_id} against {len(job_urls)} job postings")
+    items = await asyncio.gather(*_start_batch(job_urls, resume_content))
+    return rank_batch_results(list(items))
+
+
+async def stream_batch_analysis(file_id: str, job_urls: List[str]) -> AsyncIterator[AnalysisStreamEvent]:
+    """
+    Streaming variant of analyze_resume_against_job_urls.
+
+    Yields started and resume_parsed, then one job_result event per posting in
+    completion order, and finally a completed event carrying the ranking.
+    """
+    yield AnalysisStreamEvent(event=AnalysisStage.STARTED, data={"file_id": file_id, "jobs": len(job_urls)})
+
+    try:
+        resume_content = await _parse_resume(file_id)
+    except HTTPException as e:
+        yield AnalysisStreamEvent(event=AnalysisStage.ERROR, data={"status_code": e.status_code, "detail": e.detail})
+        return
+    except ProviderOverloadedError as e:
+        yield AnalysisStreamEvent(
+            event=AnalysisStage.ERROR,
+            data={"status_code": 503, "detail": _overloaded(e).detail, "retry_after": math.ceil(e.retry_after)}
+        )
+        return
+    except Exception as e:
+        logger.error(f"Unexpected error parsing resume for batch analysis: {e}", exc_info=True)
+        yield AnalysisStreamEvent(
+            event=AnalysisStage.ERROR,
+            data={
+                "status_code": 500,
+                "detail": "An unexpected error occurred during resume analysis. Please try again later."
+            }
+        )
+        return
+
+    yield AnalysisStreamEvent(event=AnalysisStage.RESUME_PARSED, data={"characters": len(resume_content)})
+
+    tasks = _start_batch(job_urls, resume_content)
+    items = []
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            item = await next_done
+            items.append(item)
+            yield AnalysisStreamEvent(event=AnalysisStage.JOB_RESULT, data=item.model_dump())
+    finally:
+        # --- Client went away mid-stream: stop paying for the remaining postings ---
+        for task in tasks:
+            task.cancel()
+
+    ranking = [
+        {"job_url": item.job_url, "match_score": item.report.match_score if item.report else None}
+        for item in rank_batch_results(items)
+    ]
+    yield AnalysisStreamEvent(event=AnalysisStage.COMPLETED, data={"ranking": ranking})
@@ -1,14 +1,32 @@
 import logging
-from typing import Optional
-from google import genai
-from google.genai import types
+from typing import AsyncIterator, Tuple
+from functools import lru_cache
 from app.models.resume import AnalysisReport
 from app.core.config import settings
+from app.core.lazy import lazy_import
+from app.core.limiter import ProviderOverloadedError, get_provider_limiter
+from app.core.metrics import metrics
+from app.core.resilience import call_with_resilience
+from app.services.prompt_compaction import (
+    JOB_SECTION_PRIORITIES,
+    RESUME_SECTION_PRIORITIES,
+    compact_document,
+    estimate_tokens
+)
 
 logger = logging.getLogger(__name__)
 
-# ---  Initialize Gemini client once ---
-_genai_client = genai.Client(api_key=settings.GEMINI_API_KEY)
+# --- The Gemini SDK is imported on first use, not at worker boot ---
+genai = lazy_import("google.genai")
+types = lazy_import("google.genai.types")
+
+
+@lru_cache(maxsize=1)
+def _get_genai_client():
+    """Create the Gemini client once, on first use."""
+    return genai.Client(api_key=settings.GEMINI_API_KEY)
+
+ANALYSIS_MODEL = "gemini-2.5-pro"
 
 # --- Comprehensive Analysis Prompt ---
 AUTOMATED_ANALYSIS_PROMPT = """
@@ -82,6 +100,117 @@ Your task: Conduct a comprehensive resume analysis by automatically extracting j
 - Return ONLY valid JSON, no additional text or formatting
 """
 
+def compact_analysis_inputs(parsed_resume_content: str, scraped_job_content: str) -> Tuple[str, str]:
+    """
+    Shrink the job posting and resume before they are sent to Gemini.
+
+    Scraped boilerplate is stripped from the posting, repeated lines are dropped from both, and
+    each is fit into its token budget, keeping requirements and experience over benefits or
+    hobbies. Estimated input tokens before and after are recorded as analysis_input_tokens.
+
+    Returns:
+        (resume content, job content)
+    """
+    if not settings.PROMPT_COMPACTION_ENABLED:
+        return parsed_resume_content, scraped_job_content
+    job = compact_document(
+        scraped_job_content, settings.PROMPT_JOB_TOKEN_BUDGET, JOB_SECTION_PRIORITIES, scraped=True
+    )
+    resume = compact_document(parsed_resume_content, settings.PROMPT_RESUME_TOKEN_BUDGET, RESUME_SECTION_PRIORITIES)
+
+    before = estimate_tokens(parsed_resume_content) + estimate_tokens(scraped_job_content)
+    after = estimate_tokens(resume) + estimate_tokens(job)
+    metrics.observe("analysis_input_tokens", before, stage="raw")
+    metrics.observe("analysis_input_tokens", after, stage="compacted")
+    logger.info(f"Compacted analysis inputs from ~{before} to ~{after} tokens")
+    return resume, job
+
+
+def build_analysis_prompt(parsed_resume_content: str, scraped_job_content: str) -> str:
+    """
+    Build the per-request part of the analysis prompt from the resume and job posting content.
+    AUTOMATED_ANALYSIS_PROMPT is sent as the system instruction (see _analysis_config).
+    """
+    parsed_resume_content, scraped_job_content = compact_analysis_inputs(parsed_resume_content, scraped_job_content)
+    return f"""**SCRAPED JOB POSTING CONTENT:**
+{scraped_job_content}
+
+**CANDIDATE RESUME CONTENT:**
+{parsed_resume_content}
+
+Please analyze the resume against the job posting and return the analysis as valid JSON only.
+"""
+
+
+def _analysis_config() -> "types.GenerateContentConfig":
+    # --- The static prompt goes first as the system instruction: an identical prefix on every
+    # request is what Gemini's implicit caching bills at the cached-token rate ---
+    return types.GenerateContentConfig(
+        system_instruction=AUTOMATED_ANALYSIS_PROMPT,
+        temperature=0.2,
+        max_output_tokens=4000,
+        response_mime_type="application/json",
+        # thinking_config=types.ThinkingConfig(thinking_budget=0)
+    )
+
+
+def _record_usage(usage) -> None:
+    """Export how many input tokens Gemini served from its implicit prefix cache."""
+    if usage is None:
+        return
+    prompt_tokens = usage.prompt_token_count or 0
+    cached_tokens = usage.cached_content_token_count or 0
+    metrics.increment("gemini_input_tokens_total", cached_tokens, kind="cached")
+    metrics.increment("gemini_input_tokens_total", prompt_tokens - cached_tokens, kind="uncached")
+    logger.info(f"Gemini analysis input: {prompt_tokens} tokens, {cached_tokens} from cache")
+
+
+def parse_analysis_response(raw_text: str) -> AnalysisReport:
+    """
+    Parse the raw Gemini output into an AnalysisReport.
+
+    Args:
+        raw_text: Complete text returned by Gemini (possibly wrapped in a markdown code block)
+
+    Returns:
+        AnalysisReport: The validated report
+
+    Raises:
+        RuntimeError: If the text contains no valid JSON report
+    """
+    raw_text = raw_text.strip()
+    logger.debug(f"Raw Gemini response length: {len(raw_text)}")
+
+    # --- Handle potential markdown code block wrapping ---
+    if raw_text.startswith("```"):
+        logger.debug("Detected markdown code block, extracting JSON...")
+        if "```json" in raw_text:
+            raw_text = raw_text.split("```json", 1)[1].split("```", 1)[0].strip()
+        else:
+            lines = raw_text.split("\n")
+            start_idx = 1 if lines[0].startswith("```") else 0
+            end_idx = len(lines)
+            for i, line in enumerate(lines[start_idx:], start_idx):
+                if line.strip() == "```":
+                    end_idx = i
+                    break
+            raw_text = "\n".join(lines[start_idx:end_idx]).strip()
+
+    if not raw_text:
+        raise RuntimeError("No valid JSON content found in response")
+
+    logger.debug(f"Cleaned JSON response: {raw_text[:200]}...")
+    try:
+        report = AnalysisReport.model_validate_json(raw_text)
+        logger.info(f"Successfully generated analysis report with match score: {report.match_score}%")
+        return report
+
+    except Exception as parse_error:
+        logger.error(f"Failed to parse JSON response: {parse_error}")
+        logger.error(f"Raw response: {raw_text}")
+        raise RuntimeError(f"Invalid JSON format in Gemini response: {str(parse_error)}")
+
+
 async def generate_automated_analysis(
     parsed_resume_content: str,
     scraped_job_content: str
@@ -97,77 +226,90 @@ async def generate_automated_analysis(
         AnalysisReport: Structured analysis with scores, keywords, and suggestions
         
     Raises:
-        RuntimeError: If Gemini API fails or returns invalid response
+        ProviderOverloadedError: If the Gemini limiter cannot admit the call in time or its circuit is open
+        RuntimeError: If Gemini API still fails after retries or returns invalid response
     """
     
     # Build the complete prompt
-    full_prompt = f"""{AUTOMATED_ANALYSIS_PROMPT}
-
-**SCRAPED JOB POSTING CONTENT:**
-{scraped_job_content}
-
-**CANDIDATE RESUME CONTENT:**
-{parsed_resume_content}
-
-Please analyze the resume against the job posting and return the analysis as valid JSON only.
-"""
+    full_prompt = build_analysis_prompt(parsed_resume_content, scraped_job_content)
 
     try:
         logger.info("Sending request to Gemini API...")
-        
-        # --- Use Gemini SDK ---
-        response = _genai_client.models.generate_content(
-            model="gemini-2.5-pro",
-            contents=full_prompt,
-            config=types.GenerateContentConfig(
-                temperature=0.2,
-                max_output_tokens=4000,
-                response_mime_type="application/json",
-                # thinking_config=types.ThinkingConfig(thinking_budget=0)
-            )
-        )
+
+        async def _generate():
+            async with get_provider_limiter("gemini").acquire():
+                return await _get_genai_client().aio.models.generate_content(
+                    model=ANALYSIS_MODEL,
+                    contents=full_prompt,
+                    config=_analysis_config()
+                )
+
+        # --- Use Gemini SDK (retried on transient errors; not hedged, the call is too expensive) ---
+        response = await call_with_resilience("gemini", _generate)
+        _record_usage(getattr(response, "usage_metadata", None))
         
         # --- Check if response has content --- 
         if not response or not hasattr(response, 'text') or response.text is None:
             logger.error("Gemini API returned empty or invalid response")
             raise RuntimeError("Gemini API returned empty response")
             
-        raw_text = response.text.strip()
-        logger.debug(f"Raw Gemini response length: {len(raw_text)}")
-        
-        # --- Handle potential markdown code block wrapping ---
-        if raw_text.startswith("```"):
-            logger.debug("Detected markdown code block, extracting JSON...")
-            if "```json" in raw_text:
-                raw_text = raw_text.split("```json", 1)[1].split("```", 1)[0].strip()
-            else:
-                lines = raw_text.split("\n")
-                start_idx = 1 if lines[0].startswith("```") else 0
-                end_idx = len(lines)
-                for i, line in enumerate(lines[start_idx:], start_idx):
-                    if line.strip() == "```":
-                        end_idx = i
-                        break
-                raw_text = "\n".join(lines[start_idx:end_idx]).strip()
-        
-        if not raw_text:
-            raise RuntimeError("No valid JSON content found in response")
-            
-        logger.debug(f"Cleaned JSON response: {raw_text[:200]}...")
-        try:
-            report = AnalysisReport.model_validate_json(raw_text)
-            logger.info(f"Successfully generated analysis report with match score: {report.match_score}%")
-            return report
-            
-        except Exception as parse_error:
-            logger.error(f"Failed to parse JSON response: {parse_error}")
-            logger.error(f"Raw response: {raw_text}")
-            raise RuntimeError(f"Invalid JSON format in Gemini response: {str(parse_error)}")
+        return parse_analysis_response(response.text)
             
+    except ProviderOverloadedError:
+        raise
     except Exception as e:
         error_msg = f"Gemini analysis failed: {str(e)}"
         logger.error(error_msg, exc_info=True)
         if hasattr(e, 'response'):
             logger.error(f"HTTP Response: {e.response}")
             
-        raise RuntimeError(error_msg) from e
\ No newline at end of file
+        raise RuntimeError(error_msg) from e
+
+
+async def stream_automated_analysis(
+    parsed_resume_content: str,
+    scraped_job_content: str
+) -> AsyncIterator[str]:
+    """
+    Stream the raw analysis text from Gemini's streaming API as it is generated.
+
+    The concatenated chunks form the same JSON document returned by
+    generate_automated_analysis; use parse_analysis_response on the full text.
+
+    Args:
+        parsed_resume_content: Extracted text from the PDF resume
+        scraped_job_content: Complete scraped content from job posting URL
+
+    Yields:
+        str: Text chunks in generation order
+
+    Raises:
+        RuntimeError: If the Gemini streaming call fails
+    """
+    full_prompt = build_analysis_prompt(parsed_resume_content, scraped_job_content)
+
+    try:
+        logger.info("Opening Gemini streaming request...")
+        async with get_provider_limiter("gemini").acquire():
+            # --- Only opening the stream is retried; nothing has been yielded at that point ---
+            stream = await call_with_resilience(
+                "gemini",
+                lambda: _get_genai_client().aio.models.generate_content_stream(
+                    model=ANALYSIS_MODEL,
+                    contents=full_prompt,
+                    config=_analysis_config()
+                )
+            )
+            usage = None
+            async for chunk in stream:
+                usage = getattr(chunk, "usage_metadata", None) or usage
+                if chunk and chunk.text:
+                    yield chunk.text
+            _record_usage(usage)
+
+    except ProviderOverloadedError:
+        raise
+    except Exception as e:
+        error_msg = f"Gemini streaming analysis failed: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        raise RuntimeError(error_msg) from e
@@ -0,0 +1,331 @@
+import asyncio
+import logging
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional
+
+from fastapi import HTTPException
+from app.core.config import settings
+from app.models.resume import AnalysisJobResponse, AnalysisReport, JobStatus
+from app.services.analysis_service import analyze_resume_against_job_url
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis_jobs (
+    job_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    file_id TEXT NOT NULL,
+    job_url TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_expires_at REAL,
+    lease_token TEXT,
+    result TEXT,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS analysis_jobs_status_idx ON analysis_jobs (status, created_at);
+"""
+
+# --- Columns added after the first release; applied to job files created before them ---
+_MIGRATIONS = (
+    "ALTER TABLE analysis_jobs ADD COLUMN lease_token TEXT",
+)
+
+
+class JobQueueFullError(Exception):
+    """Raised when the number of queued jobs has reached JOB_QUEUE_MAX_PENDING."""
+
+    def __init__(self, pending: int, retry_after: int):
+        super().__init__(f"Analysis queue is full ({pending} jobs pending)")
+        self.pending = pending
+        self.retry_after = retry_after
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class JobStore:
+    """
+    SQLite-backed persistent store for analysis jobs.
+    Doubles as the work queue: workers claim queued jobs with a time-limited lease,
+    so several processes sharing the same file never run the same job twice.
+
+    Each claim issues a fresh lease token. The owning worker renews the lease while it
+    runs, and complete/fail/requeue only apply while that token still holds the lease,
+    so a worker whose lease expired and was reclaimed cannot overwrite the new attempt.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            for statement in _MIGRATIONS:
+                try:
+                    conn.execute(statement)
+                except sqlite3.OperationalError:
+                    # --- Already applied ---
+                    pass
+            self._initialized = True
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def create(self, user_id: str, file_id: str, job_url: str) -> sqlite3.Row:
+        job_id = str(uuid.uuid4())
+        now = _now()
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO analysis_jobs (job_id, user_id, file_id, job_url, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, user_id, file_id, job_url, JobStatus.QUEUED.value, now, now)
+            )
+            return conn.execute("SELECT * FROM analysis_jobs WHERE job_id = ?", (job_id,)).fetchone()
+
+    def get(self, job_id: str) -> Optional[sqlite3.Row]:
+        with self._connection() as conn:
+            return conn.execute("SELECT * FROM analysis_jobs WHERE job_id = ?", (job_id,)).fetchone()
+
+    def count_pending(self) -> int:
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM analysis_jobs WHERE status = ?", (JobStatus.QUEUED.value,)
+            ).fetchone()
+            return row[0]
+
+    def claim_next(self, lease_seconds: int, max_attempts: int) -> Optional[sqlite3.Row]:
+        """
+        Atomically claim the oldest runnable job.
+
+        A job is runnable when it is queued, or when it is running but its lease
+        expired (the worker that owned it crashed or was killed).
+
+        Returns:
+            The claimed job row (with its new lease_token), or None if nothing is runnable.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # --- Expired leases that already used all attempts are given up on ---
+            conn.execute(
+                "UPDATE analysis_jobs SET status = ?, error = ?, updated_at = ? "
+                "WHERE status = ? AND lease_expires_at < ? AND attempts >= ?",
+                (JobStatus.FAILED.value, "Worker lease expired", _now(),
+                 JobStatus.RUNNING.value, now, max_attempts)
+            )
+            row = conn.execute(
+                "SELECT job_id FROM analysis_jobs "
+                "WHERE status = ? OR (status = ? AND lease_expires_at < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (JobStatus.QUEUED.value, JobStatus.RUNNING.value, now)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE analysis_jobs SET status = ?, attempts = attempts + 1, "
+                "lease_expires_at = ?, lease_token = ?, updated_at = ? WHERE job_id = ?",
+                (JobStatus.RUNNING.value, now + lease_seconds, uuid.uuid4().hex, _now(), row["job_id"])
+            )
+            claimed = conn.execute("SELECT * FROM analysis_jobs WHERE job_id = ?", (row["job_id"],)).fetchone()
+            conn.execute("COMMIT")
+            return claimed
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def renew(self, job_id: str, lease_token: str, lease_seconds: int) -> bool:
+        """Extend a running job's lease. Returns False if lease_token no longer holds it."""
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "UPDATE analysis_jobs SET lease_expires_at = ?, updated_at = ? "
+                "WHERE job_id = ? AND status = ? AND lease_token = ?",
+                (time.time() + lease_seconds, _now(), job_id, JobStatus.RUNNING.value, lease_token)
+            )
+            return cursor.rowcount == 1
+
+    def _finish(self, job_id: str, lease_token: str, status: JobStatus, result: Optional[str], error: Optional[str]) -> bool:
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "UPDATE analysis_jobs SET status = ?, result = ?, error = ?, lease_expires_at = NULL, "
+                "lease_token = NULL, updated_at = ? WHERE job_id = ? AND status = ? AND lease_token = ?",
+                (status.value, result, error, _now(), job_id, JobStatus.RUNNING.value, lease_token)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str, lease_token: str, report: AnalysisReport) -> bool:
+        """Mark the job succeeded. Returns False (and changes nothing) if the lease was lost."""
+        return self._finish(job_id, lease_token, JobStatus.SUCCEEDED, report.model_dump_json(), None)
+
+    def fail(self, job_id: str, lease_token: str, error: str) -> bool:
+        """Mark the job failed. Returns False (and changes nothing) if the lease was lost."""
+        return self._finish(job_id, lease_token, JobStatus.FAILED, None, error)
+
+    def requeue(self, job_id: str, lease_token: str, error: str) -> bool:
+        """Put the job back in the queue. Returns False (and changes nothing) if the lease was lost."""
+        return self._finish(job_id, lease_token, JobStatus.QUEUED, None, error)
+
+
+def job_to_response(row: sqlite3.Row) -> AnalysisJobResponse:
+    return AnalysisJobResponse(
+        job_id=row["job_id"],
+        status=JobStatus(row["status"]),
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+        attempts=row["attempts"],
+        result=AnalysisReport.model_validate_json(row["result"]) if row["result"] else None,
+        error=row["error"] if row["status"] == JobStatus.FAILED.value else None,
+    )
+
+
+class AnalysisWorkerPool:
+    """
+    Fixed-size pool of asyncio workers running the analysis pipeline for queued jobs.
+    The pool size caps concurrent Landing AI / Gemini work for this process.
+    """
+
+    def __init__(self, store: JobStore):
+        self.store = store
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self, workers: int) -> None:
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker_loop(i), name=f"analysis-worker-{i}")
+            for i in range(workers)
+        ]
+        logger.info(f"Started {workers} analysis workers (store: {self.store.path})")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Analysis workers stopped")
+
+    def notify(self) -> None:
+        """Wake idle workers so a freshly submitted job starts without waiting for the poll interval."""
+        self._wakeup.set()
+
+    async def _worker_loop(self, worker_index: int) -> None:
+        while True:
+            try:
+                # --- Clear before claiming so a submit racing with an empty claim is not missed ---
+                self._wakeup.clear()
+                job = await asyncio.to_thread(
+                    self.store.claim_next, settings.JOB_LEASE_SECONDS, settings.JOB_MAX_ATTEMPTS
+                )
+                if job is None:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=settings.JOB_POLL_INTERVAL_SECONDS)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                await self._run_job(worker_index, job)
+            except Exception as e:
+                # --- A busy or unavailable store must not end the worker: the pool would shrink for good ---
+                logger.error(f"Worker {worker_index} error, retrying in {settings.JOB_POLL_INTERVAL_SECONDS}s: {e}", exc_info=True)
+                await asyncio.sleep(settings.JOB_POLL_INTERVAL_SECONDS)
+
+    async def _heartbeat(self, job_id: str, lease_token: str) -> None:
+        """Renew the job's lease every third of JOB_LEASE_SECONDS until cancelled or the lease is lost."""
+        while True:
+            await asyncio.sleep(settings.JOB_LEASE_SECONDS / 3)
+            try:
+                renewed = await asyncio.to_thread(self.store.renew, job_id, lease_token, settings.JOB_LEASE_SECONDS)
+            except Exception as e:
+                # --- A busy store is retried on the next beat; the lease still has two beats left ---
+                logger.warning(f"Could not renew the lease on job {job_id}: {e}")
+                continue
+            if not renewed:
+                logger.warning(f"Lost the lease on job {job_id}; another worker may have reclaimed it")
+                return
+
+    async def _run_job(self, worker_index: int, job: sqlite3.Row) -> None:
+        job_id, lease_token = job["job_id"], job["lease_token"]
+        logger.info(f"Worker {worker_index} running job {job_id} (attempt {job['attempts']})")
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, lease_token))
+        try:
+            try:
+                report = await analyze_resume_against_job_url(file_id=job["file_id"], job_url=job["job_url"])
+                record, outcome = self.store.complete, report
+            except HTTPException as e:
+                # --- Server-side failures get another attempt; client errors are final ---
+                if e.status_code >= 500 and job["attempts"] < settings.JOB_MAX_ATTEMPTS:
+                    logger.warning(f"Job {job_id} failed with {e.status_code}, requeueing: {e.detail}")
+                    record, outcome = self.store.requeue, str(e.detail)
+                else:
+                    logger.warning(f"Job {job_id} failed: {e.detail}")
+                    record, outcome = self.store.fail, str(e.detail)
+            except Exception as e:
+                logger.error(f"Job {job_id} crashed: {e}", exc_info=True)
+                record, outcome = self.store.fail, "An unexpected error occurred during resume analysis."
+
+            try:
+                finished = await asyncio.to_thread(record, job_id, lease_token, outcome)
+            except Exception as e:
+                # --- The outcome could not be stored; the job stays running and is retried once its lease lapses ---
+                logger.error(f"Could not record the outcome of job {job_id}, leaving it to lease expiry: {e}", exc_info=True)
+                return
+        finally:
+            heartbeat.cancel()
+        if not finished:
+            logger.warning(f"Job {job_id} lease was lost before it finished; discarding this attempt's outcome")
+        elif isinstance(outcome, AnalysisReport):
+            logger.info(f"Job {job_id} succeeded")
+
+
+# --- Singletons ---
+job_store = JobStore(settings.JOB_STORE_PATH)
+worker_pool = AnalysisWorkerPool(job_store)
+
+
+async def submit_analysis_job(user_id: str, file_id: str, job_url: str) -> AnalysisJobResponse:
+    """
+    Persist a new analysis job and wake a worker.
+
+    Raises:
+        JobQueueFullError: If JOB_QUEUE_MAX_PENDING jobs are already waiting.
+    """
+    pending = await asyncio.to_thread(job_store.count_pending)
+    if pending >= settings.JOB_QUEUE_MAX_PENDING:
+        # --- Rough drain estimate: ~30s per analysis spread over the worker pool ---
+        retry_after = max(5, int(pending * 30 / settings.ANALYSIS_WORKERS))
+        raise JobQueueFullError(pending, retry_after)
+
+    row = await asyncio.to_thread(job_store.create, user_id, file_id, job_url)
+    worker_pool.notify()
+    logger.info(f"Queued analysis job {row['job_id']} for user {user_id}")
+    return job_to_response(row)
+
+
+async def get_analysis_job(job_id: str, user_id: str) -> Optional[AnalysisJobResponse]:
+    """Return the job if it exists and belongs to user_id, otherwise None."""
+    row = await asyncio.to_thread(job_store.get, job_id)
+    if row is None or row["user_id"] != user_id:
+        return None
+    return job_to_response(row)
@@ -1,33 +1,189 @@
-import os
-from agentic_doc.parse import parse
+import asyncio
+import hashlib
+import io
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Optional
 from app.core.config import settings
-from app.services.storage_service import download_resume
+from app.core.lazy import lazy_import
+from app.core.limiter import get_provider_limiter
+from app.core.metrics import metrics
+from app.services.resume_store import FileStatus, resume_store
+from app.services.storage_service import InvalidPDFError, discard_resume, download_resume
+
+logger = logging.getLogger(__name__)
+
+# --- agentic_doc.parse pulls in PDF/image stacks; imported on first parse ---
+agentic_doc_parse = lazy_import("agentic_doc.parse")
+pypdf = lazy_import("pypdf")
+
+# --- Resume section headings; a line that is just one of these is rendered as a markdown heading ---
+_SECTION_HEADING = re.compile(
+    r"^\s*(summary|profile|about me|objective|experience|work experience|professional experience|"
+    r"employment( history)?|education|skills|technical skills|projects|certifications?|languages|"
+    r"awards|publications|volunteering|interests)\s*:?\s*$",
+    re.IGNORECASE
+)
+# --- Pages with less text than this are image-only (scanned) when they carry an image ---
+_SCANNED_PAGE_MAX_CHARS = 50
+
+
+@dataclass
+class LocalExtraction:
+    """Text layer of a PDF and the quality signals that decide whether it is good enough."""
+    text: str
+    pages: int
+    chars_per_page: float
+    scanned_pages: int
+    garbled_ratio: float
+    sections: int
+
+    def escalation_reason(self) -> Optional[str]:
+        """Why this extraction should go to Landing AI instead, or None if it is usable."""
+        if self.pages > settings.LOCAL_PARSE_MAX_PAGES:
+            return "too_many_pages"
+        if self.scanned_pages:
+            return "scanned"
+        if self.chars_per_page < settings.LOCAL_PARSE_MIN_CHARS_PER_PAGE:
+            return "low_density"
+        if self.garbled_ratio > settings.LOCAL_PARSE_MAX_GARBLED_RATIO:
+            return "garbled"
+        if self.sections < settings.LOCAL_PARSE_MIN_SECTIONS:
+            return "no_structure"
+        return None
+
+
+def _has_images(page) -> bool:
+    resources = page.get("/Resources")
+    xobjects = resources.get_object().get("/XObject") if resources is not None else None
+    if xobjects is None:
+        return False
+    return any(xobject.get_object().get("/Subtype") == "/Image" for xobject in xobjects.get_object().values())
+
+
+def extract_text_locally(pdf_bytes: bytes) -> LocalExtraction:
+    """
+    Extract the PDF's text layer on the CPU (pypdf) and score it.
+
+    Section-heading lines become markdown headings, so the output has the shape
+    Landing AI's markdown gives the analysis prompt.
+    """
+    reader = pypdf.PdfReader(io.BytesIO(pdf_bytes))
+    pages = reader.pages[:settings.LOCAL_PARSE_MAX_PAGES + 1]
+    texts, scanned = [], 0
+    for page in pages:
+        text = page.extract_text() or ""
+        if len(text.strip()) < _SCANNED_PAGE_MAX_CHARS and _has_images(page):
+            scanned += 1
+        texts.append(text)
+
+    lines, sections = [], 0
+    for line in "\n".join(texts).splitlines():
+        line = line.rstrip()
+        if _SECTION_HEADING.match(line):
+            sections += 1
+            line = f"## {line.strip().rstrip(':').title()}"
+        lines.append(line)
+    text = re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+    visible = [c for c in text if not c.isspace()]
+    garbled = sum(1 for c in visible if c == "\ufffd" or not c.isprintable())
+    return LocalExtraction(
+        text=text,
+        pages=len(reader.pages),
+        chars_per_page=len(visible) / max(1, len(pages)),
+        scanned_pages=scanned,
+        garbled_ratio=garbled / max(1, len(visible)),
+        sections=sections
+    )
+
 
 async def parse_resume_from_storage(file_id: str) -> str:
     """
     Fetch resume from Supabase Storage and parse it with Landing AI.
     Uses agentic_doc library which supports parsing PDF bytes directly.
+
+    Parsed content is cached by content hash: a file_id whose hash this service computed skips
+    the download too; direct uploads and files from before content hashing are hashed after
+    download.
+
+    Raises:
+        InvalidPDFError: If a direct upload does not match the SHA-256 its file_id was derived
+            from; the upload is discarded.
+    """
+    record = await asyncio.to_thread(resume_store.get_file, file_id)
+    verified = record is not None and record["status"] == FileStatus.STORED.value
+    sha256 = record["sha256"] if verified else None
+    pdf_bytes = None
+    if sha256 is None:
+        # ---  Get PDF bytes from Supabase Storage ---- 
+        pdf_bytes = await download_resume(file_id)
+        sha256 = hashlib.sha256(pdf_bytes).hexdigest()
+        if record is not None:
+            if record["sha256"] != sha256:
+                # --- Direct upload whose bytes are not what the client claimed: its file_id would
+                # dedupe a later upload of the claimed content onto these bytes ---
+                await discard_resume(file_id)
+                raise InvalidPDFError("Uploaded file does not match its declared SHA-256. Please upload it again.")
+            await asyncio.to_thread(resume_store.set_status, file_id, FileStatus.STORED)
+
+    cached = await asyncio.to_thread(resume_store.get_parsed, sha256)
+    metrics.increment("resume_parse_cache_total", result="hit" if cached is not None else "miss")
+    if cached is not None:
+        return cached
+    if pdf_bytes is None:
+        pdf_bytes = await download_resume(file_id)
+
+    content = await _parse_tiered(pdf_bytes)
+    if content:
+        await asyncio.to_thread(resume_store.put_parsed, sha256, content)
+    return content
+
+
+async def _parse_tiered(pdf_bytes: bytes) -> str:
     """
-    # ---  Get PDF bytes from Supabase Storage ---- 
-    pdf_bytes = await download_resume(file_id)
-    
-    #----   Set the API key as environment variable --- 
-    original_key = os.environ.get('VISION_AGENT_API_KEY')
-    os.environ['VISION_AGENT_API_KEY'] = settings.LANDING_AI_API_KEY
-    
-    try:
-        # --- Parse PDF bytes directly ----
-        results = parse(pdf_bytes)
-        
-        if results and len(results) > 0:
-            # ---  Extract markdown content from first result ---
-            markdown_content = results[0].markdown
-            return markdown_content.strip() if markdown_content else ""
-        else:
-            return ""
-            
-    finally:
-        if original_key is not None:
-            os.environ['VISION_AGENT_API_KEY'] = original_key
-        elif 'VISION_AGENT_API_KEY' in os.environ:
-            del os.environ['VISION_AGENT_API_KEY']
+    Parse with the local extractor and escalate to Landing AI only when its output is poor
+    (scanned, sparse, garbled or unstructured) or it fails.
+
+    The tier used is counted in resume_parse_total{tier,reason} and timed in resume_parse_ms{tier}.
+    """
+    reason = "disabled"
+    if settings.LOCAL_PARSE_ENABLED:
+        started = time.perf_counter()
+        try:
+            extraction = await asyncio.to_thread(extract_text_locally, pdf_bytes)
+            reason = extraction.escalation_reason()
+        except Exception as e:
+            logger.warning(f"Local PDF extraction failed, escalating to Landing AI: {e}")
+            extraction, reason = None, "error"
+        metrics.observe("resume_parse_ms", (time.perf_counter() - started) * 1000, tier="local")
+        if reason is None:
+            metrics.increment("resume_parse_total", tier="local", reason="ok")
+            return extraction.text
+
+    started = time.perf_counter()
+    content = await _parse_pdf(pdf_bytes)
+    metrics.observe("resume_parse_ms", (time.perf_counter() - started) * 1000, tier="landing_ai")
+    metrics.increment("resume_parse_total", tier="landing_ai", reason=reason)
+    logger.info(f"Parsed resume with Landing AI (local tier: {reason})")
+    return content
+
+
+async def _parse_pdf(pdf_bytes: bytes) -> str:
+    """Parse PDF bytes to markdown with Landing AI."""
+    # --- The key goes in the per-call config: parses run concurrently in threads, so it must not
+    # be swapped in and out of the process environment ---
+    config = agentic_doc_parse.ParseConfig(api_key=settings.LANDING_AI_API_KEY)
+
+    # --- Parse PDF bytes directly (off the event loop, within the Landing AI quota) ----
+    async with get_provider_limiter("landing_ai").acquire():
+        results = await asyncio.to_thread(agentic_doc_parse.parse, pdf_bytes, config=config)
+
+    if results and len(results) > 0:
+        # ---  Extract markdown content from first result ---
+        markdown_content = results[0].markdown
+        return markdown_content.strip() if markdown_content else ""
+    else:
+        return ""
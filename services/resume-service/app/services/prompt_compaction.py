@@ -0,0 +1,187 @@
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+# --- Gemini averages ~4 characters per token on English prose; good enough for budgeting ---
+_CHARS_PER_TOKEN = 4
+
+_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_BARE_URL = re.compile(r"<?https?://\S+>?")
+_LINKS_ONLY = re.compile(r"^(?:\s*(?:[-*+|·•]\s*)?(?:!?\[[^\]]*\]\([^)]*\)))+\s*$")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*)$")
+_LIST_MARKER = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+")
+
+# --- Whole sections Firecrawl keeps from job boards that never describe the job itself ---
+_BOILERPLATE_SECTION = re.compile(
+    r"similar jobs|more jobs|people also viewed|jobs you may|recommended jobs|related jobs|"
+    r"explore collaborative articles|sign in to|join now|cookie|share this job|report this job|"
+    r"referrals increase|get notified",
+    re.IGNORECASE
+)
+# --- Single lines of site chrome (navigation, CTAs, legal footer) ---
+_BOILERPLATE_LINE = re.compile(
+    r"^(sign in|sign up|join now|apply( now)?|easy apply|save|share( this job.*)?|report this job|show more|show less|"
+    r"see who .* has hired for this role|skip to main content|back to search|© .*|copyright .*|"
+    r"(about|accessibility|user agreement|privacy policy|cookie policy|copyright policy|brand policy|"
+    r"guest controls|community guidelines|language|careers|help center|terms( of (use|service))?)"
+    r"( [|·•] .*)?)$",
+    re.IGNORECASE
+)
+
+# --- Lower number = kept first when a document is over budget ---
+JOB_SECTION_PRIORITIES = (
+    (0, re.compile(r"requirement|qualification|must have|you have|what you.ll need|skills|experience|"
+                   r"responsibilit|what you.ll do|the role|your role|duties|tech stack", re.IGNORECASE)),
+    (1, re.compile(r"nice to have|preferred|bonus|plus|about the (job|position)|description|overview",
+                   re.IGNORECASE)),
+    (3, re.compile(r"benefit|perk|we offer|compensation|salary|equal opportunity|diversity|"
+                   r"about (us|the company)|who we are|how to apply|hiring process", re.IGNORECASE)),
+)
+RESUME_SECTION_PRIORITIES = (
+    (0, re.compile(r"experience|employment|work history|skills|projects", re.IGNORECASE)),
+    (1, re.compile(r"education|certification|summary|profile|about", re.IGNORECASE)),
+    (3, re.compile(r"interest|hobbies|references|volunteer|personal", re.IGNORECASE)),
+)
+_DEFAULT_PRIORITY = 2
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate Gemini token count of `text`."""
+    return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+@dataclass
+class _Section:
+    heading: Optional[str]
+    lines: List[str]
+    priority: int
+
+    def render(self) -> str:
+        return "\n".join(([self.heading] if self.heading else []) + self.lines).strip()
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_LIST_MARKER.sub("", text).lower().split())
+
+
+def strip_boilerplate(markdown: str) -> str:
+    """
+    Remove scraped page chrome: images, link targets, bare URLs, navigation and footer lines,
+    and whole sections such as "Similar jobs" or "People also viewed".
+    """
+    kept, skip_level = [], None
+    for line in markdown.splitlines():
+        heading = _HEADING.match(line.strip())
+        if heading:
+            level = len(heading.group(1))
+            if skip_level is not None and level > skip_level:
+                continue
+            skip_level = level if _BOILERPLATE_SECTION.search(heading.group(2)) else None
+            if skip_level is not None:
+                continue
+        elif skip_level is not None or _LINKS_ONLY.match(line):
+            # --- Boilerplate section body, or a navigation line made only of links ---
+            continue
+
+        line = _BARE_URL.sub("", _LINK.sub(r"\1", _IMAGE.sub("", line))).rstrip()
+        text = _LIST_MARKER.sub("", line).strip()
+        if not heading and text and (_BOILERPLATE_LINE.match(text) or not any(c.isalnum() for c in text)):
+            continue
+        kept.append(line)
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(kept)).strip()
+
+
+def _split_sections(markdown: str, priorities: Tuple) -> List[_Section]:
+    # --- Untitled lead text and the document title (job title, candidate name) come first ---
+    sections = [_Section(heading=None, lines=[], priority=0)]
+    parents: List[Tuple[int, int]] = []
+    for line in markdown.splitlines():
+        heading = _HEADING.match(line.strip())
+        if not heading:
+            sections[-1].lines.append(line)
+            continue
+        level, title = len(heading.group(1)), heading.group(2)
+        while parents and parents[-1][0] >= level:
+            parents.pop()
+        priority = next((p for p, pattern in priorities if pattern.search(title)), None)
+        if priority is not None:
+            parents.append((level, priority))
+        elif parents:
+            # --- "### Senior Engineer, Acme" ranks with the "## Experience" it sits under ---
+            priority = parents[-1][1]
+        else:
+            priority = 0 if level == 1 else _DEFAULT_PRIORITY
+        sections.append(_Section(heading=line.strip(), lines=[], priority=priority))
+    return [section for section in sections if section.heading or any(line.strip() for line in section.lines)]
+
+
+def deduplicate(sections: List[_Section]) -> List[_Section]:
+    """
+    Drop sections that repeat an earlier one (job boards often render the description twice) and
+    repeated lines within a section. Lines are only compared inside their own section: two resume
+    roles may legitimately share a bullet such as "- Python".
+    """
+    seen_sections = set()
+    result = []
+    for section in sections:
+        seen, lines = set(), []
+        for line in section.lines:
+            key = _normalize(line)
+            if key:
+                if key in seen:
+                    continue
+                seen.add(key)
+            lines.append(line)
+        signature = (_normalize(section.heading or ""), tuple(_normalize(line) for line in lines if line.strip()))
+        if signature in seen_sections:
+            continue
+        seen_sections.add(signature)
+        result.append(_Section(section.heading, lines, section.priority))
+    return result
+
+
+def _truncate(section: _Section, budget: int) -> Optional[_Section]:
+    """Keep the section's leading lines that fit in `budget` tokens, or None if not even one does."""
+    used = estimate_tokens(section.heading or "")
+    lines = []
+    for line in section.lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            break
+        lines.append(line)
+        used += cost
+    if not any(line.strip() for line in lines):
+        return None
+    return _Section(section.heading, lines + ["…"], section.priority)
+
+
+def fit_to_budget(sections: List[_Section], budget: int) -> List[_Section]:
+    """
+    Keep sections in priority order until `budget` tokens are used; the first section that does
+    not fit is cut at a line boundary and the rest are dropped. Document order is preserved.
+    """
+    chosen = {}
+    remaining = budget
+    for index in sorted(range(len(sections)), key=lambda i: (sections[i].priority, i)):
+        section = sections[index]
+        cost = estimate_tokens(section.render()) + 1
+        if cost <= remaining:
+            chosen[index] = section
+            remaining -= cost
+            continue
+        truncated = _truncate(section, remaining)
+        if truncated is not None:
+            chosen[index] = truncated
+        break
+    return [chosen[i] for i in sorted(chosen)]
+
+
+def compact_document(markdown: str, budget: int, priorities: Tuple, scraped: bool = False) -> str:
+    """Strip boilerplate (scraped pages only), deduplicate and fit a markdown document into `budget` tokens."""
+    if scraped:
+        markdown = strip_boilerplate(markdown)
+    sections = deduplicate(_split_sections(markdown, priorities))
+    if sum(estimate_tokens(section.render()) + 1 for section in sections) > budget:
+        sections = fit_to_budget(sections, budget)
+    return "\n\n".join(section.render() for section in sections)
@@ -0,0 +1,130 @@
+import hashlib
+import hmac
+import logging
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Iterator, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resume_files (
+    file_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'stored',
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS parsed_resumes (
+    sha256 TEXT PRIMARY KEY,
+    content TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+"""
+
+# --- Server-side key: without it a file_id cannot be computed from a user id and a file hash.
+# Derived from the JWT secret, so ids stay stable across deploys for as long as that secret does ---
+_FILE_ID_KEY = hmac.new(settings.SUPABASE_JWT_SECRET.encode(), b"resume-file-id", hashlib.sha256).digest()
+
+
+class FileStatus(str, Enum):
+    # --- Signed upload URL issued; nothing registered in storage yet ---
+    PENDING = "pending"
+    # --- Uploaded directly by the client; sha256 is the client's claim until the bytes are read ---
+    UNVERIFIED = "unverified"
+    # --- sha256 was computed by this service from the stored bytes ---
+    STORED = "stored"
+
+
+def content_file_id(user_id: str, sha256: str) -> str:
+    """
+    The file_id of a resume: the same user uploading the same bytes always gets the same id.
+    Ids are scoped per user, so a file_id never reveals that another user holds the same file,
+    and keyed with a server secret, so they are as unguessable as the random ids they replace.
+    """
+    digest = hmac.new(_FILE_ID_KEY, f"{user_id}:{sha256}".encode(), hashlib.sha256).digest()
+    return str(uuid.UUID(bytes=digest[:16], version=4))
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class ResumeStore:
+    """
+    SQLite-backed index of uploaded resumes and their parsed content.
+
+    resume_files maps each file_id to the SHA-256 of its bytes; parsed_resumes keeps the
+    parser output per SHA-256, so identical PDFs are parsed by Landing AI only once.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._initialized = True
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get_file(self, file_id: str) -> Optional[sqlite3.Row]:
+        with self._connection() as conn:
+            return conn.execute("SELECT * FROM resume_files WHERE file_id = ?", (file_id,)).fetchone()
+
+    def add_file(
+        self,
+        file_id: str,
+        user_id: str,
+        sha256: str,
+        size: int,
+        status: FileStatus = FileStatus.STORED
+    ) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO resume_files (file_id, user_id, sha256, size, status, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (file_id) DO UPDATE SET size = excluded.size, status = excluded.status",
+                (file_id, user_id, sha256, size, status.value, _now())
+            )
+
+    def set_status(self, file_id: str, status: FileStatus) -> None:
+        with self._connection() as conn:
+            conn.execute("UPDATE resume_files SET status = ? WHERE file_id = ?", (status.value, file_id))
+
+    def delete_file(self, file_id: str) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM resume_files WHERE file_id = ?", (file_id,))
+
+    def get_parsed(self, sha256: str) -> Optional[str]:
+        with self._connection() as conn:
+            row = conn.execute("SELECT content FROM parsed_resumes WHERE sha256 = ?", (sha256,)).fetchone()
+            return row["content"] if row else None
+
+    def put_parsed(self, sha256: str, content: str) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO parsed_resumes (sha256, content, created_at) VALUES (?, ?, ?)",
+                (sha256, content, _now())
+            )
+
+
+# --- Singleton ---
+resume_store = ResumeStore(settings.RESUME_STORE_PATH)
@@ -1,5 +1,7 @@
 import httpx
 from app.core.config import settings
+from app.core.limiter import get_provider_limiter
+from app.core.resilience import call_with_resilience
 
 async def scrape_job_posting(url: str) -> str:
     """
@@ -17,10 +19,15 @@ async def scrape_job_posting(url: str) -> str:
         "formats": ["markdown"]
     }
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.post(api_url, json=payload, headers=headers)
-        response.raise_for_status()
-        data = response.json()
+    async def _scrape() -> dict:
+        async with get_provider_limiter("firecrawl").acquire():
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                response = await client.post(api_url, json=payload, headers=headers)
+                response.raise_for_status()
+                return response.json()
+
+    # --- Scraping is read-only, so transient failures are retried and slow calls hedged ---
+    data = await call_with_resilience("firecrawl", _scrape, hedge=True)
 
     # --- FireCrawl V2 API --- 
     markdown_content = data.get("data", {}).get("markdown", "").strip()
@@ -1,49 +1,358 @@
-from supabase import create_client, Client
 from app.core.config import settings
+from app.core.lazy import lazy_import
+from app.core.metrics import metrics
+from app.services.resume_store import FileStatus, content_file_id, resume_store
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Optional, Tuple
+import asyncio
+import hashlib
+import hmac
+import httpx
+import io
+import os
+import shutil
+import tempfile
+import time
 import uuid
 import logging
 
 logger = logging.getLogger(__name__)
 
-def get_supabase_admin_client() -> Client:
+# --- The Supabase SDK is imported on first storage call ---
+supabase_sdk = lazy_import("supabase")
+
+def get_supabase_admin_client() -> "supabase_sdk.Client":
     """Returns a Supabase client authenticated with the service_role key (bypasses RLS)."""
-    return create_client(
+    return supabase_sdk.create_client(
         supabase_url=settings.SUPABASE_URL,
         supabase_key=settings.SUPABASE_KEY 
     )
 
-async def upload_resume(file) -> str:
-    supabase = get_supabase_admin_client()
-    file_id = str(uuid.uuid4())
-    file_path = f"{file_id}.pdf"  #
 
-    contents = await file.read()
+@dataclass
+class SignedUpload:
+    """A short-lived URL the client uploads one object to, without going through this service."""
+    url: str
+    token: str
+    expires_in: int
 
-    try:
-        response = supabase.storage.from_("resumes").upload(  
-            path=file_path,
-            file=contents,
-            file_options={"content-type": "application/pdf"}
+
+class SupabaseStorage:
+    """Resumes in the Supabase Storage `resumes` bucket."""
+
+    BUCKET = "resumes"
+    # --- Fixed by Supabase for signed upload URLs ---
+    SIGNED_UPLOAD_EXPIRES_SECONDS = 7200
+
+    def _bucket(self):
+        return get_supabase_admin_client().storage.from_(self.BUCKET)
+
+    def upload(self, path: str, file: BinaryIO, metadata: dict) -> None:
+        # --- A BufferedReader is sent by storage3/httpx as a streamed multipart part ---
+        # --- upsert: the path is deterministic, so a retried upload may find its object already there ---
+        self._bucket().upload(
+            path=path,
+            file=io.BufferedReader(file),
+            file_options={"content-type": "application/pdf", "upsert": "true", "metadata": metadata}
         )
-        logger.info(f"✅ Upload successful: {file_path}")
+
+    def download(self, path: str) -> bytes:
+        response = self._bucket().download(path)
+        if not isinstance(response, bytes):
+            raise Exception("Download did not return bytes")
+        return response
+
+    def size(self, path: str) -> Optional[int]:
+        """Stored object size in bytes, or None if nothing was uploaded to `path`."""
+        bucket = self._bucket()
+        if not bucket.exists(path):
+            return None
+        info = bucket.info(path)
+        return int(info.get("size") or (info.get("metadata") or {}).get("size") or 0)
+
+    def read_head(self, path: str, length: int) -> bytes:
+        """First `length` bytes of the object, fetched with a ranged GET on a short-lived signed URL."""
+        url = self.create_signed_download_url(path, 60)
+        response = httpx.get(url, headers={"Range": f"bytes=0-{length - 1}"}, timeout=10.0)
+        response.raise_for_status()
+        return response.content[:length]
+
+    def remove(self, path: str) -> None:
+        self._bucket().remove([path])
+
+    def create_signed_upload(self, path: str) -> SignedUpload:
+        signed = self._bucket().create_signed_upload_url(path)
+        return SignedUpload(url=signed["signed_url"], token=signed["token"], expires_in=self.SIGNED_UPLOAD_EXPIRES_SECONDS)
+
+    def create_signed_download_url(self, path: str, expires_in: int) -> str:
+        return self._bucket().create_signed_url(path, expires_in)["signedURL"]
+
+
+class LocalStorage:
+    """
+    Resumes in a local directory, for development and tests.
+
+    Signed URLs point at this service's /resume/storage endpoints and carry an HMAC token
+    bound to the path, the operation and an expiry, mirroring Supabase signed URLs.
+    """
+
+    def __init__(self, root: str, base_url: str, secret: str):
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+        self._key = hmac.new(secret.encode(), b"local-storage", hashlib.sha256).digest()
+
+    def local_path(self, path: str) -> Path:
+        """Filesystem path of an object; rejects paths that escape the storage root."""
+        target = (self.root / path).resolve()
+        if self.root.resolve() not in target.parents:
+            raise ValueError(f"Invalid storage path: {path}")
+        return target
+
+    def upload(self, path: str, file: BinaryIO, metadata: dict) -> None:
+        target = self.local_path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_suffix(f".{uuid.uuid4().hex}.part")
+        with open(partial, "wb") as out:
+            shutil.copyfileobj(file, out)
+        os.replace(partial, target)
+
+    def download(self, path: str) -> bytes:
+        return self.local_path(path).read_bytes()
+
+    def size(self, path: str) -> Optional[int]:
+        target = self.local_path(path)
+        return target.stat().st_size if target.exists() else None
+
+    def read_head(self, path: str, length: int) -> bytes:
+        with open(self.local_path(path), "rb") as f:
+            return f.read(length)
+
+    def remove(self, path: str) -> None:
+        self.local_path(path).unlink(missing_ok=True)
+
+    def sign(self, path: str, operation: str, expires_in: int) -> str:
+        expires_at = int(time.time()) + expires_in
+        signature = hmac.new(self._key, f"{operation}:{path}:{expires_at}".encode(), hashlib.sha256).hexdigest()
+        return f"{expires_at}.{signature}"
+
+    def verify(self, path: str, operation: str, token: str) -> bool:
+        expires_at, _, signature = token.partition(".")
+        if not expires_at.isdigit() or int(expires_at) < time.time():
+            return False
+        expected = hmac.new(self._key, f"{operation}:{path}:{expires_at}".encode(), hashlib.sha256).hexdigest()
+        return hmac.compare_digest(signature, expected)
+
+    def create_signed_upload(self, path: str) -> SignedUpload:
+        expires_in = settings.SIGNED_URL_EXPIRES_SECONDS
+        token = self.sign(path, "upload", expires_in)
+        return SignedUpload(url=f"{self.base_url}/resume/storage/{path}?token={token}", token=token, expires_in=expires_in)
+
+    def create_signed_download_url(self, path: str, expires_in: int) -> str:
+        return f"{self.base_url}/resume/storage/{path}?token={self.sign(path, 'download', expires_in)}"
+
+
+@lru_cache(maxsize=1)
+def get_storage():
+    """Return the configured resume storage backend (STORAGE_BACKEND)."""
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorage(settings.LOCAL_STORAGE_DIR, settings.LOCAL_STORAGE_BASE_URL, settings.SUPABASE_JWT_SECRET)
+    return SupabaseStorage()
+
+
+# --- Every PDF starts with this header (ISO 32000, 7.5.2) ---
+PDF_MAGIC = b"%PDF-"
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds MAX_UPLOAD_BYTES."""
+
+    def __init__(self, limit: int):
+        super().__init__(f"File exceeds the {limit // (1024 * 1024)} MB upload limit")
+        self.limit = limit
+
+
+class InvalidPDFError(ValueError):
+    """Raised when an upload does not start with the PDF header or does not match its declared size or hash."""
+
+
+async def _spool_upload(file) -> Tuple[tempfile.SpooledTemporaryFile, str, int]:
+    """
+    Copy an UploadFile into a spooled temp file chunk by chunk, hashing and validating as it goes.
+
+    Memory held per upload is one chunk plus at most UPLOAD_SPOOL_MAX_BYTES; larger files
+    roll over to disk. Oversized and non-PDF uploads are rejected as soon as that is known.
+
+    Returns:
+        (spool rewound to the start, SHA-256 hex digest, size in bytes)
+
+    Raises:
+        UploadTooLargeError: If the file exceeds MAX_UPLOAD_BYTES.
+        InvalidPDFError: If the file does not start with %PDF-.
+    """
+    limit = settings.MAX_UPLOAD_BYTES
+    if file.size is not None and file.size > limit:
+        raise UploadTooLargeError(limit)
+
+    spool = tempfile.SpooledTemporaryFile(max_size=settings.UPLOAD_SPOOL_MAX_BYTES)
+    digest = hashlib.sha256()
+    head = b""
+    size = 0
+    try:
+        while chunk := await file.read(settings.UPLOAD_CHUNK_BYTES):
+            size += len(chunk)
+            if size > limit:
+                raise UploadTooLargeError(limit)
+            if len(head) < len(PDF_MAGIC):
+                head += chunk[:len(PDF_MAGIC) - len(head)]
+                if not PDF_MAGIC.startswith(head):
+                    raise InvalidPDFError("File is not a PDF.")
+            digest.update(chunk)
+            spool.write(chunk)
+        if head != PDF_MAGIC:
+            raise InvalidPDFError("File is not a PDF.")
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool, digest.hexdigest(), size
+
+
+async def upload_resume(file, user_id: str) -> str:
+    """
+    Stream an uploaded resume to Supabase Storage.
+
+    The file_id is derived from the user and the content hash, so re-uploading the same PDF
+    returns the existing file_id without storing it again.
+
+    Raises:
+        UploadTooLargeError: If the file exceeds MAX_UPLOAD_BYTES.
+        InvalidPDFError: If the file is not a PDF.
+    """
+    spool, sha256, size = await _spool_upload(file)
+    try:
+        file_id = content_file_id(user_id, sha256)
+        record = await asyncio.to_thread(resume_store.get_file, file_id)
+        if record is not None and record["status"] != FileStatus.PENDING.value:
+            metrics.increment("resume_uploads_total", result="duplicate")
+            logger.info(f"♻️ Duplicate upload, reusing {file_id}.pdf (sha256 {sha256[:12]})")
+            return file_id
+
+        file_path = f"{file_id}.pdf"
+        await asyncio.to_thread(get_storage().upload, file_path, spool, {"sha256": sha256})
+        await asyncio.to_thread(resume_store.add_file, file_id, user_id, sha256, size)
+        metrics.increment("resume_uploads_total", result="stored")
+        logger.info(f"✅ Upload successful: {file_path} ({size} bytes, sha256 {sha256[:12]})")
         return file_id
     except Exception as e:
         logger.error(f"❌ Upload failed: {e}")
         raise
+    finally:
+        spool.close()
 
 async def download_resume(file_id: str) -> bytes:
-    """Downloads resume from Supabase Storage as bytes."""
-    supabase = get_supabase_admin_client()
+    """Downloads resume from storage as bytes."""
     file_path = f"{file_id}.pdf"  
     
     try:
         logger.info(f"🔍 Attempting download: {file_path}")
-        response = supabase.storage.from_("resumes").download(file_path)
-        if isinstance(response, bytes):
-            logger.info(f"✅ Download successful: {file_path}")
-            return response
-        else:
-            raise Exception("Download did not return bytes")
+        response = await asyncio.to_thread(get_storage().download, file_path)
+        logger.info(f"✅ Download successful: {file_path}")
+        return response
     except Exception as e:
         logger.error(f"❌ Failed to download resume {file_id}: {str(e)}")
-        raise e
\ No newline at end of file
+        raise e
+
+
+async def discard_resume(file_id: str) -> None:
+    """Delete a resume's stored object and its index record."""
+    await asyncio.to_thread(get_storage().remove, f"{file_id}.pdf")
+    await asyncio.to_thread(resume_store.delete_file, file_id)
+    logger.info(f"🗑️ Discarded {file_id}.pdf")
+
+
+class UploadNotFoundError(Exception):
+    """Raised when a file_id is unknown, belongs to another user, or has no stored object yet."""
+
+
+async def create_upload_url(user_id: str, sha256: str, size: int) -> Tuple[str, Optional[SignedUpload]]:
+    """
+    Issue a signed URL for uploading a resume straight to storage.
+
+    The file_id is derived from the client-computed content hash, so a file this user already
+    uploaded gets its existing file_id and no URL. The hash is only a claim until the service
+    reads the bytes: parse_resume_from_storage discards the upload if it does not match. Claims
+    never leave the user's own ids.
+
+    Returns:
+        (file_id, signed upload or None if the content is already stored)
+
+    Raises:
+        UploadTooLargeError: If the declared size exceeds MAX_UPLOAD_BYTES.
+    """
+    if size > settings.MAX_UPLOAD_BYTES:
+        raise UploadTooLargeError(settings.MAX_UPLOAD_BYTES)
+    file_id = content_file_id(user_id, sha256)
+    record = await asyncio.to_thread(resume_store.get_file, file_id)
+    if record is not None and record["status"] != FileStatus.PENDING.value:
+        metrics.increment("resume_uploads_total", result="duplicate")
+        return file_id, None
+
+    signed = await asyncio.to_thread(get_storage().create_signed_upload, f"{file_id}.pdf")
+    await asyncio.to_thread(resume_store.add_file, file_id, user_id, sha256, size, FileStatus.PENDING)
+    return file_id, signed
+
+
+async def complete_upload(user_id: str, file_id: str) -> None:
+    """
+    Register a resume the client uploaded through a signed URL. Idempotent.
+
+    Only object metadata and the first bytes are read: the stored size is checked against the
+    limit and the declared size, and the object must start with %PDF-. Oversized and non-PDF
+    objects are deleted.
+
+    Raises:
+        UploadNotFoundError: If the file_id is not this user's or nothing was uploaded.
+        UploadTooLargeError: If the stored object exceeds MAX_UPLOAD_BYTES.
+        InvalidPDFError: If the stored size differs from the declared one or the object is not a PDF.
+    """
+    record = await asyncio.to_thread(resume_store.get_file, file_id)
+    if record is None or record["user_id"] != user_id:
+        raise UploadNotFoundError(file_id)
+    if record["status"] != FileStatus.PENDING.value:
+        return
+
+    storage = get_storage()
+    file_path = f"{file_id}.pdf"
+    size = await asyncio.to_thread(storage.size, file_path)
+    if size is None:
+        raise UploadNotFoundError(file_id)
+    if size > settings.MAX_UPLOAD_BYTES:
+        await asyncio.to_thread(storage.remove, file_path)
+        raise UploadTooLargeError(settings.MAX_UPLOAD_BYTES)
+    if size != record["size"]:
+        raise InvalidPDFError(f"Uploaded file has {size} bytes, expected {record['size']}.")
+    head = await asyncio.to_thread(storage.read_head, file_path, len(PDF_MAGIC))
+    if head != PDF_MAGIC:
+        await asyncio.to_thread(storage.remove, file_path)
+        raise InvalidPDFError("File is not a PDF.")
+
+    await asyncio.to_thread(resume_store.set_status, file_id, FileStatus.UNVERIFIED)
+    metrics.increment("resume_uploads_total", result="direct")
+    logger.info(f"✅ Direct upload registered: {file_path} ({size} bytes)")
+
+
+async def create_download_url(user_id: str, file_id: str) -> str:
+    """
+    Signed URL for downloading one of the user's resumes straight from storage.
+
+    Raises:
+        UploadNotFoundError: If the file_id is not this user's stored resume.
+    """
+    record = await asyncio.to_thread(resume_store.get_file, file_id)
+    if record is None or record["user_id"] != user_id or record["status"] == FileStatus.PENDING.value:
+        raise UploadNotFoundError(file_id)
+    return await asyncio.to_thread(
+        get_storage().create_signed_download_url, f"{file_id}.pdf", settings.SIGNED_URL_EXPIRES_SECONDS
+    )
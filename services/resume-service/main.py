@@ -1,10 +1,23 @@
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+import asyncio
 import logging
+import math
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.core.config import settings
-from app.routers import health, resume
+from app.core.limiter import ProviderOverloadedError
+from app.core.metrics import metrics
+from app.routers import health, resume, storage
+from app.services.gemini_service import genai, types
+from app.services.job_service import worker_pool
+from app.services.pdf_parser_service import agentic_doc_parse, pypdf
+from app.services.storage_service import supabase_sdk
 
 # --- Configure logging ---
 logging.basicConfig(
@@ -13,6 +26,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+
+
+def _warm_up_sdks() -> None:
+    """Import the provider SDKs off the request path so the first analysis does not pay for them."""
+    started = time.perf_counter()
+    for module in (genai, types, supabase_sdk, agentic_doc_parse, pypdf):
+        try:
+            module.load()
+        except Exception as e:
+            logger.warning(f"Warm-up import failed; it will be retried on first use: {e}")
+    metrics.set_gauge("startup_warmup_ms", round((time.perf_counter() - started) * 1000, 1))
+
+# --- Startup/Shutdown Events ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    metrics.set_gauge("startup_import_ms", round(_IMPORT_SECONDS * 1000, 1))
+    logger.info(f"Application modules imported in {_IMPORT_SECONDS * 1000:.0f}ms")
+    if settings.WARM_UP_SDKS:
+        asyncio.get_running_loop().run_in_executor(None, _warm_up_sdks)
+    # --- Startup: Launch analysis job workers ---
+    worker_pool.start(settings.ANALYSIS_WORKERS)
+    yield
+    # --- Shutdown: Stop workers; running jobs are reclaimed after their lease expires ---
+    await worker_pool.stop()
+
 #  --- FastAPI app instance ---
 app = FastAPI(
     title="Resume Service API",
@@ -20,6 +59,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # ---- CORS middleware ----
@@ -34,6 +74,17 @@ app.add_middleware(
 # ---  Mount routers ---
 app.include_router(health.router, tags=["Health"])
 app.include_router(resume.router, tags=["Resume"])
+if settings.STORAGE_BACKEND == "local":
+    app.include_router(storage.router, tags=["Local Storage"])
+
+# ---  Upstream overload degrades to a fast 503 instead of a generic 500 ----
+@app.exception_handler(ProviderOverloadedError)
+async def provider_overloaded_handler(request, exc: ProviderOverloadedError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"Upstream provider {exc.provider} is overloaded. Please retry shortly."},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
 
 # ---  Global exception handler for unhandled errors ----
 @app.exception_handler(Exception)
@@ -47,10 +98,14 @@ async def global_exception_handler(request, exc):
 
 if __name__ == "__main__":
     import uvicorn
+    # --- Production: WORKERS=<cores>; development: RELOAD=true (single process) ---
     uvicorn.run(
         "main:app",
-        host="0.0.0.0",
-        port=8002,
-        reload=True, 
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=settings.WORKERS,
+        reload=settings.RELOAD,
+        timeout_keep_alive=settings.KEEP_ALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.GRACEFUL_SHUTDOWN_SECONDS,
         log_level="info",
     )
\ No newline at end of file
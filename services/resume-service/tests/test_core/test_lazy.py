@@ -0,0 +1,17 @@
+import subprocess
+import sys
+
+from app.core.lazy import lazy_import
+
+
+def test_module_is_imported_on_first_attribute_access():
+    module = lazy_import("json")
+    assert not module.loaded
+    assert module.dumps({"a": 1}) == '{"a": 1}'
+    assert module.loaded
+
+
+def test_importing_the_app_defers_heavy_sdks():
+    code = "import sys, main; print(sorted(m for m in ('google.genai', 'supabase', 'agentic_doc.parse') if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip().splitlines()[-1] == "[]"
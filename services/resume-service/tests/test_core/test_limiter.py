@@ -0,0 +1,101 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from app.core.config import settings
+from app.core.limiter import ProviderLimiter, ProviderOverloadedError, _build_limiter, get_latency_tracker
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def make_limiter(**overrides) -> ProviderLimiter:
+    options = dict(
+        provider="test",
+        rate_per_second=1000.0,
+        burst=1000,
+        max_concurrency=2,
+        max_queue=10,
+        queue_timeout=0.5,
+    )
+    options.update(overrides)
+    return ProviderLimiter(**options)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped_and_waiters_are_admitted():
+    limiter = make_limiter(max_concurrency=2)
+    in_flight = 0
+    peak = 0
+
+    async def call():
+        nonlocal in_flight, peak
+        async with limiter.acquire():
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*(call() for _ in range(6)))
+    assert peak == 2
+    assert limiter.concurrency.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_fails_fast():
+    limiter = make_limiter(max_concurrency=1, max_queue=0)
+    async with limiter.acquire():
+        with pytest.raises(ProviderOverloadedError) as exc_info:
+            async with limiter.acquire():
+                pass
+    assert exc_info.value.reason == "concurrency_limited"
+
+
+@pytest.mark.asyncio
+async def test_exhausted_quota_reports_retry_after():
+    limiter = make_limiter(rate_per_second=0.5, burst=1, queue_timeout=0.1)
+    async with limiter.acquire():
+        pass
+    with pytest.raises(ProviderOverloadedError) as exc_info:
+        async with limiter.acquire():
+            pass
+    assert exc_info.value.reason == "rate_limited"
+    assert exc_info.value.retry_after > 1.0
+
+
+@pytest.mark.asyncio
+async def test_upstream_429_halves_concurrency_limit():
+    limiter = make_limiter(max_concurrency=4)
+    with pytest.raises(RateLimitError):
+        async with limiter.acquire():
+            raise RateLimitError()
+    assert int(limiter.concurrency.limit) == 2
+
+
+@pytest.mark.asyncio
+async def test_latency_window_excludes_time_queued_for_a_slot():
+    limiter = make_limiter(max_concurrency=1)
+
+    async def call(seconds):
+        async with limiter.acquire():
+            await asyncio.sleep(seconds)
+
+    holder = asyncio.create_task(call(0.2))
+    await asyncio.sleep(0.01)
+    started = asyncio.get_running_loop().time()
+    await call(0.01)
+    queued_call = asyncio.get_running_loop().time() - started
+    await holder
+
+    samples = sorted(get_latency_tracker("test")._samples)
+    assert queued_call > 0.1
+    assert len(samples) == 2 and samples[0] < 0.1
+
+
+def test_provider_quota_is_split_across_processes():
+    with patch.object(settings, "PROCESS_COUNT", 2):
+        limiter = _build_limiter("gemini")
+    assert limiter.bucket.rate == pytest.approx(settings.GEMINI_REQUESTS_PER_SECOND / 2)
+    assert limiter.bucket.capacity == max(1, settings.GEMINI_BURST // 2)
+    assert limiter.concurrency.max_limit == -(-settings.GEMINI_MAX_CONCURRENCY // 2)
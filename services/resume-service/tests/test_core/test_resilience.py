@@ -0,0 +1,106 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from app.core import resilience
+from app.core.config import settings
+from app.core.limiter import ProviderOverloadedError
+from app.core.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ErrorClass,
+    call_with_resilience,
+    classify_error,
+)
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(settings, "RETRY_BASE_DELAY_SECONDS", 0.001)
+    monkeypatch.setattr(settings, "RETRY_MAX_DELAY_SECONDS", 0.01)
+
+
+def test_classify_error():
+    assert classify_error(httpx.ConnectTimeout("slow")) == ErrorClass.RETRYABLE
+    assert classify_error(StatusError(502)) == ErrorClass.RETRYABLE
+    assert classify_error(StatusError(429)) == ErrorClass.RATE_LIMITED
+    assert classify_error(StatusError(404)) == ErrorClass.FATAL
+    assert classify_error(ProviderOverloadedError("gemini", 1.0)) == ErrorClass.FATAL
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried_and_fatal_ones_are_not():
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 2:
+            raise httpx.ReadTimeout("timed out")
+        return "ok"
+
+    assert await call_with_resilience("test", flaky) == "ok"
+    assert len(calls) == 2
+
+    async def not_found():
+        calls.append(1)
+        raise StatusError(404)
+
+    calls.clear()
+    with pytest.raises(StatusError):
+        await call_with_resilience("test", not_found)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_then_recovers_through_a_probe(monkeypatch):
+    monkeypatch.setattr(settings, "CIRCUIT_FAILURE_THRESHOLD", 2)
+    monkeypatch.setattr(settings, "CIRCUIT_RESET_TIMEOUT_SECONDS", 0.05)
+
+    async def down():
+        raise StatusError(503)
+
+    async def up():
+        return "ok"
+
+    with pytest.raises(StatusError):
+        await call_with_resilience("test", down, max_attempts=2)
+    with pytest.raises(CircuitOpenError):
+        await call_with_resilience("test", up)
+
+    await asyncio.sleep(0.06)
+    assert await call_with_resilience("test", up) == "ok"
+    assert resilience.get_circuit_breaker("test").state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged_and_loser_cancelled(monkeypatch):
+    monkeypatch.setattr(settings, "HEDGE_MIN_SAMPLES", 5)
+    tracker = resilience.get_latency_tracker("test")
+    for _ in range(10):
+        tracker.record(0.01)
+
+    attempts = []
+    cancelled = []
+
+    async def first_slow():
+        attempts.append(1)
+        attempt = len(attempts)
+        try:
+            await asyncio.sleep(0.5 if attempt == 1 else 0.0)
+        except asyncio.CancelledError:
+            cancelled.append(attempt)
+            raise
+        return attempt
+
+    started = time.monotonic()
+    assert await call_with_resilience("test", first_slow, hedge=True) == 2
+    assert time.monotonic() - started < 0.4
+    await asyncio.sleep(0)
+    assert cancelled == [1]
@@ -0,0 +1,120 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.core.config import settings
+from app.models.resume import AnalysisReport, AnalysisStage
+from app.services.analysis_service import (
+    analyze_resume_against_job_urls,
+    stream_analysis_against_job_url,
+    stream_batch_analysis,
+)
+
+REPORT_JSON = """{
+  "match_score": 72.5,
+  "summary": "Solid backend profile for the AI Engineer role.",
+  "keyword_analysis": {"matched_keywords": ["Python"], "missing_keywords": ["Kubernetes"]},
+  "experience_match": [
+    {"job_requirement": "3+ years of Python", "resume_evidence": "4 years at Acme", "is_match": true}
+  ],
+  "suggestions": ["Mention Kubernetes experience"]
+}"""
+
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+
+async def _collect(events):
+    return [event async for event in events]
+
+
+@pytest.mark.asyncio
+async def test_stream_emits_stages_in_order():
+    half = len(REPORT_JSON) // 2
+
+    with patch("app.services.analysis_service.parse_resume_from_storage", new=AsyncMock(return_value="# Jane Doe")), \
+         patch("app.services.analysis_service.scrape_job_posting", new=AsyncMock(return_value="# AI Engineer")), \
+         patch("app.services.analysis_service.stream_automated_analysis",
+               return_value=_chunks(REPORT_JSON[:half], REPORT_JSON[half:])):
+        events = await _collect(stream_analysis_against_job_url("file-1", "https://example.com/job"))
+
+    stages = [event.event for event in events]
+    assert stages == [
+        AnalysisStage.STARTED,
+        AnalysisStage.RESUME_PARSED,
+        AnalysisStage.JOB_SCRAPED,
+        AnalysisStage.ANALYSIS_TOKEN,
+        AnalysisStage.ANALYSIS_TOKEN,
+        AnalysisStage.REPORT,
+    ]
+    assert events[-1].data["match_score"] == 72.5
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_empty_resume_as_error_event():
+    scrape = AsyncMock(return_value="# AI Engineer")
+
+    with patch("app.services.analysis_service.parse_resume_from_storage", new=AsyncMock(return_value="   ")), \
+         patch("app.services.analysis_service.scrape_job_posting", new=scrape):
+        events = await _collect(stream_analysis_against_job_url("file-1", "https://example.com/job"))
+
+    assert [event.event for event in events] == [AnalysisStage.STARTED, AnalysisStage.ERROR]
+    assert events[-1].data["status_code"] == 400
+    scrape.assert_not_called()
+
+
+def _report(score):
+    return AnalysisReport.model_validate_json(REPORT_JSON).model_copy(update={"match_score": score})
+
+
+@pytest.mark.asyncio
+async def test_batch_parses_resume_once_and_ranks_reports():
+    scores = {"https://a.example/job": 40.0, "https://b.example/job": 90.0}
+    parse = AsyncMock(return_value="# Jane Doe")
+
+    async def analyze(parsed_resume_content, scraped_job_content):
+        return _report(scores[scraped_job_content])
+
+    async def scrape(url):
+        if url == "https://broken.example/job":
+            return ""
+        return url
+
+    with patch("app.services.analysis_service.parse_resume_from_storage", new=parse), \
+         patch("app.services.analysis_service.scrape_job_posting", new=scrape), \
+         patch("app.services.analysis_service.generate_automated_analysis", new=analyze):
+        results = await analyze_resume_against_job_urls(
+            "file-1",
+            ["https://broken.example/job", "https://a.example/job", "https://b.example/job", "https://a.example/job"]
+        )
+
+    parse.assert_awaited_once()
+    assert [item.job_url for item in results] == [
+        "https://b.example/job", "https://a.example/job", "https://broken.example/job"
+    ]
+    assert results[-1].status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_batch_respects_analysis_concurrency_limit(monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_ANALYSIS_CONCURRENCY", 2)
+    in_flight = 0
+    peak = 0
+
+    async def analyze(parsed_resume_content, scraped_job_content):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _report(50.0)
+
+    with patch("app.services.analysis_service.parse_resume_from_storage", new=AsyncMock(return_value="# Jane Doe")), \
+         patch("app.services.analysis_service.scrape_job_posting", new=AsyncMock(return_value="# Job")), \
+         patch("app.services.analysis_service.generate_automated_analysis", new=analyze):
+        events = await _collect(stream_batch_analysis("file-1", [f"https://{i}.example/job" for i in range(6)]))
+
+    assert peak == 2
+    assert [event.event for event in events].count(AnalysisStage.JOB_RESULT) == 6
+    assert events[-1].event == AnalysisStage.COMPLETED
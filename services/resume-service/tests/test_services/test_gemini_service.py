@@ -0,0 +1,53 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.core.metrics import metrics
+from app.services.gemini_service import AUTOMATED_ANALYSIS_PROMPT, generate_automated_analysis, stream_automated_analysis
+
+REPORT_JSON = """{"match_score": 80, "summary": "Good fit.",
+ "keyword_analysis": {"matched_keywords": ["Python"], "missing_keywords": []},
+ "experience_match": [], "suggestions": []}"""
+
+USAGE = SimpleNamespace(prompt_token_count=1200, cached_content_token_count=900)
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.aio.models.generate_content = AsyncMock(return_value=SimpleNamespace(text=REPORT_JSON, usage_metadata=USAGE))
+    with patch("app.services.gemini_service._get_genai_client", return_value=client):
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_static_prompt_is_the_system_instruction_and_cached_tokens_are_recorded(client):
+    metrics.reset()
+
+    await generate_automated_analysis("# Jane Doe", "# AI Engineer")
+
+    call = client.aio.models.generate_content.call_args.kwargs
+    assert call["config"].system_instruction == AUTOMATED_ANALYSIS_PROMPT
+    assert call["config"].cached_content is None
+    assert "senior HR professional" not in call["contents"]
+    assert "# Jane Doe" in call["contents"]
+    counters = metrics.snapshot()["counters"]
+    assert counters["gemini_input_tokens_total{kind=cached}"] == 900
+    assert counters["gemini_input_tokens_total{kind=uncached}"] == 300
+
+
+@pytest.mark.asyncio
+async def test_stream_uses_the_same_system_instruction_and_records_usage(client):
+    metrics.reset()
+
+    async def chunks():
+        yield SimpleNamespace(text=REPORT_JSON[:20], usage_metadata=None)
+        yield SimpleNamespace(text=REPORT_JSON[20:], usage_metadata=USAGE)
+
+    client.aio.models.generate_content_stream = AsyncMock(return_value=chunks())
+
+    text = "".join([chunk async for chunk in stream_automated_analysis("# Jane Doe", "# AI Engineer")])
+
+    assert text == REPORT_JSON
+    config = client.aio.models.generate_content_stream.call_args.kwargs["config"]
+    assert config.system_instruction == AUTOMATED_ANALYSIS_PROMPT
+    assert metrics.snapshot()["counters"]["gemini_input_tokens_total{kind=cached}"] == 900
@@ -0,0 +1,194 @@
+import asyncio
+import sqlite3
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi import HTTPException
+from app.models.resume import AnalysisReport, JobStatus
+from app.services import job_service
+from app.services.job_service import AnalysisWorkerPool, JobQueueFullError, JobStore
+
+REPORT = AnalysisReport(
+    match_score=80.0,
+    summary="Good fit.",
+    keyword_analysis={"matched_keywords": ["Python"], "missing_keywords": []},
+    experience_match=[],
+    suggestions=[],
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.sqlite3"))
+
+
+def test_claim_marks_job_running_once(store):
+    created = store.create("user-1", "file-1", "https://example.com/job")
+
+    claimed = store.claim_next(lease_seconds=60, max_attempts=2)
+
+    assert claimed["job_id"] == created["job_id"]
+    assert claimed["status"] == JobStatus.RUNNING.value
+    assert claimed["attempts"] == 1
+    assert store.claim_next(lease_seconds=60, max_attempts=2) is None
+
+
+def test_expired_lease_is_reclaimed_then_failed(store):
+    store.create("user-1", "file-1", "https://example.com/job")
+    store.claim_next(lease_seconds=-1, max_attempts=2)
+
+    reclaimed = store.claim_next(lease_seconds=-1, max_attempts=2)
+    assert reclaimed["attempts"] == 2
+
+    assert store.claim_next(lease_seconds=60, max_attempts=2) is None
+    assert store.get(reclaimed["job_id"])["status"] == JobStatus.FAILED.value
+
+
+def test_reclaimed_job_ignores_the_previous_lease_holder(store):
+    store.create("user-1", "file-1", "https://example.com/job")
+    stale = store.claim_next(lease_seconds=-1, max_attempts=3)
+    current = store.claim_next(lease_seconds=60, max_attempts=3)
+
+    assert current["lease_token"] != stale["lease_token"]
+    assert not store.renew(stale["job_id"], stale["lease_token"], 60)
+    assert not store.complete(stale["job_id"], stale["lease_token"], REPORT)
+    assert not store.fail(stale["job_id"], stale["lease_token"], "late failure")
+    assert store.get(current["job_id"])["status"] == JobStatus.RUNNING.value
+
+    assert store.complete(current["job_id"], current["lease_token"], REPORT)
+    assert store.get(current["job_id"])["status"] == JobStatus.SUCCEEDED.value
+
+
+def test_existing_job_file_gains_the_lease_token_column(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE analysis_jobs (job_id TEXT PRIMARY KEY, user_id TEXT NOT NULL, file_id TEXT NOT NULL, "
+        "job_url TEXT NOT NULL, status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, "
+        "lease_expires_at REAL, result TEXT, error TEXT, created_at TEXT NOT NULL, updated_at TEXT NOT NULL)"
+    )
+    conn.close()
+    store = JobStore(path)
+    store.create("user-1", "file-1", "https://example.com/job")
+
+    assert store.claim_next(lease_seconds=60, max_attempts=2)["lease_token"]
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_keeps_a_long_job_from_being_reclaimed(store, monkeypatch):
+    monkeypatch.setattr(job_service.settings, "JOB_LEASE_SECONDS", 0.15)
+    pool = AnalysisWorkerPool(store)
+    job_id = store.create("user-1", "file-1", "https://example.com/job")["job_id"]
+    job = store.claim_next(lease_seconds=0.15, max_attempts=2)
+    reclaimed = []
+
+    async def slow_analysis(**kwargs):
+        for _ in range(5):
+            await asyncio.sleep(0.1)
+            reclaimed.append(store.claim_next(lease_seconds=0.15, max_attempts=2))
+        return REPORT
+
+    with patch("app.services.job_service.analyze_resume_against_job_url", new=slow_analysis):
+        await pool._run_job(0, job)
+
+    assert reclaimed == [None] * 5
+    row = store.get(job_id)
+    assert row["status"] == JobStatus.SUCCEEDED.value
+    assert row["attempts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_completes_job(store):
+    pool = AnalysisWorkerPool(store)
+    job_id = store.create("user-1", "file-1", "https://example.com/job")["job_id"]
+    job = store.claim_next(lease_seconds=60, max_attempts=2)
+
+    with patch("app.services.job_service.analyze_resume_against_job_url", new=AsyncMock(return_value=REPORT)):
+        await pool._run_job(0, job)
+
+    row = store.get(job_id)
+    assert row["status"] == JobStatus.SUCCEEDED.value
+    assert job_service.job_to_response(row).result.match_score == 80.0
+
+
+@pytest.mark.asyncio
+async def test_worker_does_not_retry_client_errors(store):
+    pool = AnalysisWorkerPool(store)
+    job_id = store.create("user-1", "file-1", "https://example.com/job")["job_id"]
+    job = store.claim_next(lease_seconds=60, max_attempts=2)
+    error = HTTPException(status_code=400, detail="Failed to extract content from job posting URL.")
+
+    with patch("app.services.job_service.analyze_resume_against_job_url", new=AsyncMock(side_effect=error)):
+        await pool._run_job(0, job)
+
+    row = store.get(job_id)
+    assert row["status"] == JobStatus.FAILED.value
+    assert row["error"] == error.detail
+
+
+@pytest.mark.asyncio
+async def test_worker_survives_a_store_error_and_runs_later_jobs(store, monkeypatch):
+    monkeypatch.setattr(job_service.settings, "JOB_POLL_INTERVAL_SECONDS", 0.01)
+    claim_next = store.claim_next
+    calls = []
+
+    def flaky_claim(*args):
+        calls.append(1)
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return claim_next(*args)
+
+    monkeypatch.setattr(store, "claim_next", flaky_claim)
+    job_id = store.create("user-1", "file-1", "https://example.com/job")["job_id"]
+    pool = AnalysisWorkerPool(store)
+
+    with patch("app.services.job_service.analyze_resume_against_job_url", new=AsyncMock(return_value=REPORT)):
+        pool.start(1)
+        try:
+            for _ in range(100):
+                if store.get(job_id)["status"] == JobStatus.SUCCEEDED.value:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await pool.stop()
+
+    assert store.get(job_id)["status"] == JobStatus.SUCCEEDED.value
+    assert len(calls) >= 2
+
+
+@pytest.mark.asyncio
+async def test_unrecorded_report_is_left_to_lease_expiry_not_failed(store, monkeypatch):
+    pool = AnalysisWorkerPool(store)
+    job_id = store.create("user-1", "file-1", "https://example.com/job")["job_id"]
+    job = store.claim_next(lease_seconds=60, max_attempts=2)
+
+    def locked(*args):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(store, "complete", locked)
+    with patch("app.services.job_service.analyze_resume_against_job_url", new=AsyncMock(return_value=REPORT)):
+        await pool._run_job(0, job)
+
+    row = store.get(job_id)
+    assert row["status"] == JobStatus.RUNNING.value
+    assert row["lease_token"] == job["lease_token"]
+
+
+@pytest.mark.asyncio
+async def test_submit_rejects_when_queue_is_full(store, monkeypatch):
+    monkeypatch.setattr(job_service, "job_store", store)
+    monkeypatch.setattr(job_service.settings, "JOB_QUEUE_MAX_PENDING", 1)
+    await job_service.submit_analysis_job("user-1", "file-1", "https://example.com/job")
+
+    with pytest.raises(JobQueueFullError) as exc_info:
+        await job_service.submit_analysis_job("user-1", "file-2", "https://example.com/job")
+
+    assert exc_info.value.retry_after > 0
+
+
+@pytest.mark.asyncio
+async def test_get_job_hides_other_users_jobs(store, monkeypatch):
+    monkeypatch.setattr(job_service, "job_store", store)
+    job_id = store.create("user-1", "file-1", "https://example.com/job")["job_id"]
+
+    assert (await job_service.get_analysis_job(job_id, "user-1")).status == JobStatus.QUEUED
+    assert await job_service.get_analysis_job(job_id, "user-2") is None
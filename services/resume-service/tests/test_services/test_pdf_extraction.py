@@ -0,0 +1,100 @@
+import os
+import pytest
+from unittest.mock import MagicMock, patch
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.pdf_parser_service import _parse_tiered, extract_text_locally
+
+RESUME_LINES = [
+    "Jane Doe - Senior Backend Engineer",
+    "Experience",
+    "Acme Corp, Staff Engineer, 2019-2024: built Python services handling payments at scale.",
+    "Globex, Backend Engineer, 2015-2019: designed PostgreSQL schemas and REST APIs for logistics.",
+    "Education",
+    "MSc Computer Science, Technical University of Munich, 2013-2015, thesis on distributed systems.",
+    "Skills",
+    "Python, Go, PostgreSQL, Kafka, Kubernetes, AWS, Terraform, system design, mentoring.",
+]
+
+
+def make_pdf(lines=(), image: bool = False) -> bytes:
+    """Single-page PDF with a Helvetica text layer and optionally a 1x1 image."""
+    content = "BT /F1 10 Tf 40 800 Td 14 TL " + " ".join(f"({line}) '" for line in lines) + " ET"
+    if image:
+        content += " q 100 0 0 100 40 40 cm /Im1 Do Q"
+    xobject = "/XObject << /Im1 6 0 R >>" if image else ""
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Contents 4 0 R "
+        f"/Resources << /Font << /F1 5 0 R >> {xobject} >> >>",
+        f"<< /Length {len(content)} >>\nstream\n{content}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        "<< /Type /XObject /Subtype /Image /Width 1 /Height 1 /ColorSpace /DeviceGray "
+        "/BitsPerComponent 8 /Length 1 >>\nstream\n\x00\nendstream",
+    ]
+    pdf, offsets = "%PDF-1.4\n", []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n{body}\nendobj\n"
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    pdf += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return pdf.encode("latin-1")
+
+
+@pytest.fixture
+def landing_ai():
+    with patch("app.services.pdf_parser_service.agentic_doc_parse") as module:
+        module.parse.return_value = [MagicMock(markdown="# From Landing AI")]
+        yield module.parse
+
+
+def test_text_layer_resume_is_extracted_with_markdown_sections():
+    extraction = extract_text_locally(make_pdf(RESUME_LINES))
+
+    assert extraction.escalation_reason() is None
+    assert extraction.sections == 3
+    assert "## Experience" in extraction.text
+    assert "Technical University of Munich" in extraction.text
+
+
+@pytest.mark.parametrize("pdf, reason", [
+    (make_pdf(image=True), "scanned"),
+    (make_pdf(["Jane Doe", "Experience", "Education"]), "low_density"),
+    (make_pdf([line for line in RESUME_LINES if line not in ("Experience", "Education", "Skills")]), "no_structure"),
+])
+def test_poor_extractions_escalate(pdf, reason):
+    assert extract_text_locally(pdf).escalation_reason() == reason
+
+
+@pytest.mark.asyncio
+async def test_tiered_parse_uses_landing_ai_only_when_needed(landing_ai):
+    metrics.reset()
+
+    local = await _parse_tiered(make_pdf(RESUME_LINES))
+    scanned = await _parse_tiered(make_pdf(image=True))
+    broken = await _parse_tiered(b"%PDF-1.4 truncated")
+
+    assert local.startswith("Jane Doe")
+    assert scanned == broken == "# From Landing AI"
+    assert landing_ai.call_count == 2
+    counters = metrics.snapshot()["counters"]
+    assert counters["resume_parse_total{reason=ok,tier=local}"] == 1
+    assert counters["resume_parse_total{reason=scanned,tier=landing_ai}"] == 1
+    assert counters["resume_parse_total{reason=error,tier=landing_ai}"] == 1
+
+
+
+@pytest.mark.asyncio
+async def test_landing_ai_key_is_passed_per_call_not_through_the_environment(monkeypatch):
+    monkeypatch.delenv("VISION_AGENT_API_KEY", raising=False)
+
+    with patch("app.services.pdf_parser_service.agentic_doc_parse") as module:
+        module.parse.return_value = [MagicMock(markdown="# From Landing AI")]
+        await _parse_tiered(make_pdf(image=True))
+
+    module.ParseConfig.assert_called_once_with(api_key=settings.LANDING_AI_API_KEY)
+    assert module.parse.call_args.kwargs["config"] is module.ParseConfig.return_value
+    assert "VISION_AGENT_API_KEY" not in os.environ
@@ -0,0 +1,74 @@
+import json
+from pathlib import Path
+import pytest
+from app.core.metrics import metrics
+from app.services.gemini_service import build_analysis_prompt
+from app.services.prompt_compaction import (
+    JOB_SECTION_PRIORITIES,
+    RESUME_SECTION_PRIORITIES,
+    compact_document,
+    estimate_tokens,
+    strip_boilerplate
+)
+
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "prompt_compaction"
+EXPECTATIONS = json.loads((FIXTURES / "expectations.json").read_text())
+
+
+@pytest.mark.parametrize("case", sorted(EXPECTATIONS))
+def test_fixture_corpus_keeps_job_signal_and_drops_noise(case):
+    """Quality regression check: requirements survive compaction, page chrome does not."""
+    expected = EXPECTATIONS[case]
+    original = (FIXTURES / case.split("@")[0]).read_text()
+    if expected.get("resume"):
+        compacted = compact_document(original, expected["budget"], RESUME_SECTION_PRIORITIES)
+    else:
+        compacted = compact_document(original, expected["budget"], JOB_SECTION_PRIORITIES, scraped=True)
+
+    assert [phrase for phrase in expected["keep"] if phrase not in compacted] == []
+    assert [phrase for phrase in expected["drop"] if phrase in compacted] == []
+    assert estimate_tokens(compacted) <= min(expected["budget"], expected["max_ratio"] * estimate_tokens(original))
+
+
+def test_links_keep_their_text_and_navigation_lines_are_dropped():
+    markdown = "[Home](https://x.test) | [Jobs](https://x.test/jobs)\n\nWork at [Acme](https://acme.test) in Paris"
+
+    assert strip_boilerplate(markdown) == "Work at Acme in Paris"
+
+
+def test_repeated_sections_are_sent_once():
+    markdown = "## Requirements\n\n- Python\n- SQL\n\n## Requirements\n\n- Python\n- SQL"
+
+    assert compact_document(markdown, 1000, JOB_SECTION_PRIORITIES) == "## Requirements\n\n- Python\n- SQL"
+
+
+def test_lines_shared_by_different_roles_are_kept():
+    markdown = (
+        "## Experience\n\n### ML Engineer, Acme\n\n- Python\n- Built forecasting models\n\n"
+        "### Data Engineer, Globex\n\n- Python\n- Built Airflow pipelines\n- Python"
+    )
+
+    compacted = compact_document(markdown, 1000, RESUME_SECTION_PRIORITIES)
+
+    assert compacted.count("- Python") == 2
+    assert compacted.endswith("### Data Engineer, Globex\n\n- Python\n- Built Airflow pipelines")
+
+
+def test_over_budget_drops_low_priority_sections_first():
+    markdown = "## Benefits\n\n" + "".join(f"- Perk number {i}\n" for i in range(5)) + "\n## Requirements\n\n- 5 years of Rust\n- Tokio"
+
+    compacted = compact_document(markdown, 20, JOB_SECTION_PRIORITIES)
+
+    assert compacted == "## Requirements\n\n- 5 years of Rust\n- Tokio"
+
+
+def test_prompt_is_built_from_compacted_inputs():
+    metrics.reset()
+    job = (FIXTURES / "linkedin_job.md").read_text()
+    resume = (FIXTURES / "resume.md").read_text()
+
+    prompt = build_analysis_prompt(resume, job)
+
+    assert "Similar jobs" not in prompt and "Strong Python and PyTorch skills" in prompt
+    timings = metrics.snapshot()["timings"]
+    assert timings["analysis_input_tokens{stage=compacted}"]["sum"] < timings["analysis_input_tokens{stage=raw}"]["sum"]
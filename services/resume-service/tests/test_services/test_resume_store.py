@@ -0,0 +1,98 @@
+import hashlib
+import pytest
+from uuid import UUID
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.services.pdf_parser_service import parse_resume_from_storage
+from app.services.resume_store import FileStatus, ResumeStore, content_file_id
+from app.services.storage_service import InvalidPDFError
+
+PDF = b"%PDF-1.4\nJane Doe"
+SHA256 = hashlib.sha256(PDF).hexdigest()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResumeStore(str(tmp_path / "resumes.sqlite3"))
+    with patch("app.services.pdf_parser_service.resume_store", store):
+        yield store
+
+
+@pytest.fixture
+def landing_ai():
+    parsed = MagicMock(markdown="# Jane Doe\n")
+    with patch("app.services.pdf_parser_service.agentic_doc_parse") as module:
+        module.parse.return_value = [parsed]
+        yield module.parse
+
+
+def test_content_file_id_is_stable_per_user():
+    assert content_file_id("user-1", SHA256) == content_file_id("user-1", SHA256)
+    assert content_file_id("user-1", SHA256) != content_file_id("user-2", SHA256)
+
+
+def test_content_file_id_cannot_be_computed_without_the_server_secret():
+    file_id = content_file_id("user-1", SHA256)
+
+    with patch("app.services.resume_store._FILE_ID_KEY", b"another deployment"):
+        assert content_file_id("user-1", SHA256) != file_id
+    assert UUID(file_id).version == 4
+
+
+@pytest.mark.asyncio
+async def test_known_file_is_parsed_once(store, landing_ai):
+    store.add_file("file-1", "user-1", SHA256, len(PDF))
+    store.add_file("file-2", "user-2", SHA256, len(PDF))
+
+    with patch("app.services.pdf_parser_service.download_resume", new=AsyncMock(return_value=PDF)) as download:
+        first = await parse_resume_from_storage("file-1")
+        second = await parse_resume_from_storage("file-2")
+
+    assert first == second == "# Jane Doe"
+    assert landing_ai.call_count == 1
+    assert download.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_unindexed_file_reuses_parse_after_download(store, landing_ai):
+    store.put_parsed(SHA256, "# Cached")
+
+    with patch("app.services.pdf_parser_service.download_resume", new=AsyncMock(return_value=PDF)):
+        content = await parse_resume_from_storage("legacy-uuid4-file")
+
+    assert content == "# Cached"
+    landing_ai.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_empty_parse_is_not_cached(store, landing_ai):
+    landing_ai.return_value = []
+
+    with patch("app.services.pdf_parser_service.download_resume", new=AsyncMock(return_value=PDF)):
+        assert await parse_resume_from_storage("file-1") == ""
+
+    assert store.get_parsed(SHA256) is None
+
+
+@pytest.mark.asyncio
+async def test_claimed_hash_of_a_direct_upload_is_verified(store, landing_ai):
+    store.add_file("file-1", "user-1", SHA256, len(PDF), FileStatus.UNVERIFIED)
+
+    with patch("app.services.pdf_parser_service.download_resume", new=AsyncMock(return_value=PDF)):
+        content = await parse_resume_from_storage("file-1")
+
+    assert content == "# Jane Doe"
+    assert store.get_file("file-1")["status"] == FileStatus.STORED.value
+
+
+@pytest.mark.asyncio
+async def test_direct_upload_not_matching_its_claimed_hash_is_discarded(store, landing_ai):
+    store.put_parsed("f" * 64, "# Someone else")
+    store.add_file("file-1", "user-1", "f" * 64, len(PDF), FileStatus.UNVERIFIED)
+
+    with patch("app.services.pdf_parser_service.download_resume", new=AsyncMock(return_value=PDF)), \
+         patch("app.services.pdf_parser_service.discard_resume", new=AsyncMock()) as discard:
+        with pytest.raises(InvalidPDFError):
+            await parse_resume_from_storage("file-1")
+
+    discard.assert_awaited_once_with("file-1")
+    landing_ai.assert_not_called()
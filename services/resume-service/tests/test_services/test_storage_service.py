@@ -1,10 +1,179 @@
+import hashlib
 import pytest
 from fastapi import UploadFile
 from io import BytesIO
-from app.services.storage_service import upload_resume
-from unittest.mock import patch
+from app.core.config import settings
+from app.services.resume_store import FileStatus, ResumeStore
+from app.services.storage_service import (
+    InvalidPDFError,
+    LocalStorage,
+    UploadNotFoundError,
+    UploadTooLargeError,
+    complete_upload,
+    create_download_url,
+    create_upload_url,
+    upload_resume
+)
+from unittest.mock import MagicMock, patch
 
 
+class ChunkedUpload:
+    """UploadFile stand-in that serves its body in small reads and records them."""
+
+    def __init__(self, content: bytes, size=None, read_size: int = 3):
+        self.body = BytesIO(content)
+        self.size = size
+        self.read_size = read_size
+        self.reads = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        self.reads += 1
+        return self.body.read(min(size, self.read_size))
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResumeStore(str(tmp_path / "resumes.sqlite3"))
+    with patch("app.services.storage_service.resume_store", store):
+        yield store
+
+
+@pytest.fixture
+def bucket(store):
+    bucket = MagicMock()
+    bucket.upload.side_effect = lambda path, file, file_options: bucket.uploaded.append(file.read())
+    bucket.uploaded = []
+    client = MagicMock()
+    client.storage.from_.return_value = bucket
+    with patch("app.services.storage_service.get_supabase_admin_client", return_value=client):
+        yield bucket
+
+
+@pytest.mark.asyncio
+async def test_upload_streams_pdf_with_its_hash(bucket, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_SPOOL_MAX_BYTES", 8)
+    pdf = b"%PDF-1.4\n" + b"x" * 100
+
+    file_id = await upload_resume(ChunkedUpload(pdf), "user-1")
+
+    assert len(file_id) == 36
+    assert bucket.uploaded == [pdf]
+    options = bucket.upload.call_args.kwargs["file_options"]
+    assert options["metadata"]["sha256"] == hashlib.sha256(pdf).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_reupload_of_identical_pdf_returns_the_existing_file_id(bucket, store):
+    pdf = b"%PDF-1.4\nresume"
+
+    first = await upload_resume(ChunkedUpload(pdf), "user-1")
+    again = await upload_resume(ChunkedUpload(pdf), "user-1")
+    other_user = await upload_resume(ChunkedUpload(pdf), "user-2")
+    edited = await upload_resume(ChunkedUpload(pdf + b" v2"), "user-1")
+
+    assert again == first
+    assert len({first, other_user, edited}) == 3
+    assert bucket.upload.call_count == 3
+    assert store.get_file(first)["sha256"] == store.get_file(other_user)["sha256"]
+
+
+@pytest.mark.asyncio
+async def test_non_pdf_is_rejected_at_the_first_bytes(bucket):
+    upload = ChunkedUpload(b"PK\x03\x04" + b"x" * 100)
+
+    with pytest.raises(InvalidPDFError):
+        await upload_resume(upload, "user-1")
+
+    assert upload.reads == 1
+    bucket.upload.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_oversized_upload_stops_reading_at_the_limit(bucket, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES", 10)
+    upload = ChunkedUpload(b"%PDF-" + b"x" * 100)
+
+    with pytest.raises(UploadTooLargeError):
+        await upload_resume(upload, "user-1")
+
+    assert upload.reads == 4
+    bucket.upload.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_declared_size_over_the_limit_is_rejected_without_reading(bucket, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES", 10)
+    upload = ChunkedUpload(b"%PDF-", size=11)
+
+    with pytest.raises(UploadTooLargeError):
+        await upload_resume(upload, "user-1")
+
+    assert upload.reads == 0
+
+
+@pytest.fixture
+def local_storage(tmp_path, store):
+    storage = LocalStorage(str(tmp_path / "objects"), "http://resume.test", "secret")
+    with patch("app.services.storage_service.get_storage", return_value=storage):
+        yield storage
+
+
+@pytest.mark.asyncio
+async def test_direct_upload_registers_only_metadata(local_storage, store):
+    pdf = b"%PDF-1.4\nresume"
+    sha256 = hashlib.sha256(pdf).hexdigest()
+
+    file_id, signed = await create_upload_url("user-1", sha256, len(pdf))
+    path = f"{file_id}.pdf"
+    assert signed.url == f"http://resume.test/resume/storage/{path}?token={signed.token}"
+    assert local_storage.verify(path, "upload", signed.token)
+
+    local_storage.upload(path, BytesIO(pdf), {})
+    await complete_upload("user-1", file_id)
+    await complete_upload("user-1", file_id)
+
+    assert store.get_file(file_id)["status"] == FileStatus.UNVERIFIED.value
+    assert await create_upload_url("user-1", sha256, len(pdf)) == (file_id, None)
+    token = (await create_download_url("user-1", file_id)).split("token=")[1]
+    assert local_storage.verify(path, "download", token)
+
+
+@pytest.mark.asyncio
+async def test_direct_upload_completion_is_checked(local_storage, store):
+    file_id, _ = await create_upload_url("user-1", "a" * 64, 20)
+
+    with pytest.raises(UploadNotFoundError):
+        await complete_upload("user-1", file_id)
+    with pytest.raises(UploadNotFoundError):
+        await complete_upload("user-2", file_id)
+    with pytest.raises(UploadNotFoundError):
+        await create_download_url("user-1", file_id)
+
+    local_storage.upload(f"{file_id}.pdf", BytesIO(b"%PDF-short"), {})
+    with pytest.raises(InvalidPDFError):
+        await complete_upload("user-1", file_id)
+
+    local_storage.upload(f"{file_id}.pdf", BytesIO(b"PK\x03\x04 not a resume!!!"), {})
+    with pytest.raises(InvalidPDFError):
+        await complete_upload("user-1", file_id)
+    assert local_storage.size(f"{file_id}.pdf") is None
+    assert store.get_file(file_id)["status"] == FileStatus.PENDING.value
+    with pytest.raises(UploadTooLargeError):
+        await create_upload_url("user-1", "b" * 64, settings.MAX_UPLOAD_BYTES + 1)
+
+
+def test_local_signed_tokens_are_bound_to_path_operation_and_expiry(tmp_path):
+    storage = LocalStorage(str(tmp_path), "http://resume.test", "secret")
+    token = storage.sign("a.pdf", "upload", 60)
+
+    assert storage.verify("a.pdf", "upload", token)
+    assert not storage.verify("b.pdf", "upload", token)
+    assert not storage.verify("a.pdf", "download", token)
+    assert not storage.verify("a.pdf", "upload", storage.sign("a.pdf", "upload", -1))
+    assert not LocalStorage(str(tmp_path), "http://resume.test", "other").verify("a.pdf", "upload", token)
+    with pytest.raises(ValueError):
+        storage.local_path("../escape.pdf")
+
 
 @pytest.mark.skip(reason="Requires real Supabase access")
 async def test_upload_resume_integration():
@@ -17,4 +186,4 @@ async def test_upload_resume_integration():
     )
     user_id = "test-user-123"
     file_id = await upload_resume(upload_file, user_id)
-    assert len(file_id) == 36 
\ No newline at end of file
+    assert len(file_id) == 36
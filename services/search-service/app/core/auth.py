@@ -2,24 +2,38 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
 from app.core.config import settings
+from app.core.token_cache import VerifiedTokenCache
 
 security = HTTPBearer()
 
+# --- Per-worker cache of verified tokens; a session reuses one token across many requests ---
+token_cache = VerifiedTokenCache(
+    max_entries=settings.auth_cache_max_entries,
+    max_ttl=settings.auth_cache_max_ttl_seconds
+)
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> str:
-    """Simple HS256 JWT validation for Supabase tokens."""
+    """HS256 JWT validation for Supabase tokens, verified once per token and then served from cache."""
+    token = credentials.credentials
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
+
     try:
         payload = jwt.decode(
-            credentials.credentials,
+            token,
             settings.supabase_jwt_secret,
             algorithms=["HS256"],
             audience="authenticated"
         )
-        return payload["sub"]  # user_id
-        
     except JWTError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Invalid token: {str(e)}"
         )
+
+    user_id = payload["sub"]  # user_id
+    token_cache.put(token, user_id, payload.get("exp"))
+    return user_id
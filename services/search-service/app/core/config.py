@@ -2,6 +2,7 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 from typing import Optional
 from pathlib import Path
+import tempfile
 
 class Settings(BaseSettings):
     # --- External API Keys ---
@@ -14,7 +15,90 @@ class Settings(BaseSettings):
     # --- Supabase Auth ---
     supabase_url: str = Field(..., description="Supabase project URL")
     supabase_jwt_secret: str = Field(..., description="Supabase JWT secret for token validation")
+    auth_cache_max_entries: int = Field(default=10000, ge=0, description="Verified tokens kept in the per-worker LRU (0 disables caching)")
+    auth_cache_max_ttl_seconds: float = Field(default=300.0, gt=0, description="Upper bound on how long a verified token is trusted without re-verification")
     
+    # --- Upstream Rate Limits (match provider quotas) ---
+    exa_requests_per_second: float = Field(default=5.0, gt=0, description="Sustained Exa request rate")
+    exa_burst: int = Field(default=10, ge=1, description="Exa requests allowed in a burst")
+    exa_max_concurrency: int = Field(default=10, ge=1, description="Upper bound for concurrent Exa calls")
+    gemini_requests_per_second: float = Field(default=10.0, gt=0, description="Sustained Gemini request rate")
+    gemini_burst: int = Field(default=20, ge=1, description="Gemini requests allowed in a burst")
+    gemini_max_concurrency: int = Field(default=20, ge=1, description="Upper bound for concurrent Gemini calls")
+    limiter_queue_timeout_seconds: float = Field(default=5.0, ge=0, description="Max time a call waits for admission before 503")
+    limiter_max_queue: int = Field(default=100, ge=0, description="Max calls waiting per provider before fast 503s")
+    limiter_latency_tolerance: float = Field(default=2.0, gt=1, description="Latency over this multiple of the best observed latency shrinks the concurrency limit")
+
+    # --- Upstream Resilience ---
+    retry_max_attempts: int = Field(default=3, ge=1, description="Attempts per upstream call, including the first")
+    retry_base_delay_seconds: float = Field(default=0.2, ge=0, description="Base delay for full-jitter exponential backoff")
+    retry_max_delay_seconds: float = Field(default=2.0, ge=0, description="Cap on a single backoff delay")
+    hedge_enabled: bool = Field(default=True, description="Send a hedged second request for slow idempotent calls")
+    hedge_percentile: float = Field(default=0.95, gt=0, le=1, description="Latency percentile after which a hedge is sent")
+    hedge_min_samples: int = Field(default=20, ge=1, description="Latency samples required before hedging starts")
+    circuit_failure_threshold: int = Field(default=5, ge=1, description="Consecutive transient failures that open a provider circuit")
+    circuit_reset_timeout_seconds: float = Field(default=30.0, gt=0, description="Time an open circuit waits before a probe call")
+
+    # --- Search Latency Budget ---
+    search_latency_budget_ms: int = Field(default=3000, ge=100, description="Default end-to-end budget for a search request")
+    enhancement_budget_fraction: float = Field(default=0.3, gt=0, lt=1, description="Share of the budget Gemini enhancement may use before it is skipped")
+
+    # --- Result Continuation ("load more") ---
+    continuation_window_size: int = Field(default=50, ge=0, le=100, description="Exa results fetched per new search; results beyond the requested page are stored for follow-up pages (0 disables; Exa bills contents per result)")
+    continuation_ttl_seconds: int = Field(default=1800, ge=60, description="How long a stored result window can be paged through")
+    continuation_save_timeout_ms: int = Field(default=500, ge=0, description="Max time a search waits to store its window before responding without next_cursor")
+
+    # --- Profile Entity Cache ---
+    profile_cache_enabled: bool = Field(default=True, description="Reuse parsed profiles across searches, keyed by canonical profile URL")
+    profile_cache_ttl_seconds: int = Field(default=259200, ge=300, description="How long a cached profile is reused before Exa contents are fetched again")
+    profile_cache_ids_first_ratio: float = Field(default=0.6, gt=0, le=1, description="Rolling cache hit ratio above which searches list ids first and fetch contents only for uncached profiles")
+    profile_cache_retry_after_seconds: float = Field(default=30.0, ge=0, description="After a MongoDB error the profile cache is bypassed for this long")
+
+    # --- Local Profile Index ("local_first" searches) ---
+    profile_index_enabled: bool = Field(default=True, description="Maintain a local vector + inverted index over cached profiles for local_first searches")
+    profile_index_dir: str = Field(default=str(Path(tempfile.gettempdir()) / "networkai-profile-index"), description="Snapshot directory; workers on one host memory-map the same files")
+    profile_index_refresh_seconds: float = Field(default=60.0, ge=1, description="How often new cached profiles are folded into the index (one worker builds, all reload)")
+    profile_index_dim: int = Field(default=512, ge=64, le=8192, description="Hashed embedding dimensions")
+    profile_index_max_profiles: int = Field(default=50000, ge=1, description="Most recently updated profiles kept in the index")
+    profile_index_min_coverage: float = Field(default=1.0, gt=0, le=1, description="Share of query terms a profile must contain to be a local match")
+
+    # --- Semantic Query Cache (per worker) ---
+    query_cache_enabled: bool = Field(default=True, description="Serve near-duplicate queries (paraphrases, near-identical enhanced queries) from recent results")
+    query_cache_threshold: float = Field(default=0.9, gt=0, le=1, description="Cosine similarity at which a cached query counts as the same query; queries that differ in anything but soft descriptors never match")
+    query_cache_ttl_seconds: int = Field(default=600, ge=1, description="How long cached results are reused")
+    query_cache_capacity: int = Field(default=256, ge=1, description="Cached queries per category (oldest replaced first)")
+    query_cache_dim: int = Field(default=512, ge=64, le=8192, description="Hashed query embedding dimensions")
+    query_cache_audit_rate: float = Field(default=0.02, ge=0, le=1, description="Share of cache hits re-run against Exa in the background to measure false hits (costs Exa calls)")
+    query_cache_audit_min_overlap: float = Field(default=0.5, ge=0, le=1, description="Audited hits sharing fewer of the fresh results than this are false hits and are evicted")
+
+    # --- Cache Pre-warming (popular historical queries) ---
+    prewarm_enabled: bool = Field(default=True, description="Periodically refresh results for the most popular recent queries into the query cache")
+    prewarm_top_queries: int = Field(default=25, ge=1, le=200, description="Popular queries considered per run")
+    prewarm_window_days: int = Field(default=7, ge=1, description="History window popularity is measured over")
+    prewarm_min_users: int = Field(default=2, ge=1, description="Only queries searched by at least this many users are warmed")
+    prewarm_interval_seconds: int = Field(default=3600, ge=60, description="How often popular queries are refreshed (one process per interval does the work); warmed results are served for at most query_cache_ttl_seconds after each refresh")
+    prewarm_startup_delay_seconds: float = Field(default=30.0, ge=0, description="Wait after boot before the first run so it does not compete with startup")
+    prewarm_max_searches: int = Field(default=25, ge=0, description="Enhance + Exa searches one run may spend")
+    prewarm_search_spacing_ms: int = Field(default=1000, ge=0, description="Pause between warm-up searches so they never crowd out user traffic")
+    prewarm_limit: int = Field(default=10, ge=1, le=50, description="Page size warmed results are stored for (the UI default)")
+
+    # --- Response Caching ---
+    history_cache_max_age_seconds: int = Field(default=5, ge=0, description="Cache-Control max-age for GET /search/history (the gateway micro-cache uses the same window)")
+    gzip_responses: bool = Field(default=False, description="gzip large responses in-process (leave off behind the gateway, which already compresses)")
+    gzip_min_bytes: int = Field(default=1024, ge=0, description="Responses smaller than this are sent uncompressed")
+
+    # --- Startup ---
+    warm_up_clients: bool = Field(default=True, description="Import SDKs and build Exa/Gemini clients in the background after boot instead of on the first search")
+
+    # --- Server / Process Model ---
+    host: str = Field(default="0.0.0.0", description="Interface uvicorn binds to")
+    port: int = Field(default=8001, description="Port uvicorn binds to")
+    workers: int = Field(default=1, ge=1, description="uvicorn worker processes (one per core in production)")
+    reload: bool = Field(default=False, description="Auto-reload on code changes (development only; forces a single worker)")
+    keep_alive_seconds: int = Field(default=75, ge=1, description="Idle keep-alive timeout; must exceed the gateway's upstream keepalive_timeout")
+    graceful_shutdown_seconds: int = Field(default=20, ge=0, description="Time in-flight requests get to finish after SIGTERM")
+    process_count: int = Field(default=1, ge=1, description="Processes sharing the provider quotas (replicas x workers); per-process rate limits are divided by it")
+
     # --- App Settings ---
     app_name: str = Field(default="Search Service", description="Application name")
     debug: bool = Field(default=False, description="Debug mode")
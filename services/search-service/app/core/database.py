@@ -1,15 +1,19 @@
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 from app.core.config import settings
+from app.core.lazy import lazy_import
 from typing import Optional
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# --- pymongo is imported on first connection (normally by the startup warm-up) ---
+pymongo = lazy_import("pymongo")
+
 # --- Global Client ---
-_client: Optional[MongoClient] = None
+_client: Optional["pymongo.MongoClient"] = None
+_client_lock = threading.Lock()
 
-def get_mongo_client() -> MongoClient:
+def get_mongo_client() -> "pymongo.MongoClient":
     """
     Get or create a MongoDB Client with connection validation.
     
@@ -20,10 +24,16 @@ def get_mongo_client() -> MongoClient:
         ConnectionError: If connection to MongoDB fails
     """
     global _client
-    if _client is None:
+    if _client is not None:
+        return _client
+    # --- Lazy services may be first used concurrently by the warm-up thread and a request ---
+    with _client_lock:
+        if _client is not None:
+            return _client
+        client = None
         try:
             # ---  Create client with connection timeout ----
-            _client = MongoClient(
+            client = pymongo.MongoClient(
                 settings.mongodb_uri,
                 serverSelectionTimeoutMS=5000,  
                 connectTimeoutMS=5000,
@@ -32,14 +42,19 @@ def get_mongo_client() -> MongoClient:
             )
             
             # ---  Test the connection by running a simple command ---
-            _client.admin.command('ping')
+            client.admin.command('ping')
             logger.info("Successfully connected to MongoDB")
+            _client = client
             
-        except (ConnectionFailure, ServerSelectionTimeoutError) as e:
+        except (pymongo.errors.ConnectionFailure, pymongo.errors.ServerSelectionTimeoutError) as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
+            if client is not None:
+                client.close()
             raise ConnectionError(f"Failed to connect to MongoDB: {e}")
         except Exception as e:
             logger.error(f"Unexpected error connecting to MongoDB: {e}")
+            if client is not None:
+                client.close()
             raise ConnectionError(f"Unexpected error connecting to MongoDB: {e}")
     
     return _client
@@ -75,7 +90,7 @@ def test_connection() -> bool:
         bool: True if connection successful, False otherwise
     """
     try:
-        client = MongoClient(
+        client = pymongo.MongoClient(
             settings.mongodb_uri,
             serverSelectionTimeoutMS=3000
         )
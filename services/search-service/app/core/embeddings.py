@@ -0,0 +1,77 @@
+import re
+import zlib
+from typing import Iterable, List, Sequence
+from app.core.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+STOPWORDS = frozenset(
+    "a an and any as at based by find for from in into is located looking me of on or people person "
+    "profile profiles show someone the to who with working works".split()
+)
+
+# --- Paraphrase folding: common role/seniority variants share one token ---
+SYNONYMS = {
+    "dev": "engineer",
+    "developer": "engineer",
+    "programmer": "engineer",
+    "swe": "engineer",
+    "sr": "senior",
+    "jr": "junior",
+    "mgr": "manager",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased word tokens with a light plural fold ("engineers" -> "engineer") and role
+    synonyms folded ("devs" -> "engineer"). Keeps "c++", "c#" and "node.js" intact.
+    """
+    tokens = []
+    for token in _TOKEN.findall((text or "").lower()):
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        token = SYNONYMS.get(token, token)
+        tokens.append(token)
+    return tokens
+
+
+def query_terms(text: str) -> List[str]:
+    """Distinct content tokens of a query (stopwords dropped), in order."""
+    return list(dict.fromkeys(token for token in tokenize(text) if token not in STOPWORDS))
+
+
+def _features(tokens: Sequence[str], bigrams: bool) -> Iterable[str]:
+    yield from tokens
+    if bigrams:
+        for first, second in zip(tokens, tokens[1:]):
+            yield f"{first} {second}"
+
+
+def embed(texts: Sequence[str], dim: int, bigrams: bool = True) -> "np.ndarray":
+    """
+    Embed texts by signed feature hashing of unigrams (and bigrams).
+
+    Unigrams alone make word order irrelevant ("Berlin python engineer" == "python engineer in
+    Berlin"), which suits matching short queries to each other; bigrams add phrase signal for
+    ranking longer profile text.
+
+    Deterministic and model-free, so every worker (and every rebuild) maps a text to the same
+    vector. Rows are L2-normalized float32, so a dot product is the cosine similarity.
+
+    Returns:
+        np.ndarray: (len(texts), dim) matrix.
+    """
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        tokens = [token for token in tokenize(text) if token not in STOPWORDS]
+        if not tokens:
+            continue
+        hashes = np.fromiter((zlib.crc32(feature.encode("utf-8")) for feature in _features(tokens, bigrams)), dtype=np.uint32)
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+        np.add.at(matrix[row], hashes % dim, signs)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
@@ -0,0 +1,52 @@
+import importlib
+import logging
+import threading
+import time
+from types import ModuleType
+from typing import Optional
+
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class LazyModule:
+    """
+    Stand-in for a heavy SDK module that is imported on first attribute access.
+
+    Keeps SDK import cost (time and RSS) out of worker boot; workers that never call
+    a provider never load its SDK. Import time is recorded as lazy_import_ms{module=...}.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Optional[ModuleType] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> ModuleType:
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    started = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    metrics.set_gauge("lazy_import_ms", round(elapsed_ms, 1), module=self._name)
+                    logger.info(f"Imported {self._name} on first use in {elapsed_ms:.0f}ms")
+                    self._module = module
+        return self._module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr: str):
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Return a proxy for module `name` that defers the import until first use."""
+    return LazyModule(name)
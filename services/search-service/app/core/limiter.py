@@ -0,0 +1,280 @@
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Optional
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderOverloadedError(Exception):
+    """
+    Raised when a call to an upstream provider cannot be admitted before its deadline.
+    Routers translate it into 503 Service Unavailable with a Retry-After header.
+    """
+
+    def __init__(self, provider: str, retry_after: float, reason: str = "overloaded"):
+        super().__init__(f"{provider} is {reason}; retry after {retry_after:.1f}s")
+        self.provider = provider
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """Best-effort detection of provider 429 responses across the Exa, Gemini and httpx error types."""
+    for attr in ("status_code", "code", "status"):
+        if getattr(exc, attr, None) == 429:
+            return True
+    response = getattr(exc, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    message = str(exc).lower()
+    return "429" in message or "rate limit" in message or "resource_exhausted" in message
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Callers reserve a token and are told how long to wait
+    for it, which queues them in arrival order without busy looping.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """
+        Reserve one token.
+
+        Returns:
+            Seconds to wait before using the token, or None if that wait would exceed max_wait
+            (in which case nothing is reserved).
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+    def time_until_available(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0.0, (1 - self._tokens) / self.rate)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Concurrency limit adjusted by AIMD on observed outcomes.
+
+    - Success within latency_tolerance x the best observed latency: additive increase (+1/limit).
+    - Success slower than that: gentle multiplicative decrease (x0.9).
+    - Provider rate-limit (429): multiplicative decrease (x0.5).
+    The limit stays within [1, max_limit]. Callers beyond the limit wait in a bounded queue.
+    """
+
+    def __init__(self, max_limit: int, max_queue: int, latency_tolerance: float = 2.0):
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.latency_tolerance = latency_tolerance
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self.waiting = 0
+        self.ewma_latency = 1.0
+        self._baseline_latency: Optional[float] = None
+        self._cond = threading.Condition()
+
+    def enter(self, deadline: float) -> bool:
+        """Take a slot, waiting until deadline. Returns False if the queue is full or the deadline passes."""
+        with self._cond:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return True
+            if self.waiting >= self.max_queue:
+                return False
+            self.waiting += 1
+            try:
+                while self.in_flight >= int(self.limit):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+                self.in_flight += 1
+                return True
+            finally:
+                self.waiting -= 1
+
+    def exit(self, latency: float, rate_limited: bool = False, failed: bool = False) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            if rate_limited:
+                self.limit = max(1.0, self.limit * 0.5)
+            elif not failed:
+                self.ewma_latency = 0.8 * self.ewma_latency + 0.2 * latency
+                # --- Baseline tracks the best latency seen, drifting up slowly so it can recover ---
+                if self._baseline_latency is None or latency < self._baseline_latency:
+                    self._baseline_latency = latency
+                else:
+                    self._baseline_latency *= 1.01
+                if latency <= self._baseline_latency * self.latency_tolerance:
+                    self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+                else:
+                    self.limit = max(1.0, self.limit * 0.9)
+            self._cond.notify_all()
+
+
+class LatencyTracker:
+    """
+    Sliding window of recent upstream latencies, used by resilience to pick the hedging delay.
+    Recorded by ProviderLimiter after admission, so time queued behind the limiter is excluded.
+    """
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < settings.hedge_min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class ProviderLimiter:
+    """Token bucket (quota) plus adaptive concurrency limit for one upstream provider."""
+
+    def __init__(
+        self,
+        provider: str,
+        rate_per_second: float,
+        burst: int,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout: float,
+        latency_tolerance: float = 2.0
+    ):
+        self.provider = provider
+        self.queue_timeout = queue_timeout
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self.concurrency = AdaptiveConcurrencyLimiter(max_concurrency, max_queue, latency_tolerance)
+
+    def _reject(self, reason: str, retry_after: float) -> ProviderOverloadedError:
+        metrics.increment("limiter_rejected_total", provider=self.provider, reason=reason)
+        logger.warning(f"Rejecting {self.provider} call ({reason}); retry after {retry_after:.1f}s")
+        return ProviderOverloadedError(self.provider, retry_after, reason)
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[None]:
+        """
+        Admit one call, queueing until the deadline for a rate token and a concurrency slot.
+
+        Raises:
+            ProviderOverloadedError: If the call cannot be admitted in time.
+        """
+        deadline = time.monotonic() + (self.queue_timeout if timeout is None else timeout)
+
+        wait = self.bucket.reserve(max_wait=max(0.0, deadline - time.monotonic()))
+        if wait is None:
+            raise self._reject("rate_limited", self.bucket.time_until_available())
+        if wait > 0:
+            metrics.observe("limiter_queue_wait_ms", wait * 1000, provider=self.provider)
+            time.sleep(wait)
+
+        if not self.concurrency.enter(deadline):
+            raise self._reject("concurrency_limited", max(1.0, self.concurrency.ewma_latency))
+
+        self._publish()
+        start = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            rate_limited = is_rate_limited(e)
+            if rate_limited:
+                metrics.increment("upstream_rate_limited_total", provider=self.provider)
+            self.concurrency.exit(time.monotonic() - start, rate_limited=rate_limited, failed=True)
+            self._publish()
+            raise
+        else:
+            latency = time.monotonic() - start
+            metrics.observe("upstream_latency_ms", latency * 1000, provider=self.provider)
+            get_latency_tracker(self.provider).record(latency)
+            self.concurrency.exit(latency)
+            self._publish()
+
+    def _publish(self) -> None:
+        metrics.set_gauge("limiter_concurrency_limit", int(self.concurrency.limit), provider=self.provider)
+        metrics.set_gauge("limiter_in_flight", self.concurrency.in_flight, provider=self.provider)
+
+
+# --- Per-provider registry ---
+_limiters: Dict[str, ProviderLimiter] = {}
+_latencies: Dict[str, LatencyTracker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_latency_tracker(provider: str) -> LatencyTracker:
+    """Return the upstream latency window for a provider."""
+    tracker = _latencies.get(provider)
+    if tracker is None:
+        with _registry_lock:
+            tracker = _latencies.get(provider)
+            if tracker is None:
+                tracker = _latencies[provider] = LatencyTracker()
+    return tracker
+
+
+def _build_limiter(provider: str) -> ProviderLimiter:
+    quotas = {
+        "exa": (settings.exa_requests_per_second, settings.exa_burst, settings.exa_max_concurrency),
+        "gemini": (settings.gemini_requests_per_second, settings.gemini_burst, settings.gemini_max_concurrency),
+    }
+    if provider not in quotas:
+        raise ValueError(f"No rate limits configured for provider '{provider}'")
+    rate, burst, max_concurrency = quotas[provider]
+    # --- Provider quotas are account-wide: each process gets its share ---
+    processes = settings.process_count
+    return ProviderLimiter(
+        provider=provider,
+        rate_per_second=rate / processes,
+        burst=max(1, burst // processes),
+        max_concurrency=max(1, math.ceil(max_concurrency / processes)),
+        max_queue=settings.limiter_max_queue,
+        queue_timeout=settings.limiter_queue_timeout_seconds,
+        latency_tolerance=settings.limiter_latency_tolerance
+    )
+
+
+def get_provider_limiter(provider: str) -> ProviderLimiter:
+    """Return the shared limiter for an upstream provider ("exa" or "gemini")."""
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        with _registry_lock:
+            limiter = _limiters.get(provider)
+            if limiter is None:
+                limiter = _limiters[provider] = _build_limiter(provider)
+    return limiter
+
+
+def reset_limiters() -> None:
+    """Drop all provider limiters and latency windows; the next get_provider_limiter call rebuilds from settings."""
+    with _registry_lock:
+        _limiters.clear()
+        _latencies.clear()
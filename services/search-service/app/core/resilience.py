@@ -0,0 +1,233 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from enum import Enum
+from typing import Callable, Dict, Optional, TypeVar
+
+from app.core.config import settings
+from app.core.limiter import ProviderOverloadedError, get_latency_tracker, is_rate_limited
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_RETRYABLE_STATUS = {408, 500, 502, 503, 504}
+_TRANSIENT_MARKERS = ("timeout", "timed out", "temporarily", "connection reset", "connection aborted", "unavailable")
+
+
+class ErrorClass(str, Enum):
+    RETRYABLE = "retryable"
+    RATE_LIMITED = "rate_limited"
+    FATAL = "fatal"
+
+
+class CircuitOpenError(ProviderOverloadedError):
+    """Raised without calling the provider while its circuit breaker is open."""
+
+    def __init__(self, provider: str, retry_after: float):
+        super().__init__(provider, retry_after, reason="circuit_open")
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    for candidate in (exc, getattr(exc, "response", None)):
+        for attr in ("status_code", "code", "status"):
+            value = getattr(candidate, attr, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def classify_error(exc: BaseException) -> ErrorClass:
+    """
+    Decide whether a failed upstream call is worth retrying.
+
+    Local limiter rejections and client errors (4xx other than 408/429) are fatal;
+    429s are retried with a longer backoff; 5xx, timeouts and connection failures are retryable.
+    """
+    if isinstance(exc, ProviderOverloadedError):
+        return ErrorClass.FATAL
+    if is_rate_limited(exc):
+        return ErrorClass.RATE_LIMITED
+    status = _status_code(exc)
+    if status is not None:
+        return ErrorClass.RETRYABLE if status in _RETRYABLE_STATUS else ErrorClass.FATAL
+    if isinstance(exc, (TimeoutError, ConnectionError, OSError)):
+        return ErrorClass.RETRYABLE
+    message = str(exc).lower()
+    if any(marker in message for marker in _TRANSIENT_MARKERS):
+        return ErrorClass.RETRYABLE
+    return ErrorClass.FATAL
+
+
+def backoff_delay(attempt: int, error_class: ErrorClass) -> float:
+    """Full-jitter exponential backoff; rate-limited calls start from a 4x larger base."""
+    base = settings.retry_base_delay_seconds * (4 if error_class == ErrorClass.RATE_LIMITED else 1)
+    return random.uniform(0, min(settings.retry_max_delay_seconds, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed -> open after failure_threshold transient failures in a row; open calls fail fast
+    with CircuitOpenError; after reset_timeout one probe call is let through (half-open) and
+    its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, provider: str, failure_threshold: int, reset_timeout: float):
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if self.state == self.OPEN and remaining <= 0:
+                self._set_state(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            metrics.increment("circuit_rejected_total", provider=self.provider)
+            raise CircuitOpenError(self.provider, max(1.0, remaining))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            if self.state != self.CLOSED:
+                self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state(self.OPEN)
+
+    def release_probe(self) -> None:
+        """Free a half-open probe slot when the call ended with a non-transient error."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            logger.warning(f"Circuit for {self.provider}: {self.state} -> {state}")
+        self.state = state
+        metrics.set_gauge("circuit_open", 1 if state == self.OPEN else 0, provider=self.provider)
+
+
+# --- Per-provider state ---
+_breakers: Dict[str, CircuitBreaker] = {}
+_state_lock = threading.Lock()
+_hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    with _state_lock:
+        if provider not in _breakers:
+            _breakers[provider] = CircuitBreaker(
+                provider,
+                failure_threshold=settings.circuit_failure_threshold,
+                reset_timeout=settings.circuit_reset_timeout_seconds
+            )
+        return _breakers[provider]
+
+
+def reset() -> None:
+    """Forget all breaker state (tests, or after a provider outage is resolved)."""
+    with _state_lock:
+        _breakers.clear()
+
+
+def _call_hedged(provider: str, fn: Callable[[], T]) -> T:
+    """
+    Run fn; if it has not finished by the provider's p95 upstream latency (recorded by its limiter
+    after admission, so queueing does not count), start a second identical
+    call and return whichever succeeds first. Only for idempotent calls.
+    """
+    hedge_after = get_latency_tracker(provider).percentile(settings.hedge_percentile)
+    if hedge_after is None:
+        return fn()
+
+    pending = {_hedge_executor.submit(fn)}
+    done, pending = wait(pending, timeout=hedge_after)
+    if not done:
+        metrics.increment("hedged_requests_total", provider=provider)
+        pending.add(_hedge_executor.submit(fn))
+
+    error: Optional[BaseException] = None
+    while True:
+        for future in done:
+            if future.exception() is None:
+                # --- The loser keeps running in its thread; its result is simply dropped ---
+                return future.result()
+            error = future.exception()
+        if not pending:
+            raise error
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+
+def call_with_resilience(
+    provider: str,
+    fn: Callable[[], T],
+    hedge: bool = False,
+    max_attempts: Optional[int] = None
+) -> T:
+    """
+    Call an upstream provider with classified retries, optional hedging and a circuit breaker.
+
+    Args:
+        provider: Provider name ("exa", "gemini"), used for breaker and latency state.
+        fn: Zero-argument callable performing one attempt (including limiter admission).
+        hedge: Allow a hedged second request once the p95 latency is crossed. Idempotent calls only.
+        max_attempts: Override settings.retry_max_attempts.
+
+    Raises:
+        CircuitOpenError: If the provider's circuit is open.
+        Exception: The last error once retries are exhausted or a fatal error occurs.
+    """
+    attempts = max_attempts or settings.retry_max_attempts
+    breaker = get_circuit_breaker(provider)
+
+    for attempt in range(attempts):
+        breaker.before_call()
+        try:
+            if hedge and settings.hedge_enabled:
+                result = _call_hedged(provider, fn)
+            else:
+                result = fn()
+        except Exception as e:
+            error_class = classify_error(e)
+            if error_class == ErrorClass.FATAL:
+                breaker.release_probe()
+                raise
+            breaker.record_failure()
+            if attempt == attempts - 1:
+                raise
+            delay = backoff_delay(attempt, error_class)
+            metrics.increment("upstream_retries_total", provider=provider, error_class=error_class.value)
+            logger.warning(
+                f"{provider} call failed ({error_class.value}: {e}); "
+                f"retry {attempt + 1}/{attempts - 1} in {delay:.2f}s"
+            )
+            time.sleep(delay)
+        else:
+            breaker.record_success()
+            return result
+
+    raise RuntimeError("unreachable")
@@ -0,0 +1,22 @@
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+from starlette.responses import Response
+
+
+class PydanticJSONResponse(Response):
+    """
+    JSON response rendered straight from an already-validated pydantic model.
+
+    Returning it from an endpoint skips FastAPI's response_model pass (re-validation
+    plus jsonable_encoder and json.dumps); pydantic-core serializes the model to bytes
+    in one step. Keep `response_model=` on the route for the OpenAPI schema.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return to_json(content)
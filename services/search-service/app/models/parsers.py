@@ -1,6 +1,10 @@
 import re
 from typing import List, Dict, Any, Optional
-from .search import PersonResult, WorkExperienceItem, EducationItem
+from pydantic import TypeAdapter
+from .search import PersonResult
+
+# --- Validates a whole page of extracted results in a single pydantic-core call ---
+_person_results_adapter = TypeAdapter(List[PersonResult])
 
 
 class PersonResultParser:
@@ -13,6 +17,9 @@ class PersonResultParser:
     def parse_results(raw_results: List[Any]) -> List[PersonResult]:
         """
         Parse a list of raw results into PersonResult objects.
+
+        Fields are extracted into plain dicts and the page is validated once, instead of
+        validating every WorkExperienceItem, EducationItem and PersonResult separately.
         
         Args:
             raw_results: List of raw results (either Result objects or dictionaries)
@@ -20,11 +27,23 @@ class PersonResultParser:
         Returns:
             List of parsed PersonResult objects
         """
-        return [PersonResultParser._parse_single_result(result) for result in raw_results]
+        return PersonResultParser.validate_fields(
+            [PersonResultParser.extract_fields(result) for result in raw_results]
+        )
+
+    @staticmethod
+    def validate_fields(fields: List[Dict[str, Any]]) -> List[PersonResult]:
+        """Validate extracted (or previously cached) field dicts into PersonResults in one pass."""
+        return _person_results_adapter.validate_python(fields)
     
     @staticmethod
-    def _parse_single_result(result: Any) -> PersonResult:
-        """Parse a single raw result into a PersonResult object."""
+    def to_raw_dict(result: Any) -> Dict[str, Any]:
+        """Storable plain-dict form of a raw result; parse_results accepts it later."""
+        return PersonResultParser._extract_basic_fields(result)
+
+    @staticmethod
+    def extract_fields(result: Any) -> Dict[str, Any]:
+        """Extract the PersonResult fields of a single raw result as a plain dict."""
         # ---  Extract basic fields --- 
         basic_data = PersonResultParser._extract_basic_fields(result)
         text = basic_data['text']
@@ -36,7 +55,7 @@ class PersonResultParser:
         skills = PersonResultParser._extract_skills(text)
         summary = PersonResultParser._extract_summary(text)
         
-        return PersonResult(
+        return dict(
             id=basic_data['id'],
             url=basic_data['url'],
             title=basic_data['title'],
@@ -78,7 +97,7 @@ class PersonResultParser:
         return location_match.group(0) if location_match else None
     
     @staticmethod
-    def _extract_work_experience(text: str) -> List[WorkExperienceItem]:
+    def _extract_work_experience(text: str) -> List[Dict[str, Optional[str]]]:
         """Extract work experience entries from text."""
         work_ex = []
         sections = text.split('- ###')
@@ -95,7 +114,7 @@ class PersonResultParser:
                 company = company_duration[0].strip(' []')
                 duration = company_duration[1] if len(company_duration) > 1 else None
                 
-                work_ex.append(WorkExperienceItem(
+                work_ex.append(dict(
                     title=title,
                     company=company,
                     duration=duration,
@@ -107,7 +126,7 @@ class PersonResultParser:
         return work_ex
     
     @staticmethod
-    def _extract_education(text: str) -> List[EducationItem]:
+    def _extract_education(text: str) -> List[Dict[str, Optional[str]]]:
         """Extract education entries from text."""
         education = []
         sections = text.split('- ###')
@@ -124,7 +143,7 @@ class PersonResultParser:
                         field = rest_parts[0].strip()
                         institution = rest_parts[1].strip(' []') if len(rest_parts) > 1 else None
                         
-                        education.append(EducationItem(
+                        education.append(dict(
                             degree=degree,
                             field_of_study=field,
                             institution=institution
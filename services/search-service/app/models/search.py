@@ -13,7 +13,49 @@ class SearchCategory(str, Enum):
     COMPANY = "company"
     # we will add later more 
 
+class QueryPath(str, Enum):
+    """
+    Which query reached Exa, recorded in SearchMetadata.
+    """
+    ENHANCED = "enhanced"  # --- Gemini answered within budget ---
+    ORIGINAL = "original"  # --- Enhancement unavailable, failed or returned the query unchanged ---
+    ENHANCEMENT_TIMEOUT = "enhancement_timeout"  # --- Gemini missed its deadline ---
+    SPECULATIVE_ENHANCED = "speculative_enhanced"  # --- Speculative mode, enhanced search won ---
+    SPECULATIVE_ORIGINAL = "speculative_original"  # --- Speculative mode, original-query search was used ---
+    LOCAL_INDEX = "local_index"  # --- local_first mode, answered from the local profile index without Exa ---
+    SEMANTIC_CACHE = "semantic_cache"  # --- Served from the results of a recent near-duplicate query ---
+
 # --- Request Models --- 
+class SearchFilters(BaseModel):
+    """
+    Server-side refinements applied to the search's whole result window (no extra Exa call).
+    Terms are matched case-insensitively and every word of a phrase must appear.
+    """
+    skills: List[str] = Field(
+        default_factory=list,
+        max_length=20,
+        description="Skills every result must list."
+    )
+    location: Optional[str] = Field(
+        default=None,
+        max_length=100,
+        description="Location the result must be in (matched against PersonResult.location)."
+    )
+    companies: List[str] = Field(
+        default_factory=list,
+        max_length=20,
+        description="Results must have worked at one of these companies."
+    )
+    title_keywords: List[str] = Field(
+        default_factory=list,
+        max_length=20,
+        description="Results must have one of these keywords in their headline or a job title."
+    )
+    strict: bool = Field(
+        default=True,
+        description="Drop results that miss a filter; when false, results are only re-ranked by how many filters they match."
+    )
+
 class SearchRequest(BaseModel):
     """
     Pydantic model for the search request body.
@@ -35,6 +77,24 @@ class SearchRequest(BaseModel):
         le=50, 
         description="The maximum number of results to return."
     )
+    latency_budget_ms: Optional[int] = Field(
+        default=None,
+        ge=100,
+        le=30000,
+        description="End-to-end latency budget; Gemini enhancement is skipped if it would not fit. Defaults to the service setting."
+    )
+    speculative: bool = Field(
+        default=False,
+        description="Run the original-query Exa search in parallel with enhancement and use it if enhancement is late."
+    )
+    local_first: bool = Field(
+        default=False,
+        description="Answer from the local index of previously seen profiles when enough of them match; otherwise search Exa."
+    )
+    filters: Optional[SearchFilters] = Field(
+        default=None,
+        description="Post-filters and re-ranking over the result window; refining a recent search reuses its cached results."
+    )
 
 # --- Nested Response Models --- 
 class WorkExperienceItem(BaseModel):
@@ -75,6 +135,9 @@ class SearchMetadata(BaseModel):
     total_results: int 
     search_time_ms: float 
     enhanced_query: Optional[str] = None 
+    query_path: Optional[QueryPath] = None
+    enhancement_ms: Optional[float] = None
+    next_cursor: Optional[str] = None  # --- Pass to GET /search/linkedin/next for the following page ---
 
 # --- Raw Exa Response Models ---
 class ExaSearchResponse(BaseModel):
@@ -88,16 +151,17 @@ class ExaSearchResponse(BaseModel):
     cost_dollars: Optional[dict] = None  
     
     @classmethod
-    def from_exa_response(cls, exa_response) -> 'ExaSearchResponse':
+    def from_exa_response(cls, exa_response, limit: Optional[int] = None) -> 'ExaSearchResponse':
         """
         Factory method to create ExaSearchResponse from Exa API response object.
         Handles both Result objects and dictionary formats.
+        Only the first `limit` results are parsed (all of them if None).
         """
         # ---  Lazy import to break circular dependency --- 
         from app.models.parsers import PersonResultParser
         
         # ---  Parse results using the dedicated parser ----
-        parsed_results = PersonResultParser.parse_results(exa_response.results)
+        parsed_results = PersonResultParser.parse_results(exa_response.results[:limit])
         
         cost_dollars = getattr(exa_response, 'cost_dollars', None)
         if cost_dollars is not None:
@@ -124,11 +188,16 @@ class SearchResponse(BaseModel):
     metadata: SearchMetadata
     
     @classmethod
-    def from_exa_response(cls, exa_response, enhanced_query: Optional[str] = None) -> 'SearchResponse':
+    def from_exa_response(
+        cls,
+        exa_response,
+        enhanced_query: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> 'SearchResponse':
         """
         Factory method to create SearchResponse from ExaSearchResponse.
         """
-        exa_search_response = ExaSearchResponse.from_exa_response(exa_response)
+        exa_search_response = ExaSearchResponse.from_exa_response(exa_response, limit=limit)
         
         metadata = SearchMetadata(
             total_results=len(exa_search_response.results),
@@ -1,4 +1,5 @@
 from fastapi import APIRouter
+from app.core.metrics import metrics
 
 router = APIRouter()
 
@@ -11,4 +12,11 @@ async def health_check():
         "status": "healthy",
         "service": "search-service",
         "version": "1.0.0"
-    }
\ No newline at end of file
+    }
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    In-process metrics for this worker (limiter state, upstream latency, rejections).
+    """
+    return metrics.snapshot()
@@ -1,42 +1,108 @@
-from fastapi import APIRouter, HTTPException, status, Query, Depends
+import asyncio
+import logging
+import math
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status, Query, Depends, Response
 from typing import Optional
 from app.models.search import SearchRequest, SearchResponse
 from app.models.history import HistoryResponse
-from app.services import exa_service, gemini_service ,  cache_service
+from app.services import get_cache_service, get_continuation_service, get_search_pipeline
+from app.services.cache_service import CacheService
+from app.services.continuation_service import ContinuationService, InvalidCursorError
+from app.services.search_pipeline import SearchPipeline
 from app.core.auth import get_current_user  
+from app.core.config import settings
+from app.core.responses import PydanticJSONResponse
+from app.core.limiter import ProviderOverloadedError
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/search", tags=["search"])
 
-@router.post("/linkedin", response_model=SearchResponse)
+
+def _record_search(cache_service: CacheService, user_id: str, request: SearchRequest, response: SearchResponse) -> None:
+    """Write the history entry after the response is sent; failures only cost the history item."""
+    try:
+        cache_service.save_search(
+            user_id=user_id,
+            query=request.query,
+            results_count=response.metadata.total_results,
+            category=request.category.value,
+            enhanced_query=response.metadata.enhanced_query
+        )
+    except Exception as e:
+        logger.warning(f"Failed to record search history for user {user_id}: {e}")
+
+
+@router.post("/linkedin", response_model=SearchResponse, response_class=PydanticJSONResponse)
 async def search_linkedin(
     request: SearchRequest,
-    user_id: str = Depends(get_current_user) 
+    background_tasks: BackgroundTasks,
+    user_id: str = Depends(get_current_user),
+    search_pipeline: SearchPipeline = Depends(get_search_pipeline),
+    cache_service: CacheService = Depends(get_cache_service)
 ):
     try:
-        enhanced_query = gemini_service.enhance_query(
-            request.query, request.category.value, request.limit
-        )
-        response = exa_service.search_linkedin(
-            query=enhanced_query,
-            limit=request.limit,
-            category=request.category.value,
-            enhanced_query=enhanced_query if enhanced_query != request.query else None
-        )
+        # --- Enhancement is skipped if it would not fit the request's latency budget ---
+        response = await search_pipeline.run(request, user_id=user_id)
 
-        # TODO: Save to MongoDB with user_id
-        # await cache_service.save_search(user_id, request, response)
+        background_tasks.add_task(_record_search, cache_service, user_id, request, response)
 
-        return response
+        # --- Already validated by the pipeline: serialize once, without the response_model pass ---
+        return PydanticJSONResponse(response)
+    except ProviderOverloadedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Search is temporarily overloaded ({e.provider}). Please retry shortly.",
+            headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Search failed: {str(e)}"
         )
 
+@router.get("/linkedin/next", response_model=SearchResponse, response_class=PydanticJSONResponse)
+async def next_search_page(
+    cursor: str = Query(..., min_length=3, max_length=100, description="metadata.next_cursor of the previous page"),
+    limit: int = Query(default=10, ge=1, le=50),
+    user_id: str = Depends(get_current_user),
+    continuation_service: ContinuationService = Depends(get_continuation_service)
+):
+    """Serve the next page of an earlier search from its stored result window (no Exa call)."""
+    try:
+        page = await asyncio.to_thread(continuation_service.load_page, user_id, cursor, limit)
+    except InvalidCursorError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+    except Exception as e:
+        logger.error(f"Continuation lookup failed for user {user_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="More results are temporarily unavailable. Please retry shortly."
+        )
+
+    if page is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="These search results have expired. Please run the search again."
+        )
+    return PydanticJSONResponse(page)
+
 @router.get("/history", response_model=HistoryResponse)
 async def get_search_history(
+    response: Response,
     limit: int = Query(default=10, ge=1, le=50),
-    user_id: str = Depends(get_current_user) 
+    user_id: str = Depends(get_current_user),
+    cache_service: CacheService = Depends(get_cache_service)
 ):
-    # TODO: Implement with MongoDB
-    return HistoryResponse(history=[])
\ No newline at end of file
+    try:
+        history = await asyncio.to_thread(cache_service.get_history, user_id, limit)
+    except Exception as e:
+        logger.error(f"History lookup failed for user {user_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Search history is temporarily unavailable. Please retry shortly."
+        )
+
+    # --- Per-user data: browsers may reuse it briefly; the gateway micro-caches it keyed by token ---
+    response.headers["Cache-Control"] = f"private, max-age={settings.history_cache_max_age_seconds}"
+    return HistoryResponse(history=history)
\ No newline at end of file
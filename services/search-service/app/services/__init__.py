@@ -1,5 +1,25 @@
-from .exa_service import exa_service
-from .gemini_service import gemini_service
-from .cache_service import cache_service
+"""
+Service accessors. Services are built on first use (or by the startup warm-up), so importing
+this package does no network I/O and a MongoDB outage cannot prevent the app from booting.
+"""
+from .exa_service import get_exa_service
+from .gemini_service import get_gemini_service
+from .cache_service import get_cache_service
+from .continuation_service import get_continuation_service
+from .profile_cache_service import get_profile_cache_service
+from .profile_index import get_profile_index
+from .query_cache import get_query_cache
+from .search_pipeline import get_search_pipeline
+from .prewarm_service import get_prewarm_service
 
-__all__ = ["exa_service", "gemini_service", "cache_service"]
\ No newline at end of file
+__all__ = [
+    "get_exa_service",
+    "get_gemini_service",
+    "get_cache_service",
+    "get_continuation_service",
+    "get_profile_cache_service",
+    "get_profile_index",
+    "get_query_cache",
+    "get_search_pipeline",
+    "get_prewarm_service",
+]
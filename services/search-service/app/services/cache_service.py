@@ -1,14 +1,16 @@
 import hashlib
 import logging
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, List
-from pymongo import DESCENDING
-from pymongo.errors import DuplicateKeyError, PyMongoError
 from app.core.database import get_database
+from app.core.lazy import lazy_import
 from app.models.history import HistoryItem
 
 logger = logging.getLogger(__name__)
 
+pymongo = lazy_import("pymongo")
+
 class CacheService:
     """
     Service for caching search results and managing user history.
@@ -17,22 +19,45 @@ class CacheService:
     
     def __init__(self, db_name: str = "networkai_search"):
         """
-        Initialize with database and ensure indexes.
+        Initialize without touching MongoDB; the connection is opened on first use
+        and indexes are created by ensure_indexes() during the startup warm-up.
         
         Args:
             db_name: MongoDB database name.
         """
-        self.db = get_database(db_name)
-        self.user_searches = self.db["user_searches"]
-        self.search_cache = self.db["search_cache"]
-        self._ensure_indexes()
-    
-    def _ensure_indexes(self):
-        """Create required indexes for performance and TTL."""
+        self.db_name = db_name
+        self._db = None
+        self._indexes_ready = False
+
+    @property
+    def db(self):
+        if self._db is None:
+            self._db = get_database(self.db_name)
+        return self._db
+
+    @property
+    def user_searches(self):
+        return self.db["user_searches"]
+
+    @property
+    def search_cache(self):
+        return self.db["search_cache"]
+
+    def ensure_indexes(self) -> None:
+        """
+        Create required indexes for performance and TTL.
+        Idempotent; runs once per process (in the background at startup).
+
+        Raises:
+            ConnectionError: If MongoDB is unreachable.
+            PyMongoError: If index creation fails.
+        """
+        if self._indexes_ready:
+            return
         try:
             # ---  History: Compound index for efficient queries ---
             self.user_searches.create_index(
-                [("user_id", 1), ("timestamp", DESCENDING)],
+                [("user_id", 1), ("timestamp", pymongo.DESCENDING)],
                 name="user_timestamp_idx"
             )
             
@@ -43,6 +68,12 @@ class CacheService:
                 name="user_query_unique_idx"
             )
             
+            # ---  History: recent searches across users (cache pre-warming popularity scan) ---
+            self.user_searches.create_index(
+                [("timestamp", pymongo.DESCENDING)],
+                name="timestamp_idx"
+            )
+
             # ---  Cache: TTL index for auto-expiration (24h from insert) ---
             self.search_cache.create_index(
                 [("expires_at", 1)],
@@ -56,8 +87,9 @@ class CacheService:
                 name="user_query_cache_idx"
             )
             
+            self._indexes_ready = True
             logger.info("Cache indexes created/verified successfully")
-        except PyMongoError as e:
+        except pymongo.errors.PyMongoError as e:
             logger.error(f"Failed to create indexes: {e}")
             raise
     
@@ -125,10 +157,10 @@ class CacheService:
             logger.info(f"Saved search history for user {user_id}: {query[:50]}...")
             return True
             
-        except DuplicateKeyError:
+        except pymongo.errors.DuplicateKeyError:
             logger.warning(f"Duplicate search skipped for user {user_id}: {query_hash}")
             return True  
-        except PyMongoError as e:
+        except pymongo.errors.PyMongoError as e:
             logger.error(f"Failed to save search for user {user_id}: {e}")
             raise
     
@@ -149,7 +181,7 @@ class CacheService:
         try:
             docs = self.user_searches.find(
                 {"user_id": user_id},
-                sort=[("timestamp", DESCENDING)],
+                sort=[("timestamp", pymongo.DESCENDING)],
                 limit=limit,
                 projection={"_id": 0}  
             )
@@ -161,7 +193,7 @@ class CacheService:
             logger.info(f"Retrieved {len(history)} history items for user {user_id}")
             return history
             
-        except PyMongoError as e:
+        except pymongo.errors.PyMongoError as e:
             logger.error(f"Failed to get history for user {user_id}: {e}")
             raise
     
@@ -182,9 +214,19 @@ class CacheService:
                 projection={"_id": 0, "expires_at": 0}
             )
             return doc["results"] if doc else None
-        except PyMongoError as e:
+        except pymongo.errors.PyMongoError as e:
             logger.error(f"Failed to get cache for user {user_id}: {e}")
             return None
 
 
-cache_service = CacheService()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_cache_service() -> CacheService:
+    """Return the shared CacheService (no MongoDB I/O until first use)."""
+    return CacheService()
+
+
+def __getattr__(name: str):
+    # --- Keeps `from app.services.cache_service import cache_service` working ---
+    if name == "cache_service":
+        return get_cache_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,167 @@
+import logging
+import secrets
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.lazy import lazy_import
+from app.models.parsers import PersonResultParser
+from app.models.search import SearchMetadata, SearchResponse
+
+logger = logging.getLogger(__name__)
+
+pymongo = lazy_import("pymongo")
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a continuation cursor is malformed."""
+
+
+def encode_cursor(token: str, offset: int) -> str:
+    return f"{token}.{offset}"
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    token, _, offset = cursor.rpartition(".")
+    if not token or not offset.isdigit():
+        raise InvalidCursorError(f"Malformed continuation cursor: {cursor!r}")
+    return token, int(offset)
+
+
+class ContinuationService:
+    """
+    Server-side "load more" for searches.
+
+    A new search fetches a larger Exa result window once; the results beyond the first page
+    are stored raw in `search_continuations` under a random token (TTL-expired). Follow-up
+    pages slice that stored window in MongoDB and parse only the requested results, so deep
+    browsing costs no further Exa calls.
+
+    Cursors are "<token>.<offset>" and are only valid for the user who ran the search.
+    """
+
+    def __init__(self, db_name: str = "networkai_search"):
+        self.db_name = db_name
+        self._db = None
+        self._indexes_ready = False
+
+    @property
+    def db(self):
+        if self._db is None:
+            self._db = get_database(self.db_name)
+        return self._db
+
+    @property
+    def continuations(self):
+        return self.db["search_continuations"]
+
+    def ensure_indexes(self) -> None:
+        """
+        Create the TTL index that expires stored windows. Idempotent.
+
+        Raises:
+            ConnectionError: If MongoDB is unreachable.
+            PyMongoError: If index creation fails.
+        """
+        if self._indexes_ready:
+            return
+        try:
+            self.continuations.create_index(
+                [("expires_at", 1)],
+                expireAfterSeconds=0,
+                name="ttl_idx"
+            )
+            self._indexes_ready = True
+        except pymongo.errors.PyMongoError as e:
+            logger.error(f"Failed to create continuation indexes: {e}")
+            raise
+
+    def save(
+        self,
+        user_id: str,
+        query: str,
+        category: str,
+        enhanced_query: Optional[str],
+        raw_results: List[Dict[str, Any]]
+    ) -> str:
+        """
+        Store the unreturned tail of a result window.
+
+        Args:
+            user_id: Authenticated user ID; only this user can page through the window.
+            query: Original search query.
+            category: Search category.
+            enhanced_query: Gemini-enhanced query (if used).
+            raw_results: Raw results (PersonResultParser.to_raw_dict) after the first page.
+
+        Returns:
+            str: Cursor for the first stored result.
+
+        Raises:
+            PyMongoError: On connection/write failures.
+        """
+        token = secrets.token_urlsafe(16)
+        now = datetime.utcnow()
+        self.continuations.insert_one({
+            "_id": token,
+            "user_id": user_id,
+            "query": query,
+            "category": category,
+            "enhanced_query": enhanced_query,
+            "results": raw_results,
+            "total": len(raw_results),
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=settings.continuation_ttl_seconds)
+        })
+        return encode_cursor(token, 0)
+
+    def load_page(self, user_id: str, cursor: str, limit: int = 10) -> Optional[SearchResponse]:
+        """
+        Serve the page at `cursor` from a stored window.
+
+        Args:
+            user_id: Authenticated user ID.
+            cursor: Cursor from a previous response's metadata.next_cursor.
+            limit: Max results in the page (1-50).
+
+        Returns:
+            Optional[SearchResponse]: The page (with next_cursor if more remain), or None if the
+            window expired, does not exist or belongs to another user.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed.
+            PyMongoError: On connection/read failures.
+        """
+        if limit < 1 or limit > 50:
+            raise ValueError("Limit must be between 1 and 50")
+        start = time.monotonic()
+        token, offset = decode_cursor(cursor)
+
+        # --- The TTL monitor runs about once a minute, so expiry is also checked here ---
+        doc = self.continuations.find_one(
+            {"_id": token, "user_id": user_id, "expires_at": {"$gt": datetime.utcnow()}},
+            projection={"results": {"$slice": [offset, limit]}}
+        )
+        if doc is None:
+            return None
+
+        raw_page = doc.get("results", [])
+        results = PersonResultParser.parse_results(raw_page)
+        next_offset = offset + len(raw_page)
+        return SearchResponse(
+            results=results,
+            metadata=SearchMetadata(
+                total_results=len(results),
+                search_time_ms=round((time.monotonic() - start) * 1000, 2),
+                enhanced_query=doc.get("enhanced_query"),
+                next_cursor=encode_cursor(token, next_offset) if next_offset < doc.get("total", 0) else None
+            )
+        )
+
+
+@lru_cache(maxsize=1)
+def get_continuation_service() -> ContinuationService:
+    """Return the shared ContinuationService (no MongoDB I/O until first use)."""
+    return ContinuationService()
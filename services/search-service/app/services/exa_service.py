@@ -1,22 +1,46 @@
-from exa_py import Exa
 from app.core.config import settings
-from app.models.search import SearchResponse
-from typing import Optional
+from app.core.lazy import lazy_import
+from app.core.limiter import get_provider_limiter
+from app.core.metrics import metrics
+from app.core.resilience import call_with_resilience
+from app.models.parsers import PersonResultParser
+from app.models.search import SearchMetadata, SearchResponse
+from app.services.profile_cache_service import (
+    ProfileCacheService,
+    canonical_profile_url,
+    content_hash,
+    get_profile_cache_service,
+)
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# --- exa_py (and the openai client it bundles) is imported when the client is first built ---
+exa_py = lazy_import("exa_py")
+
+# --- Weight of the latest search in the rolling profile cache hit ratio ---
+_HIT_RATIO_ALPHA = 0.2
+
 class ExaService:
     """
     Service for interacting with the Exa AI API.
     Handles LinkedIn-focused searches with text extraction for parsing.
     Delegates structured parsing to model factory methods.
+
+    With a profile cache, parsed profiles are reused across searches. While the rolling hit
+    ratio is low, results and contents come from one Exa call; once it reaches
+    `profile_cache_ids_first_ratio`, searches list ids first and fetch contents only for
+    the profiles that are not cached.
     """
     
-    def __init__(self):
+    def __init__(self, profile_cache: Optional[ProfileCacheService] = None):
         if not settings.exa_api_key:
             raise ValueError("EXA_API_KEY is required for ExaService")
-        self.client = Exa(api_key=settings.exa_api_key)
+        self.client = exa_py.Exa(api_key=settings.exa_api_key)
+        self.profile_cache = profile_cache
+        self._hit_ratio = 0.0
 
     def search_linkedin(
         self,
@@ -39,31 +63,191 @@ class ExaService:
             
         Raises:
             ValueError: If invalid params (e.g., limit > 50).
-            Exception: If Exa API call fails (e.g., rate limit, network error).
+            ProviderOverloadedError: If the Exa limiter cannot admit the call in time or its circuit is open.
+            Exception: If Exa API call still fails after retries (e.g., rate limit, network error).
         """
         if limit < 1 or limit > 50:
             raise ValueError("Limit must be between 1 and 50")
-        
+
+        if self.profile_cache is not None:
+            raw_results, cached = self._fetch_profiles(query, limit, category)
+            return self._build_page(raw_results, cached, enhanced_query)
+
+        exa_response = self._fetch(query, limit, category)
+        return SearchResponse.from_exa_response(exa_response, enhanced_query)
+
+    def search_window(
+        self,
+        query: str,
+        limit: int = 10,
+        window: int = 50,
+        category: str = "linkedin profile",
+        enhanced_query: Optional[str] = None
+    ) -> Tuple[SearchResponse, List[Dict[str, Any]]]:
+        """
+        Fetch `window` results in one Exa call but parse only the first page.
+
+        Args:
+            query: The search query string (enhanced or original).
+            limit: Results in the returned page (1-50).
+            window: Results fetched from Exa (limit-100).
+            category: Exa category filter (default: "linkedin profile").
+            enhanced_query: Original enhanced query for metadata (if different from query).
+
+        Returns:
+            (first page, remaining raw results as plain dicts for later pages)
+
+        Raises:
+            ValueError: If invalid params.
+            ProviderOverloadedError: If the Exa limiter cannot admit the call in time or its circuit is open.
+            Exception: If Exa API call still fails after retries.
+        """
+        if limit < 1 or limit > 50:
+            raise ValueError("Limit must be between 1 and 50")
+        if window < limit or window > 100:
+            raise ValueError("Window must be between limit and 100")
+
+        if self.profile_cache is not None:
+            raw_results, cached = self._fetch_profiles(query, window, category)
+            return self._build_page(raw_results[:limit], cached, enhanced_query), raw_results[limit:]
+
+        exa_response = self._fetch(query, window, category)
+        page = SearchResponse.from_exa_response(exa_response, enhanced_query, limit=limit)
+        # --- Later pages are parsed only if requested ---
+        remaining = [PersonResultParser.to_raw_dict(result) for result in exa_response.results[limit:]]
+        return page, remaining
+
+    def _fetch_profiles(
+        self,
+        query: str,
+        num_results: int,
+        category: str
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        Fetch raw results in Exa order together with the cached profiles among them.
+
+        Returns:
+            (raw results as plain dicts, canonical URL -> cached profile)
+        """
+        if self._hit_ratio >= settings.profile_cache_ids_first_ratio and self.profile_cache.available:
+            mode = "ids_first"
+            listing = self._fetch(query, num_results, category, contents=False)
+            urls = [result.url for result in listing.results]
+            cached = self.profile_cache.get_many(urls)
+            missing = [url for url in urls if canonical_profile_url(url) not in cached]
+            fetched: Dict[str, Dict[str, Any]] = {}
+            if missing:
+                contents = self._get_contents(missing)
+                for result in contents.results:
+                    raw = PersonResultParser.to_raw_dict(result)
+                    fetched[canonical_profile_url(raw["url"])] = raw
+            raw_results = []
+            for result in listing.results:
+                key = canonical_profile_url(result.url)
+                if key in cached:
+                    raw_results.append(cached[key]["raw"])
+                elif key in fetched:
+                    raw_results.append(fetched[key])
+                else:
+                    # --- Contents unavailable for this result: keep it with the listing fields only ---
+                    raw_results.append({**PersonResultParser.to_raw_dict(result), "text": ""})
+        else:
+            mode = "contents"
+            exa_response = self._fetch(query, num_results, category)
+            raw_results = [PersonResultParser.to_raw_dict(result) for result in exa_response.results]
+            cached = self.profile_cache.get_many(result["url"] for result in raw_results)
+
+        if raw_results:
+            hits = sum(1 for result in raw_results if canonical_profile_url(result["url"]) in cached)
+            self._hit_ratio += _HIT_RATIO_ALPHA * (hits / len(raw_results) - self._hit_ratio)
+        metrics.increment("exa_fetch_mode_total", mode=mode)
+        metrics.set_gauge("profile_cache_hit_ratio", round(self._hit_ratio, 3))
+        return raw_results, cached
+
+    def _build_page(
+        self,
+        raw_results: List[Dict[str, Any]],
+        cached: Dict[str, Dict[str, Any]],
+        enhanced_query: Optional[str]
+    ) -> SearchResponse:
+        """Parse a page, reusing cached fields for unchanged profiles and caching the rest."""
+        fields, parsed = [], []
+        for raw in raw_results:
+            entry = cached.get(canonical_profile_url(raw["url"]))
+            if entry is not None and entry.get("content_hash") == content_hash(raw.get("text")):
+                fields.append(entry["fields"])
+                continue
+            extracted = PersonResultParser.extract_fields(raw)
+            fields.append(extracted)
+            if raw.get("text"):
+                parsed.append((raw, extracted))
+        self.profile_cache.put_many(parsed)
+
+        results = PersonResultParser.validate_fields(fields)
+        return SearchResponse(
+            results=results,
+            metadata=SearchMetadata(
+                total_results=len(results),
+                search_time_ms=0.0,
+                enhanced_query=enhanced_query
+            )
+        )
+
+    def _get_contents(self, urls: List[str]):
+        def _contents():
+            with get_provider_limiter("exa").acquire():
+                return self.client.get_contents(urls, text=True)
+
+        try:
+            return call_with_resilience("exa", _contents, hedge=True)
+        except Exception as e:
+            logger.error(f"Exa contents fetch failed for {len(urls)} profiles: {str(e)}")
+            raise
+
+    def _fetch(self, query: str, num_results: int, category: str, contents: bool = True):
         if category not in ["linkedin profile", "company", "job offers", "pages"]:  # Align with app categories
             logger.warning(f"Unsupported category '{category}'; defaulting to 'linkedin profile'")
             category = "linkedin profile"
         
+        def _search():
+            with get_provider_limiter("exa").acquire():
+                if not contents:
+                    # --- Ids/URLs only; contents are fetched separately for uncached profiles ---
+                    return self.client.search(
+                        query,
+                        contents=False,
+                        type="auto",
+                        category=category,
+                        num_results=num_results,
+                    )
+                return self.client.search_and_contents(
+                    query=query,
+                    type="auto",  
+                    category=category,
+                    num_results=num_results,
+                    text=True, 
+                )
+
         try:
-            # --- Exa Call  ----
-            exa_response = self.client.search_and_contents(
-                query=query,
-                type="auto",  
-                category=category,
-                num_results=limit,
-                text=True, 
-            )
+            # --- Exa Call (read-only, so safe to retry and hedge) ----
+            exa_response = call_with_resilience("exa", _search, hedge=True)
             
             logger.info(f"Exa search successful: {len(exa_response.results)} results for query '{query[:50]}...'")
             
-            return SearchResponse.from_exa_response(exa_response, enhanced_query)
+            return exa_response
             
         except Exception as e:
             logger.error(f"Exa search failed for query '{query[:50]}...': {str(e)}")
             raise
 
-exa_service = ExaService()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_exa_service() -> ExaService:
+    """Return the shared ExaService, creating the client on first use."""
+    return ExaService(get_profile_cache_service() if settings.profile_cache_enabled else None)
+
+
+def __getattr__(name: str):
+    # --- Keeps `from app.services.exa_service import exa_service` working without eager construction ---
+    if name == "exa_service":
+        return get_exa_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
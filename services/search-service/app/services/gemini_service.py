@@ -1,6 +1,15 @@
-from google import genai 
 from app.core.config import settings 
+from app.core.lazy import lazy_import
+from app.core.limiter import get_provider_limiter
+from app.core.resilience import call_with_resilience
+from functools import lru_cache
 from typing import Optional 
+import logging
+
+logger = logging.getLogger(__name__)
+
+# --- The Gemini SDK is imported when the client is first built ---
+genai = lazy_import("google.genai")
 
 class GeminiService:
     """
@@ -36,15 +45,31 @@ class GeminiService:
         Make it semantic, add relevant filters (e.g., location, founded date, stage), 
         and ensure it's optimized for neural search. Output only the refined query string.
         """
+        def _generate():
+            with get_provider_limiter("gemini").acquire():
+                return self.client.models.generate_content(
+                    model = 'gemini-2.5-flash-lite' , # --- A Lightweight model ---
+                    contents = prompt
+                )
+
         try:
-            # --- API Call ----
-            response = self.client.models.generate_content(
-                model = 'gemini-2.5-flash-lite' , # --- A Lightweight model ---
-                contents = prompt
-            )
+            # --- API Call (one retry at most: enhancement is optional, so failures fall back to the original query) ----
+            response = call_with_resilience("gemini", _generate, max_attempts=2)
             enhanced = response.text.strip() if response and response.text else ""
             return enhanced if enhanced else original_query
         except Exception as e:
-            print(f"Gemini enhancement failed: {e}")
+            logger.warning(f"Gemini enhancement failed: {e}")
             return original_query
-gemini_service = GeminiService()
\ No newline at end of file
+
+
+@lru_cache(maxsize=1)
+def get_gemini_service() -> GeminiService:
+    """Return the shared GeminiService, creating the client on first use."""
+    return GeminiService()
+
+
+def __getattr__(name: str):
+    # --- Keeps `from app.services.gemini_service import gemini_service` working without eager construction ---
+    if name == "gemini_service":
+        return get_gemini_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,270 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.lazy import lazy_import
+from app.core.limiter import ProviderOverloadedError
+from app.core.metrics import metrics
+from app.models.search import SearchCategory, SearchRequest, SearchResponse
+from app.services.query_cache import SemanticQueryCache, get_query_cache
+from app.services.search_pipeline import SearchPipeline, get_search_pipeline
+
+logger = logging.getLogger(__name__)
+
+pymongo = lazy_import("pymongo")
+
+
+def popular_queries_pipeline(since: datetime, top: int, min_users: int) -> List[Dict[str, Any]]:
+    """
+    Aggregation over user_searches: the most searched canonical queries since `since`.
+
+    History keeps one document per user and query, so the count is the number of users.
+    """
+    return [
+        {"$match": {"timestamp": {"$gte": since}, "category": {"$in": [c.value for c in SearchCategory]}}},
+        {"$sort": {"timestamp": -1}},
+        {"$group": {
+            "_id": {"query": {"$toLower": {"$trim": {"input": "$query"}}}, "category": "$category"},
+            "query": {"$first": "$query"},
+            "users": {"$sum": 1},
+            "last_searched": {"$first": "$timestamp"}
+        }},
+        {"$match": {"users": {"$gte": min_users}}},
+        {"$sort": {"users": -1, "last_searched": -1}},
+        {"$limit": top},
+        {"$project": {"_id": 0, "query": 1, "category": "$_id.category", "users": 1}}
+    ]
+
+
+class PrewarmService:
+    """
+    Pre-warms the query cache with the most popular recent queries.
+
+    Each run, one process (holder of a lease in `prewarm_runs`) aggregates the top queries from
+    `user_searches`, re-runs enhancement and the Exa search for them within a call budget and
+    stores the results in `prewarmed_searches`. Every worker then loads those results into its
+    SemanticQueryCache, so after a deploy or cache expiry the first users of popular queries
+    do not pay cold Gemini and Exa latency.
+
+    Progress and coverage (share of recent searches whose query is warm) are exported as
+    prewarm_* metrics.
+    """
+
+    def __init__(
+        self,
+        pipeline: Optional[SearchPipeline] = None,
+        query_cache: Optional[SemanticQueryCache] = None,
+        db_name: str = "networkai_search"
+    ):
+        self._pipeline = pipeline
+        self._query_cache = query_cache
+        self.db_name = db_name
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._db = None
+        self._indexes_ready = False
+        self._loaded: Dict[str, datetime] = {}
+
+    @property
+    def pipeline(self) -> SearchPipeline:
+        # --- Resolved on first run, so creating indexes does not build the Exa/Gemini clients ---
+        if self._pipeline is None:
+            self._pipeline = get_search_pipeline()
+        return self._pipeline
+
+    @property
+    def query_cache(self) -> SemanticQueryCache:
+        if self._query_cache is None:
+            self._query_cache = get_query_cache()
+        return self._query_cache
+
+    @property
+    def db(self):
+        if self._db is None:
+            self._db = get_database(self.db_name)
+        return self._db
+
+    @property
+    def user_searches(self):
+        return self.db["user_searches"]
+
+    @property
+    def prewarmed(self):
+        return self.db["prewarmed_searches"]
+
+    @property
+    def runs(self):
+        return self.db["prewarm_runs"]
+
+    def ensure_indexes(self) -> None:
+        """
+        Create the TTL index that expires warmed results. Idempotent.
+
+        Raises:
+            ConnectionError: If MongoDB is unreachable.
+            PyMongoError: If index creation fails.
+        """
+        if self._indexes_ready:
+            return
+        try:
+            self.prewarmed.create_index(
+                [("expires_at", 1)],
+                expireAfterSeconds=0,
+                name="ttl_idx"
+            )
+            self._indexes_ready = True
+        except pymongo.errors.PyMongoError as e:
+            logger.error(f"Failed to create pre-warm indexes: {e}")
+            raise
+
+    def popular_queries(self) -> List[Dict[str, Any]]:
+        """Top recent queries as {"query", "category", "users"}, most popular first."""
+        since = datetime.utcnow() - timedelta(days=settings.prewarm_window_days)
+        return list(self.user_searches.aggregate(
+            popular_queries_pipeline(since, settings.prewarm_top_queries, settings.prewarm_min_users)
+        ))
+
+    def recent_search_count(self) -> int:
+        since = datetime.utcnow() - timedelta(days=settings.prewarm_window_days)
+        return self.user_searches.count_documents({"timestamp": {"$gte": since}})
+
+    def acquire_lease(self) -> bool:
+        """
+        Claim this interval's run. The lease is not released, so exactly one process per
+        interval (across workers and replicas) refreshes the popular queries.
+        """
+        now = datetime.utcnow()
+        try:
+            lease = self.runs.find_one_and_update(
+                {"_id": "lease", "expires_at": {"$lt": now}},
+                {"$set": {
+                    "owner": self.owner,
+                    "acquired_at": now,
+                    "expires_at": now + timedelta(seconds=settings.prewarm_interval_seconds * 0.9)
+                }},
+                upsert=True,
+                return_document=pymongo.ReturnDocument.AFTER
+            )
+        except pymongo.errors.DuplicateKeyError:
+            # --- Lease held by another process: the upsert collided with the existing document ---
+            return False
+        return lease is not None and lease.get("owner") == self.owner
+
+    async def refresh(self) -> Dict[str, Any]:
+        """
+        Re-run the popular queries within the call budget and store their results.
+
+        Returns:
+            Dict[str, Any]: Run summary (queries, warmed, failed, coverage_pct).
+        """
+        started = time.monotonic()
+        popular = await asyncio.to_thread(self.popular_queries)
+        total_searches = await asyncio.to_thread(self.recent_search_count)
+        budget = min(len(popular), settings.prewarm_max_searches)
+        metrics.set_gauge("prewarm_queries", len(popular))
+
+        warmed, failed, warmed_users = 0, 0, 0
+        for position, item in enumerate(popular[:budget], start=1):
+            if position > 1 and settings.prewarm_search_spacing_ms:
+                await asyncio.sleep(settings.prewarm_search_spacing_ms / 1000)
+            metrics.set_gauge("prewarm_progress_pct", round(100 * (position - 1) / budget, 1))
+            try:
+                await self._warm(item)
+            except ProviderOverloadedError:
+                # --- Users come first: stop spending quota when the provider is saturated ---
+                logger.warning(f"Pre-warm stopped at {position}/{budget}: provider overloaded")
+                failed += budget - position + 1
+                break
+            except Exception as e:
+                failed += 1
+                logger.warning(f"Pre-warm of {item['query'][:50]!r} failed: {e}")
+                continue
+            warmed += 1
+            warmed_users += item["users"]
+            logger.info(f"Pre-warm {position}/{budget}: {item['query'][:50]!r} ({item['users']} users)")
+
+        metrics.set_gauge("prewarm_progress_pct", 100.0)
+        summary = {
+            "queries": len(popular),
+            "warmed": warmed,
+            "failed": failed,
+            "coverage_pct": round(100 * warmed_users / total_searches, 1) if total_searches else 0.0,
+            "elapsed_s": round(time.monotonic() - started, 1)
+        }
+        metrics.increment("prewarm_searches_total", warmed, result="ok")
+        metrics.increment("prewarm_searches_total", failed, result="failed")
+        metrics.set_gauge("prewarm_coverage_pct", summary["coverage_pct"])
+        logger.info(f"Pre-warm run finished: {summary}")
+        return summary
+
+    async def _warm(self, item: Dict[str, Any]) -> None:
+        request = SearchRequest(query=item["query"], category=item["category"], limit=settings.prewarm_limit)
+        response, remaining, query = await self.pipeline.warm(request)
+        now = datetime.utcnow()
+        doc = {
+            "query": request.query,
+            "enhanced_query": query,
+            "category": request.category.value,
+            "limit": request.limit,
+            "users": item["users"],
+            "response": response.model_dump(mode="json"),
+            "remaining": remaining,
+            "refreshed_at": now,
+            # --- Valid until the next run has certainly replaced it ---
+            "expires_at": now + timedelta(seconds=settings.prewarm_interval_seconds * 2)
+        }
+        await asyncio.to_thread(
+            self.prewarmed.replace_one,
+            {"_id": f"{request.category.value}|{request.limit}|{request.query.strip().lower()}"},
+            doc,
+            upsert=True
+        )
+
+    def load(self) -> int:
+        """
+        Load warmed results this worker has not seen yet into its query cache.
+
+        Returns:
+            int: Number of searches loaded.
+        """
+        now = datetime.utcnow()
+        loaded = 0
+        for doc in self.prewarmed.find({"expires_at": {"$gt": now}}):
+            if self._loaded.get(doc["_id"]) == doc["refreshed_at"]:
+                continue
+            # --- Warmed results go stale like any other cache entry: query_cache_ttl_seconds after Exa returned them ---
+            fresh_until = min(doc["expires_at"], doc["refreshed_at"] + timedelta(seconds=settings.query_cache_ttl_seconds))
+            ttl_seconds = (fresh_until - now).total_seconds()
+            if ttl_seconds <= 0:
+                continue
+            self.query_cache.store(
+                doc["category"],
+                [doc["query"], doc["enhanced_query"]],
+                SearchResponse.model_validate(doc["response"]),
+                doc.get("remaining", []),
+                doc["limit"],
+                ttl_seconds=ttl_seconds
+            )
+            self._loaded[doc["_id"]] = doc["refreshed_at"]
+            loaded += 1
+        metrics.set_gauge("prewarm_loaded_searches", len(self._loaded))
+        return loaded
+
+    async def run_once(self) -> Optional[Dict[str, Any]]:
+        """Refresh popular queries if this process wins the lease, then load the warmed results."""
+        summary = None
+        if await asyncio.to_thread(self.acquire_lease):
+            summary = await self.refresh()
+        await asyncio.to_thread(self.load)
+        return summary
+
+
+@lru_cache(maxsize=1)
+def get_prewarm_service() -> PrewarmService:
+    """Return the shared PrewarmService (no MongoDB I/O until first use)."""
+    return PrewarmService()
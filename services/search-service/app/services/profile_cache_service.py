@@ -0,0 +1,189 @@
+import hashlib
+import logging
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Tuple
+from urllib.parse import urlsplit
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.lazy import lazy_import
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+pymongo = lazy_import("pymongo")
+
+
+def canonical_profile_url(url: str) -> str:
+    """
+    Key a profile by host + path so the variants Exa returns collapse to one entry.
+
+    "https://uk.linkedin.com/in/Jane-Doe/?trk=x" and "linkedin.com/in/jane-doe" both map to
+    "linkedin.com/in/jane-doe" (scheme, query, fragment, trailing slash, www and LinkedIn
+    country subdomains are dropped; the result is lowercased).
+    """
+    url = (url or "").strip().lower()
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    host = parts.netloc.rsplit("@", 1)[-1].split(":", 1)[0]
+    if host.endswith(".linkedin.com"):
+        host = "linkedin.com"
+    elif host.startswith("www."):
+        host = host[4:]
+    return f"{host}{parts.path.rstrip('/')}"
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+class ProfileCacheService:
+    """
+    Profile-level entity cache shared by all searches.
+
+    Different queries keep returning the same people; each profile is stored once in
+    `profile_entities` under its canonical URL with its raw Exa result, a hash of the raw text
+    and the parsed PersonResult fields. Searches reuse the parsed fields when the text is
+    unchanged, and once most results are already cached ExaService lists ids first and
+    fetches contents only for the misses.
+
+    The cache is an optimization only: after a MongoDB error it is bypassed for
+    `profile_cache_retry_after_seconds` instead of slowing every search down.
+    """
+
+    def __init__(self, db_name: str = "networkai_search"):
+        self.db_name = db_name
+        self._db = None
+        self._indexes_ready = False
+        self._disabled_until = 0.0
+
+    @property
+    def db(self):
+        if self._db is None:
+            self._db = get_database(self.db_name)
+        return self._db
+
+    @property
+    def profiles(self):
+        return self.db["profile_entities"]
+
+    def ensure_indexes(self) -> None:
+        """
+        Create the TTL index that expires cached profiles and the write-time index. Idempotent.
+
+        Raises:
+            ConnectionError: If MongoDB is unreachable.
+            PyMongoError: If index creation fails.
+        """
+        if self._indexes_ready:
+            return
+        try:
+            self.profiles.create_index(
+                [("expires_at", 1)],
+                expireAfterSeconds=0,
+                name="ttl_idx"
+            )
+            # --- Incremental profile index builds read by write time ---
+            self.profiles.create_index([("updated_at", 1)], name="updated_at_idx")
+            self._indexes_ready = True
+        except pymongo.errors.PyMongoError as e:
+            logger.error(f"Failed to create profile cache indexes: {e}")
+            raise
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._disabled_until
+
+    def get_many(self, urls: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up cached profiles in one query.
+
+        Args:
+            urls: Profile URLs in any form Exa returns.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Canonical URL -> {"raw", "fields", "content_hash"} for the
+            unexpired hits (empty while the cache is bypassed or on error).
+        """
+        keys = list({canonical_profile_url(url) for url in urls if url})
+        if not keys or not self.available:
+            return {}
+        try:
+            cursor = self.profiles.find(
+                {"_id": {"$in": keys}, "expires_at": {"$gt": datetime.utcnow()}},
+                projection={"raw": 1, "fields": 1, "content_hash": 1}
+            )
+            hits = {doc["_id"]: doc for doc in cursor}
+        except Exception as e:
+            self._trip("read", e)
+            return {}
+        metrics.increment("profile_cache_lookups_total", len(hits), result="hit")
+        metrics.increment("profile_cache_lookups_total", len(keys) - len(hits), result="miss")
+        return hits
+
+    def put_many(self, entries: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> None:
+        """
+        Upsert parsed profiles (one bulk write).
+
+        Args:
+            entries: (raw result from PersonResultParser.to_raw_dict, extracted fields) pairs.
+        """
+        if not entries or not self.available:
+            return
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=settings.profile_cache_ttl_seconds)
+        operations = [
+            pymongo.ReplaceOne(
+                {"_id": canonical_profile_url(raw["url"])},
+                {
+                    "exa_id": raw.get("id"),
+                    "raw": raw,
+                    "fields": fields,
+                    "content_hash": content_hash(raw.get("text")),
+                    "updated_at": now,
+                    "expires_at": expires_at
+                },
+                upsert=True
+            )
+            for raw, fields in entries
+            if raw.get("url")
+        ]
+        if not operations:
+            return
+        try:
+            self.profiles.bulk_write(operations, ordered=False)
+            metrics.increment("profile_cache_writes_total", len(operations))
+        except Exception as e:
+            self._trip("write", e)
+
+    def updated_since(self, since: datetime, limit: int) -> List[Dict[str, Any]]:
+        """
+        Parsed profiles written after `since`, oldest first (for incremental index builds).
+
+        Returns:
+            List[Dict[str, Any]]: Documents with "_id" (canonical URL), "fields" and "updated_at".
+
+        Raises:
+            PyMongoError: On connection/read failures.
+        """
+        cursor = self.profiles.find(
+            {"updated_at": {"$gt": since}, "expires_at": {"$gt": datetime.utcnow()}},
+            projection={"fields": 1, "updated_at": 1},
+            sort=[("updated_at", 1)],
+            limit=limit
+        )
+        return list(cursor)
+
+    def _trip(self, operation: str, error: Exception) -> None:
+        self._disabled_until = time.monotonic() + settings.profile_cache_retry_after_seconds
+        metrics.increment("profile_cache_errors_total", operation=operation)
+        logger.warning(
+            f"Profile cache {operation} failed; bypassing it for "
+            f"{settings.profile_cache_retry_after_seconds:.0f}s: {error}"
+        )
+
+
+@lru_cache(maxsize=1)
+def get_profile_cache_service() -> ProfileCacheService:
+    """Return the shared ProfileCacheService (no MongoDB I/O until first use)."""
+    return ProfileCacheService()
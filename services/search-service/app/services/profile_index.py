@@ -0,0 +1,273 @@
+import json
+import logging
+import math
+import mmap
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from app.core.config import settings
+from app.core.embeddings import embed, query_terms, tokenize
+from app.core.lazy import lazy_import
+from app.core.metrics import metrics
+from app.models.parsers import PersonResultParser
+from app.models.search import PersonResult
+from app.services.profile_cache_service import ProfileCacheService, get_profile_cache_service
+
+try:
+    import fcntl
+except ImportError:  # --- Windows: each worker builds its own snapshot ---
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+np = lazy_import("numpy")
+
+MANIFEST = "manifest.json"
+
+
+def _epoch(value: datetime) -> float:
+    # --- MongoDB returns naive UTC datetimes ---
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def profile_text(fields: Dict[str, Any]) -> str:
+    """Text a profile is embedded from (everything a refinement query might mention)."""
+    parts = [fields.get("title"), fields.get("author"), fields.get("location"), fields.get("summary")]
+    parts.extend(fields.get("skills") or [])
+    for item in fields.get("work_experience") or []:
+        parts.extend([item.get("title"), item.get("company")])
+    for item in fields.get("education") or []:
+        parts.extend([item.get("institution"), item.get("degree"), item.get("field_of_study")])
+    return " ".join(part for part in parts if part)
+
+
+def profile_terms(fields: Dict[str, Any]) -> set:
+    """Terms a profile is filterable by: title, location, skills, work history and education."""
+    parts = [fields.get("title"), fields.get("location")]
+    parts.extend(fields.get("skills") or [])
+    for item in fields.get("work_experience") or []:
+        parts.extend([item.get("title"), item.get("company")])
+    for item in fields.get("education") or []:
+        parts.extend([item.get("institution"), item.get("degree"), item.get("field_of_study")])
+    return set(tokenize(" ".join(part for part in parts if part)))
+
+
+class _Snapshot:
+    """One immutable index version, memory-mapped from disk."""
+
+    def __init__(self, path: Path, version: int):
+        self.version = version
+        # --- open_memmap == np.load(mmap_mode="r"); the lazy numpy proxy has its own load() ---
+        self.vectors = np.lib.format.open_memmap(path / "vectors.npy", mode="r")
+        self.offsets = np.lib.format.open_memmap(path / "offsets.npy", mode="r")
+        self.postings = np.lib.format.open_memmap(path / "postings.npy", mode="r")
+        self.terms = json.loads((path / "terms.json").read_text())
+        self.count, self.dim = self.vectors.shape
+        with open(path / "profiles.jsonl", "rb") as f:
+            self._profiles = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.count else b""
+
+    def rows_for(self, term: str) -> Optional["np.ndarray"]:
+        span = self.terms.get(term)
+        return self.postings[span[0]:span[0] + span[1]] if span else None
+
+    def row(self, index: int) -> Dict[str, Any]:
+        return json.loads(self._profiles[int(self.offsets[index]):int(self.offsets[index + 1])])
+
+
+class ProfileIndex:
+    """
+    Local index over the parsed profiles in the profile cache, for "local_first" searches.
+
+    Each snapshot (a versioned directory under `profile_index_dir`) holds an L2-normalized
+    hashed-embedding matrix for cosine ranking, an inverted index over titles, skills,
+    companies, locations and education for term filtering, and the parsed fields. Files are
+    opened with mmap, so every worker on the host shares one copy through the page cache.
+
+    refresh() folds profiles written since the last build into a new snapshot (only new or
+    changed profiles are embedded). One process builds under a file lock; the others just
+    switch to the new version.
+    """
+
+    def __init__(self, directory: str, profile_cache: ProfileCacheService, dim: int = 512):
+        self.directory = Path(directory)
+        self.profile_cache = profile_cache
+        self.dim = dim
+        self._snapshot: Optional[_Snapshot] = None
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._snapshot.count if self._snapshot is not None else 0
+
+    def refresh(self, build: bool = True) -> bool:
+        """
+        Build a new snapshot if this process holds the build lock, then load the newest one.
+        With build=False only the newest snapshot on disk is loaded (no MongoDB I/O).
+
+        Returns:
+            bool: True if a new snapshot was loaded.
+
+        Raises:
+            PyMongoError: If new profiles cannot be read (the current snapshot stays loaded).
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._refresh_lock:
+            if build:
+                with self._build_lock() as acquired:
+                    if acquired:
+                        self._build()
+            return self._load()
+
+    def search(self, query: str, limit: int) -> Optional[List[PersonResult]]:
+        """
+        Answer a query from the index.
+
+        Profiles must contain at least `profile_index_min_coverage` of the query terms and are
+        ranked by cosine similarity to the query.
+
+        Returns:
+            Optional[List[PersonResult]]: `limit` results, or None when fewer profiles match
+            (the caller falls back to Exa).
+        """
+        snapshot = self._snapshot
+        terms = query_terms(query)
+        if snapshot is None or snapshot.count == 0 or not terms:
+            return None
+
+        counts = np.zeros(snapshot.count, dtype=np.int32)
+        for term in terms:
+            rows = snapshot.rows_for(term)
+            if rows is not None:
+                counts[rows] += 1
+        candidates = np.flatnonzero(counts >= math.ceil(settings.profile_index_min_coverage * len(terms)))
+        if len(candidates) < limit:
+            return None
+
+        scores = snapshot.vectors[candidates] @ embed([query], snapshot.dim)[0]
+        top = candidates[np.argsort(-scores, kind="stable")[:limit]]
+        return PersonResultParser.validate_fields([snapshot.row(row)["fields"] for row in top])
+
+    @contextmanager
+    def _build_lock(self) -> Iterator[bool]:
+        if fcntl is None:
+            yield True
+            return
+        with open(self.directory / ".build.lock", "w") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads((self.directory / MANIFEST).read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _build(self) -> None:
+        started = time.perf_counter()
+        current = self._read_manifest()
+        # --- A dimension change re-embeds everything ---
+        manifest = current if current is not None and current["dim"] == self.dim else None
+        watermark = datetime.utcfromtimestamp(manifest["watermark"]) if manifest else datetime(1970, 1, 1)
+        docs = self.profile_cache.updated_since(watermark, settings.profile_index_max_profiles)
+        if len(docs) == settings.profile_index_max_profiles:
+            # --- Profiles sharing the last timestamp may be cut off; take them next time ---
+            docs = [doc for doc in docs if doc["updated_at"] < docs[-1]["updated_at"]] or docs
+        if not docs and manifest is not None:
+            return
+
+        # --- Existing rows keep their vectors; new or changed profiles move to the end ---
+        rows: Dict[str, Dict[str, Any]] = {}
+        vectors: Dict[str, Any] = {}
+        if manifest is not None:
+            previous = _Snapshot(self.directory / f"v{manifest['version']}", manifest["version"])
+            for index in range(previous.count):
+                row = previous.row(index)
+                rows[row["key"]] = row
+                vectors[row["key"]] = previous.vectors[index]
+        for doc in docs:
+            rows.pop(doc["_id"], None)
+            vectors.pop(doc["_id"], None)
+            rows[doc["_id"]] = {"key": doc["_id"], "updated_at": _epoch(doc["updated_at"]), "fields": doc["fields"]}
+
+        oldest = _epoch(datetime.utcnow() - timedelta(seconds=settings.profile_cache_ttl_seconds))
+        kept = [row for row in rows.values() if row["updated_at"] > oldest][-settings.profile_index_max_profiles:]
+        fresh = [row for row in kept if row["key"] not in vectors]
+        embedded = dict(zip((row["key"] for row in fresh), embed([profile_text(row["fields"]) for row in fresh], self.dim)))
+
+        version = (current["version"] + 1) if current else 1
+        self._write(version, kept, [vectors.get(row["key"], embedded.get(row["key"])) for row in kept])
+        (self.directory / f"{MANIFEST}.tmp").write_text(json.dumps({
+            "version": version,
+            "count": len(kept),
+            "dim": self.dim,
+            "watermark": _epoch(docs[-1]["updated_at"]) if docs else _epoch(watermark)
+        }))
+        os.replace(self.directory / f"{MANIFEST}.tmp", self.directory / MANIFEST)
+        self._prune(keep={version, version - 1})
+
+        metrics.observe("profile_index_build_ms", (time.perf_counter() - started) * 1000)
+        logger.info(f"Profile index v{version}: {len(kept)} profiles ({len(fresh)} embedded)")
+
+    def _write(self, version: int, rows: List[Dict[str, Any]], vectors: List[Any]) -> None:
+        staging = self.directory / f"v{version}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir()
+
+        offsets = [0]
+        postings: Dict[str, List[int]] = {}
+        with open(staging / "profiles.jsonl", "wb") as f:
+            for index, row in enumerate(rows):
+                line = json.dumps(row, separators=(",", ":")).encode("utf-8") + b"\n"
+                f.write(line)
+                offsets.append(offsets[-1] + len(line))
+                for term in profile_terms(row["fields"]):
+                    postings.setdefault(term, []).append(index)
+
+        terms, flat = {}, []
+        for term, term_rows in postings.items():
+            terms[term] = [len(flat), len(term_rows)]
+            flat.extend(term_rows)
+        matrix = np.stack(vectors).astype(np.float32) if vectors else np.zeros((0, self.dim), dtype=np.float32)
+        np.save(staging / "vectors.npy", matrix)
+        np.save(staging / "offsets.npy", np.asarray(offsets, dtype=np.int64))
+        np.save(staging / "postings.npy", np.asarray(flat, dtype=np.int32))
+        (staging / "terms.json").write_text(json.dumps(terms))
+        shutil.rmtree(self.directory / f"v{version}", ignore_errors=True)
+        os.replace(staging, self.directory / f"v{version}")
+
+    def _prune(self, keep: set) -> None:
+        # --- The previous version stays for workers that have not switched yet ---
+        for path in self.directory.glob("v*"):
+            name = path.name.split(".")[0][1:]
+            if path.is_dir() and name.isdigit() and int(name) not in keep:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _load(self) -> bool:
+        manifest = self._read_manifest()
+        if manifest is None or (self._snapshot is not None and self._snapshot.version == manifest["version"]):
+            return False
+        try:
+            self._snapshot = _Snapshot(self.directory / f"v{manifest['version']}", manifest["version"])
+        except FileNotFoundError:
+            return False
+        metrics.set_gauge("profile_index_profiles", self._snapshot.count)
+        return True
+
+
+@lru_cache(maxsize=1)
+def get_profile_index() -> ProfileIndex:
+    """Return the shared ProfileIndex (nothing is read until the first refresh)."""
+    return ProfileIndex(settings.profile_index_dir, get_profile_cache_service(), settings.profile_index_dim)
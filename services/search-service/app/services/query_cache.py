@@ -0,0 +1,176 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from app.core.config import settings
+from app.core.embeddings import embed, query_terms
+from app.core.lazy import lazy_import
+from app.core.metrics import metrics
+from app.models.parsers import PersonResultParser
+from app.models.search import PersonResult, SearchResponse
+from app.services.result_filters import ResultFeatures
+
+logger = logging.getLogger(__name__)
+
+np = lazy_import("numpy")
+
+# --- Descriptors query enhancement sprinkles in that do not narrow who matches; the only terms
+# two queries may differ in and still share results (the cosine threshold bounds how many) ---
+SOFT_TERMS = frozenset(
+    "experienced skilled talented seasoned expert professional proven strong solid deep passionate "
+    "motivated qualified proficient relevant hand candidate talent experience expertise background "
+    "skill knowledge currently current".split()
+)
+
+
+@dataclass
+class CachedSearch:
+    """A stored search: the first page and the raw window tail (for "load more")."""
+    query: str
+    limit: int
+    response: SearchResponse
+    remaining: List[Dict[str, Any]]
+    _refinable: Optional[Tuple[List[PersonResult], ResultFeatures]] = field(default=None, repr=False)
+
+    def refinable(self) -> Tuple[List[PersonResult], ResultFeatures]:
+        """The page plus the parsed window tail and their term masks, built on the first refinement."""
+        if self._refinable is None:
+            candidates = list(self.response.results) + PersonResultParser.parse_results(self.remaining)
+            self._refinable = (candidates, ResultFeatures(candidates))
+        return self._refinable
+
+
+class _CategoryCache:
+    """Fixed-size ring of query embeddings (one float32 row per query), their term sets and results."""
+
+    def __init__(self, capacity: int, dim: int):
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.terms: List[FrozenSet[str]] = [frozenset()] * capacity
+        self.expires_at = np.zeros(capacity, dtype=np.float64)
+        self.limits = np.zeros(capacity, dtype=np.int32)
+        self.entries: List[Optional[CachedSearch]] = [None] * capacity
+        self.next_slot = 0
+
+
+class SemanticQueryCache:
+    """
+    Per-worker cache of recent search results, matched by query meaning instead of exact text.
+
+    Queries are embedded on the CPU (unigram feature hashing with role synonyms folded, so word
+    order and "devs"/"engineers" do not matter) into a compact float32 matrix per category. A
+    lookup is one matrix-vector product; an unexpired entry with the same page size is a hit if
+    its cosine similarity reaches `query_cache_threshold` and the two queries differ only in
+    SOFT_TERMS ("experienced", "strong", ...). Cosine alone is not enough: in a 20-term
+    Gemini-enhanced query, swapping "Berlin" for "Munich" or "Senior" for "Junior" still scores
+    above 0.9, so any other differing term (a city, seniority, role or skill) vetoes a hit. The
+    threshold decides how much soft wording may differ relative to the query's length.
+
+    Hit rate is exported as query_cache_lookups_total / query_cache_hit_ratio. SearchPipeline
+    re-runs a sampled share of hits against Exa and evicts entries that prove to be false hits.
+    """
+
+    def __init__(self, capacity: int = 256, dim: int = 512, threshold: float = 0.9, ttl_seconds: float = 600):
+        self.capacity = capacity
+        self.dim = dim
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self._categories: Dict[str, _CategoryCache] = {}
+        self._lock = threading.Lock()
+        self._lookups = 0
+        self._hits = 0
+
+    def _embed(self, query: str) -> "np.ndarray":
+        return embed([query], self.dim, bigrams=False)[0]
+
+    def lookup(self, category: str, limit: int, query: str, stage: str = "original") -> Optional[Tuple[CachedSearch, float]]:
+        """
+        Find a cached search for a near-duplicate query.
+
+        Returns:
+            Optional[Tuple[CachedSearch, float]]: The entry and its similarity, or None.
+        """
+        vector = self._embed(query)
+        terms = frozenset(query_terms(query))
+        hit = None
+        with self._lock:
+            cache = self._categories.get(category)
+            if cache is not None and vector.any():
+                scores = cache.vectors @ vector
+                scores[(cache.expires_at < time.monotonic()) | (cache.limits != limit)] = -1.0
+                candidates = np.flatnonzero(scores >= self.threshold)
+                for slot in candidates[np.argsort(-scores[candidates], kind="stable")]:
+                    # --- A different city, seniority, role or skill is a different search ---
+                    if not (cache.terms[slot] ^ terms) - SOFT_TERMS:
+                        hit = (cache.entries[slot], float(scores[slot]))
+                        break
+            self._lookups += 1
+            self._hits += hit is not None
+            ratio = self._hits / self._lookups
+        metrics.increment("query_cache_lookups_total", result="hit" if hit else "miss", stage=stage)
+        metrics.set_gauge("query_cache_hit_ratio", round(ratio, 3))
+        return hit
+
+    def store(
+        self,
+        category: str,
+        queries: List[str],
+        response: SearchResponse,
+        remaining: List[Dict[str, Any]],
+        limit: int,
+        ttl_seconds: Optional[float] = None
+    ) -> None:
+        """Cache a search under each of its query strings (e.g. original and enhanced)."""
+        entry = CachedSearch(
+            query=queries[0],
+            limit=limit,
+            response=response.model_copy(deep=True),
+            remaining=remaining
+        )
+        # --- The cursor belongs to the user who ran the search; hits store their own window ---
+        entry.response.metadata.next_cursor = None
+        vectors = [(self._embed(query), frozenset(query_terms(query))) for query in dict.fromkeys(queries)]
+        with self._lock:
+            cache = self._categories.get(category)
+            if cache is None:
+                cache = self._categories[category] = _CategoryCache(self.capacity, self.dim)
+            for vector, terms in vectors:
+                if not vector.any():
+                    continue
+                slot = cache.next_slot
+                cache.vectors[slot] = vector
+                cache.terms[slot] = terms
+                cache.expires_at[slot] = time.monotonic() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+                cache.limits[slot] = limit
+                cache.entries[slot] = entry
+                cache.next_slot = (slot + 1) % self.capacity
+
+    def evict(self, category: str, entry: CachedSearch) -> None:
+        with self._lock:
+            cache = self._categories.get(category)
+            if cache is None:
+                return
+            for slot, cached in enumerate(cache.entries):
+                if cached is entry:
+                    cache.entries[slot] = None
+                    cache.expires_at[slot] = 0.0
+
+    @staticmethod
+    def overlap(cached: SearchResponse, fresh: SearchResponse) -> float:
+        """Share of the fresh results that the cached page also returned."""
+        fresh_ids = {result.id for result in fresh.results}
+        if not fresh_ids:
+            return 1.0
+        return len(fresh_ids & {result.id for result in cached.results}) / len(fresh_ids)
+
+
+@lru_cache(maxsize=1)
+def get_query_cache() -> SemanticQueryCache:
+    """Return this worker's SemanticQueryCache."""
+    return SemanticQueryCache(
+        capacity=settings.query_cache_capacity,
+        dim=settings.query_cache_dim,
+        threshold=settings.query_cache_threshold,
+        ttl_seconds=settings.query_cache_ttl_seconds
+    )
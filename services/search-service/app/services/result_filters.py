@@ -0,0 +1,81 @@
+from typing import Dict, List
+from app.core.embeddings import tokenize
+from app.core.lazy import lazy_import
+from app.models.search import PersonResult, SearchFilters
+
+np = lazy_import("numpy")
+
+# --- Exa's order breaks ties, and only ties: it never outweighs a matched criterion ---
+_RANK_PRIOR = 1e-3
+
+
+class ResultFeatures:
+    """
+    Term masks for a result set, built once and reused by every refinement of it.
+
+    For each field (skills, location, companies, titles) a term maps to a boolean array over the
+    results, so a filter phrase is the AND of its terms' masks and scoring a whole result set is
+    a handful of vectorized array operations.
+    """
+
+    FIELDS = ("skills", "location", "companies", "titles")
+
+    def __init__(self, results: List[PersonResult]):
+        self.count = len(results)
+        self._masks: Dict[str, Dict[str, "np.ndarray"]] = {field: {} for field in self.FIELDS}
+        for row, result in enumerate(results):
+            texts = {
+                "skills": " ".join(result.skills),
+                "location": result.location or "",
+                "companies": " ".join(item.company or "" for item in result.work_experience),
+                "titles": " ".join([result.title or ""] + [item.title or "" for item in result.work_experience]),
+            }
+            for field, text in texts.items():
+                masks = self._masks[field]
+                for term in set(tokenize(text)):
+                    if term not in masks:
+                        masks[term] = np.zeros(self.count, dtype=bool)
+                    masks[term][row] = True
+
+    def matches(self, field: str, phrase: str) -> "np.ndarray":
+        """Results whose `field` contains every term of `phrase`."""
+        mask = np.ones(self.count, dtype=bool)
+        terms = tokenize(phrase)
+        empty = np.zeros(self.count, dtype=bool)
+        for term in terms:
+            mask &= self._masks[field].get(term, empty)
+        return mask if terms else empty
+
+    def rank(self, filters: SearchFilters) -> "np.ndarray":
+        """
+        Order results by how well they satisfy `filters` (Exa order breaks ties).
+
+        Each given criterion adds up to 1 to a result's score: the share of required skills
+        present, 1 for a location match, 1 for any listed company, and the share of title
+        keywords found. With `strict`, results missing any criterion are dropped.
+
+        Returns:
+            np.ndarray: Indices into the result set, best first.
+        """
+        score = np.zeros(self.count, dtype=np.float64)
+        keep = np.ones(self.count, dtype=bool)
+        if filters.skills:
+            matched = np.sum([self.matches("skills", skill) for skill in filters.skills], axis=0)
+            score += matched / len(filters.skills)
+            keep &= matched == len(filters.skills)
+        if filters.location:
+            located = self.matches("location", filters.location)
+            score += located
+            keep &= located
+        if filters.companies:
+            employed = np.any([self.matches("companies", company) for company in filters.companies], axis=0)
+            score += employed
+            keep &= employed
+        if filters.title_keywords:
+            matched = np.sum([self.matches("titles", keyword) for keyword in filters.title_keywords], axis=0)
+            score += matched / len(filters.title_keywords)
+            keep &= matched > 0
+
+        score -= _RANK_PRIOR * np.arange(self.count) / max(1, self.count)
+        order = np.argsort(-score, kind="stable")
+        return order[keep[order]] if filters.strict else order
@@ -0,0 +1,331 @@
+import asyncio
+import logging
+import random
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.parsers import PersonResultParser
+from app.models.search import QueryPath, SearchMetadata, SearchRequest, SearchResponse
+from app.services.continuation_service import ContinuationService, get_continuation_service
+from app.services.exa_service import ExaService, get_exa_service
+from app.services.gemini_service import GeminiService, get_gemini_service
+from app.services.profile_index import ProfileIndex, get_profile_index
+from app.services.query_cache import CachedSearch, SemanticQueryCache, get_query_cache
+from app.services.result_filters import ResultFeatures
+
+logger = logging.getLogger(__name__)
+
+
+class SearchPipeline:
+    """
+    Deadline-driven search: Gemini enhancement is raced against a share of the request's
+    latency budget and skipped if it is late, so Gemini slowness cannot stretch search latency.
+
+    The blocking SDK calls run in worker threads; a timed-out enhancement keeps running in its
+    thread until the SDK returns, but its result is discarded.
+
+    With a ContinuationService, searches fetch a larger result window and store the results
+    beyond the first page, so "load more" is served without another Exa call.
+
+    With a ProfileIndex, local_first requests are answered from previously seen profiles when
+    enough of them match, skipping enhancement and Exa entirely.
+
+    With a SemanticQueryCache, a query (or its enhanced form) that closely matches a recent
+    search reuses that search's results instead of calling Exa again.
+
+    request.filters are applied to the whole result window after any of these paths, so
+    refining a recent search is served from its cached window.
+    """
+
+    def __init__(
+        self,
+        exa: ExaService,
+        gemini: GeminiService,
+        continuations: Optional[ContinuationService] = None,
+        profile_index: Optional[ProfileIndex] = None,
+        query_cache: Optional[SemanticQueryCache] = None
+    ):
+        self.exa = exa
+        self.gemini = gemini
+        self.continuations = continuations
+        self.profile_index = profile_index
+        self.query_cache = query_cache
+        self._audits = set()
+
+    async def _search(self, request: SearchRequest, query: str) -> Tuple[SearchResponse, List[Dict[str, Any]]]:
+        """
+        Returns:
+            (first page, raw results beyond it; empty when no window is fetched)
+        """
+        enhanced_query = query if query != request.query else None
+        window = settings.continuation_window_size
+        if self.continuations is None or window <= request.limit:
+            response = await asyncio.to_thread(
+                self.exa.search_linkedin,
+                query=query,
+                limit=request.limit,
+                category=request.category.value,
+                enhanced_query=enhanced_query
+            )
+            return response, []
+        return await asyncio.to_thread(
+            self.exa.search_window,
+            query=query,
+            limit=request.limit,
+            window=window,
+            category=request.category.value,
+            enhanced_query=enhanced_query
+        )
+
+    async def _store_continuation(
+        self,
+        request: SearchRequest,
+        user_id: str,
+        response: SearchResponse,
+        remaining: List[Dict[str, Any]]
+    ) -> Optional[str]:
+        """Store the window tail; on failure or timeout the search is returned without next_cursor."""
+        try:
+            return await asyncio.wait_for(
+                asyncio.to_thread(
+                    self.continuations.save,
+                    user_id=user_id,
+                    query=request.query,
+                    category=request.category.value,
+                    enhanced_query=response.metadata.enhanced_query,
+                    raw_results=remaining
+                ),
+                timeout=settings.continuation_save_timeout_ms / 1000
+            )
+        except Exception as e:
+            metrics.increment("search_continuation_save_failed_total")
+            logger.warning(f"Could not store search continuation for user {user_id}: {e!r}")
+            return None
+
+    async def _enhance(self, request: SearchRequest, timeout: float) -> Tuple[Optional[str], float]:
+        """
+        Returns:
+            (enhanced query or None if it missed the deadline, elapsed milliseconds)
+        """
+        start = time.monotonic()
+        try:
+            enhanced = await asyncio.wait_for(
+                asyncio.to_thread(
+                    self.gemini.enhance_query, request.query, request.category.value, request.limit
+                ),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            logger.info(f"Gemini enhancement exceeded {timeout * 1000:.0f}ms; using original query")
+            enhanced = None
+        return enhanced, (time.monotonic() - start) * 1000
+
+    async def run(self, request: SearchRequest, user_id: Optional[str] = None) -> SearchResponse:
+        """
+        Execute a search within request.latency_budget_ms (or the configured default).
+        With a user_id, the rest of the result window is stored and metadata.next_cursor set.
+
+        Raises:
+            ProviderOverloadedError: If Exa cannot admit the call.
+            Exception: If the Exa search fails.
+        """
+        start = time.monotonic()
+        budget_ms = request.latency_budget_ms or settings.search_latency_budget_ms
+        enhancement_timeout = budget_ms * settings.enhancement_budget_fraction / 1000
+
+        local = await self._search_local(request)
+        entry = self._from_cache(request, request.query, stage="original") if local is None else None
+        if local is not None:
+            (response, remaining), path, enhancement_ms = (local, []), QueryPath.LOCAL_INDEX, 0.0
+        elif entry is not None:
+            (response, remaining), path, enhancement_ms = self._cached_page(entry), QueryPath.SEMANTIC_CACHE, 0.0
+        elif request.speculative:
+            (response, remaining), path, enhancement_ms = await self._run_speculative(
+                request, start, budget_ms, enhancement_timeout
+            )
+            self._cache(request, [request.query], response, remaining)
+        else:
+            enhanced, enhancement_ms = await self._enhance(request, enhancement_timeout)
+            if enhanced is None:
+                path = QueryPath.ENHANCEMENT_TIMEOUT
+            elif enhanced != request.query:
+                path = QueryPath.ENHANCED
+            else:
+                path = QueryPath.ORIGINAL
+            query = enhanced or request.query
+            # --- Different phrasings often enhance to near-identical queries ---
+            entry = self._from_cache(request, query, stage="enhanced") if query != request.query else None
+            if entry is not None:
+                (response, remaining), path = self._cached_page(entry), QueryPath.SEMANTIC_CACHE
+                response.metadata.enhanced_query = query
+            else:
+                response, remaining = await self._search(request, query)
+                self._cache(request, [request.query, query], response, remaining)
+
+        if request.filters is not None:
+            response, remaining = self._refine(request, response, remaining, entry)
+
+        if remaining and user_id is not None:
+            response.metadata.next_cursor = await self._store_continuation(request, user_id, response, remaining)
+
+        elapsed_ms = (time.monotonic() - start) * 1000
+        response.metadata.search_time_ms = round(elapsed_ms, 2)
+        response.metadata.query_path = path
+        response.metadata.enhancement_ms = round(enhancement_ms, 2)
+        metrics.increment("search_query_path_total", path=path.value)
+        metrics.observe("search_latency_ms", elapsed_ms)
+        if elapsed_ms > budget_ms:
+            metrics.increment("search_budget_exceeded_total")
+        return response
+
+    def _from_cache(
+        self,
+        request: SearchRequest,
+        query: str,
+        stage: str
+    ) -> Optional[CachedSearch]:
+        if self.query_cache is None:
+            return None
+        found = self.query_cache.lookup(request.category.value, request.limit, query, stage=stage)
+        if found is None:
+            return None
+        entry, _ = found
+        if random.random() < settings.query_cache_audit_rate:
+            task = asyncio.create_task(self._audit(request, query, entry))
+            self._audits.add(task)
+            task.add_done_callback(self._audits.discard)
+        return entry
+
+    @staticmethod
+    def _cached_page(entry: CachedSearch) -> Tuple[SearchResponse, List[Dict[str, Any]]]:
+        return entry.response.model_copy(deep=True), entry.remaining
+
+    def _refine(
+        self,
+        request: SearchRequest,
+        response: SearchResponse,
+        remaining: List[Dict[str, Any]],
+        entry: Optional[CachedSearch]
+    ) -> Tuple[SearchResponse, List[Dict[str, Any]]]:
+        """Filter and re-rank the page plus the window tail; unreturned tail matches stay pageable."""
+        if entry is not None:
+            candidates, features = entry.refinable()
+        else:
+            candidates = list(response.results) + PersonResultParser.parse_results(remaining)
+            features = ResultFeatures(candidates)
+        order = features.rank(request.filters)
+        page_size = len(response.results)
+
+        response.results = [candidates[i] for i in order[:request.limit]]
+        response.metadata.total_results = len(response.results)
+        metrics.increment("search_refined_total", cached=str(entry is not None).lower())
+        return response, [remaining[i - page_size] for i in order[request.limit:] if i >= page_size]
+
+    def _cache(
+        self,
+        request: SearchRequest,
+        queries: List[str],
+        response: SearchResponse,
+        remaining: List[Dict[str, Any]]
+    ) -> None:
+        if self.query_cache is not None:
+            self.query_cache.store(request.category.value, queries, response, remaining, request.limit)
+
+    async def _audit(self, request: SearchRequest, query: str, entry: CachedSearch) -> None:
+        """Re-run a cache hit against Exa; evict the entry if the results disagree (a false hit)."""
+        try:
+            fresh = await asyncio.to_thread(
+                self.exa.search_linkedin,
+                query=query,
+                limit=request.limit,
+                category=request.category.value
+            )
+        except Exception as e:
+            logger.info(f"Semantic cache audit skipped: {e!r}")
+            return
+        overlap = SemanticQueryCache.overlap(entry.response, fresh)
+        metrics.increment("query_cache_audits_total")
+        metrics.observe("query_cache_audit_overlap", overlap)
+        if overlap < settings.query_cache_audit_min_overlap:
+            metrics.increment("query_cache_false_hits_total")
+            logger.warning(
+                f"Semantic cache false hit: {query[:50]!r} was served results of {entry.query[:50]!r} "
+                f"({overlap:.0%} overlap); evicting"
+            )
+            self.query_cache.evict(request.category.value, entry)
+
+    async def warm(self, request: SearchRequest) -> Tuple[SearchResponse, List[Dict[str, Any]], str]:
+        """
+        Enhance and search without consulting the caches (cache pre-warming).
+
+        Returns:
+            (first page, raw window tail, query sent to Exa)
+
+        Raises:
+            ProviderOverloadedError: If Exa cannot admit the call.
+            Exception: If the Exa search fails.
+        """
+        budget_ms = request.latency_budget_ms or settings.search_latency_budget_ms
+        enhanced, _ = await self._enhance(request, budget_ms * settings.enhancement_budget_fraction / 1000)
+        query = enhanced or request.query
+        response, remaining = await self._search(request, query)
+        response.metadata.enhanced_query = query if query != request.query else None
+        return response, remaining, query
+
+    async def _search_local(self, request: SearchRequest) -> Optional[SearchResponse]:
+        """Answer a local_first request from the profile index; None means search Exa."""
+        if not request.local_first or self.profile_index is None:
+            return None
+        try:
+            results = await asyncio.to_thread(self.profile_index.search, request.query, request.limit)
+        except Exception as e:
+            logger.warning(f"Local profile index search failed; using Exa: {e!r}")
+            results = None
+        if results is None:
+            metrics.increment("profile_index_fallback_total")
+            return None
+        return SearchResponse(results=results, metadata=SearchMetadata(total_results=len(results), search_time_ms=0.0))
+
+    async def _run_speculative(
+        self,
+        request: SearchRequest,
+        start: float,
+        budget_ms: int,
+        enhancement_timeout: float
+    ) -> Tuple[Tuple[SearchResponse, List[Dict[str, Any]]], QueryPath, float]:
+        """
+        Start the original-query search immediately alongside enhancement. An enhanced search
+        is only used if enhancement succeeds in time and the enhanced search finishes within the
+        remaining budget; otherwise the original-query result is returned.
+        """
+        original_task = asyncio.create_task(self._search(request, request.query))
+        try:
+            enhanced, enhancement_ms = await self._enhance(request, enhancement_timeout)
+            if enhanced and enhanced != request.query:
+                remaining = budget_ms / 1000 - (time.monotonic() - start)
+                try:
+                    result = await asyncio.wait_for(self._search(request, enhanced), timeout=max(0.0, remaining))
+                    return result, QueryPath.SPECULATIVE_ENHANCED, enhancement_ms
+                except asyncio.TimeoutError:
+                    logger.info("Enhanced search missed the budget; using speculative original-query results")
+                except Exception as e:
+                    logger.warning(f"Enhanced search failed ({e}); using speculative original-query results")
+            return await original_task, QueryPath.SPECULATIVE_ORIGINAL, enhancement_ms
+        finally:
+            if not original_task.done():
+                original_task.cancel()
+
+
+@lru_cache(maxsize=1)
+def get_search_pipeline() -> SearchPipeline:
+    """Return the shared SearchPipeline wired to the shared Exa, Gemini, continuation, index and cache services."""
+    return SearchPipeline(
+        get_exa_service(),
+        get_gemini_service(),
+        get_continuation_service(),
+        get_profile_index() if settings.profile_index_enabled else None,
+        get_query_cache() if settings.query_cache_enabled else None
+    )
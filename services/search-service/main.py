@@ -1,27 +1,115 @@
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
 import uvicorn
-from fastapi import FastAPI
+import math
+import asyncio
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 import logging
 
-from app.core.database import close_mongo_client, get_mongo_client
+from app.core.config import settings
+from app.core.database import close_mongo_client
+from app.core.limiter import ProviderOverloadedError
+from app.core.metrics import metrics
 from app.routers import health, search
+from app.services import (
+    get_cache_service,
+    get_continuation_service,
+    get_exa_service,
+    get_gemini_service,
+    get_profile_cache_service,
+    get_prewarm_service,
+    get_profile_index,
+)
 
 # --- Basic logging setup ---
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+
+
+def _ensure_indexes() -> None:
+    get_cache_service().ensure_indexes()
+    get_continuation_service().ensure_indexes()
+    get_profile_cache_service().ensure_indexes()
+    get_prewarm_service().ensure_indexes()
+
+
+def _warm_up() -> None:
+    """
+    Create MongoDB indexes and (unless disabled) import SDKs / build clients off the request path.
+    Each step is independent so one unavailable dependency does not block the others.
+    """
+    started = time.perf_counter()
+    steps = [("exa", get_exa_service), ("gemini", get_gemini_service)] if settings.warm_up_clients else []
+    # --- MongoDB last: it is the only step that waits on the network ---
+    steps.append(("mongodb", _ensure_indexes))
+    for name, step in steps:
+        try:
+            step()
+        except Exception as e:
+            metrics.increment("startup_warmup_failed_total", component=name)
+            logger.warning(f"Warm-up of {name} failed; it will be retried on first use: {e}")
+    metrics.set_gauge("startup_warmup_ms", round((time.perf_counter() - started) * 1000, 1))
+    logger.info(f"Warm-up finished in {time.perf_counter() - started:.2f}s")
+
+
+async def _refresh_profile_index() -> None:
+    """Load the on-disk index, then periodically fold newly cached profiles into it."""
+    index = get_profile_index()
+    build = False
+    while True:
+        try:
+            await asyncio.to_thread(index.refresh, build)
+        except Exception as e:
+            metrics.increment("profile_index_refresh_failed_total")
+            logger.warning(f"Profile index refresh failed; keeping the current snapshot: {e}")
+        build = True
+        await asyncio.sleep(settings.profile_index_refresh_seconds)
+
+
+async def _prewarm_popular_queries() -> None:
+    """
+    After a startup delay, keep popular queries warm: each tick one process may claim the
+    interval's refresh lease, and every worker loads newly warmed results into its cache.
+    """
+    prewarm = get_prewarm_service()
+    await asyncio.sleep(settings.prewarm_startup_delay_seconds)
+    while True:
+        try:
+            await prewarm.run_once()
+        except Exception as e:
+            metrics.increment("prewarm_run_failed_total")
+            logger.warning(f"Cache pre-warm failed; retrying next tick: {e}")
+        # --- Lease attempts and loads are cheap; ticking faster than the interval picks up another process's run sooner ---
+        await asyncio.sleep(min(60, settings.prewarm_interval_seconds))
+
+
 # --- Startup/Shutdown Events ---
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    #  --- Startup: Ensure MongoDB connection is ready ---
-    try:
-        get_mongo_client() 
-        logger.info("MongoDB connection established")
-    except Exception as e:
-        logger.warning(f"MongoDB connection failed on startup: {e}")
+    #  --- Startup: serve immediately; clients and indexes are warmed in the background ---
+    metrics.set_gauge("startup_import_ms", round(_IMPORT_SECONDS * 1000, 1))
+    logger.info(f"Application modules imported in {_IMPORT_SECONDS * 1000:.0f}ms")
+    warm_up = asyncio.create_task(asyncio.to_thread(_warm_up))
+    index_refresh = asyncio.create_task(_refresh_profile_index()) if settings.profile_index_enabled else None
+    prewarm = (
+        asyncio.create_task(_prewarm_popular_queries())
+        if settings.prewarm_enabled and settings.query_cache_enabled else None
+    )
     yield
     # --- Shutdown: Close connections ----
+    for task in (index_refresh, prewarm):
+        if task is not None:
+            task.cancel()
+    if not warm_up.done():
+        await asyncio.wait({warm_up}, timeout=5)
     close_mongo_client()
     logger.info("MongoDB connection closed")
 
@@ -41,15 +129,32 @@ app.add_middleware(
     allow_headers=["*", "Authorization"],  
 )
 
+# --- Optional in-process compression for clients that reach the service without the gateway ---
+if settings.gzip_responses:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_min_bytes, compresslevel=5)
+
+# --- Upstream overload degrades to a fast 503 instead of a generic 500 ---
+@app.exception_handler(ProviderOverloadedError)
+async def provider_overloaded_handler(request: Request, exc: ProviderOverloadedError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"Upstream provider {exc.provider} is overloaded. Please retry shortly."},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
 # -- Mount Routers ---
 app.include_router(health.router)
 app.include_router(search.router)
 
 if __name__ == "__main__":
+    # --- Production: WORKERS=<cores>; development: RELOAD=true (single process) ---
     uvicorn.run(
         "main:app",
-        host="0.0.0.0",
-        port=8001,
-        reload=True,
+        host=settings.host,
+        port=settings.port,
+        workers=settings.workers,
+        reload=settings.reload,
+        timeout_keep_alive=settings.keep_alive_seconds,
+        timeout_graceful_shutdown=settings.graceful_shutdown_seconds,
         log_level="info"
     )
\ No newline at end of file
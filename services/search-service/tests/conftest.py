@@ -0,0 +1,13 @@
+import pytest
+from app.core import resilience
+from app.core.limiter import reset_limiters
+
+
+@pytest.fixture(autouse=True)
+def reset_provider_state():
+    """Breakers, latency samples and limiters are process-wide; never let one test's failures leak into the next."""
+    resilience.reset()
+    reset_limiters()
+    yield
+    resilience.reset()
+    reset_limiters()
@@ -0,0 +1,86 @@
+"""
+Test suite for JWT verification and the verified-token cache.
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+
+from app.core import auth
+from app.core.config import settings
+from app.core.token_cache import VerifiedTokenCache
+
+
+def make_token(sub: str = "user-1", exp_in: float = 3600, secret: str = None) -> str:
+    claims = {"sub": sub, "aud": "authenticated", "exp": int(time.time() + exp_in)}
+    return jwt.encode(claims, secret or settings.supabase_jwt_secret, algorithm="HS256")
+
+
+def authenticate(token: str) -> str:
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return asyncio.run(auth.get_current_user(credentials))
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    auth.token_cache.clear()
+    yield
+    auth.token_cache.clear()
+
+
+class TestVerifiedTokenCache:
+    """Tests for expiry and eviction."""
+
+    def test_entry_expires_with_the_token(self):
+        cache = VerifiedTokenCache(max_entries=10, max_ttl=300)
+        cache.put("token", "user-1", exp=time.time() + 0.05)
+        assert cache.get("token") == "user-1"
+        time.sleep(0.06)
+        assert cache.get("token") is None
+        assert len(cache) == 0
+
+    def test_ttl_is_capped(self):
+        cache = VerifiedTokenCache(max_entries=10, max_ttl=0.05)
+        cache.put("token", "user-1", exp=time.time() + 3600)
+        time.sleep(0.06)
+        assert cache.get("token") is None
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = VerifiedTokenCache(max_entries=2, max_ttl=300)
+        exp = time.time() + 3600
+        cache.put("a", "user-a", exp)
+        cache.put("b", "user-b", exp)
+        cache.get("a")
+        cache.put("c", "user-c", exp)
+        assert cache.get("b") is None
+        assert cache.get("a") == "user-a"
+        assert cache.get("c") == "user-c"
+
+    def test_tokens_without_exp_are_not_cached(self):
+        cache = VerifiedTokenCache(max_entries=10, max_ttl=300)
+        cache.put("token", "user-1", exp=None)
+        assert cache.get("token") is None
+
+
+class TestGetCurrentUser:
+    """Tests for cached verification in the auth dependency."""
+
+    def test_repeat_requests_skip_verification(self):
+        token = make_token()
+        with patch.object(auth.jwt, "decode", wraps=jwt.decode) as decode:
+            assert authenticate(token) == "user-1"
+            assert authenticate(token) == "user-1"
+        assert decode.call_count == 1
+
+    def test_invalid_token_is_rejected_and_not_cached(self):
+        token = make_token(secret="wrong-secret")
+        for _ in range(2):
+            with pytest.raises(HTTPException) as exc_info:
+                authenticate(token)
+            assert exc_info.value.status_code == 401
+        assert len(auth.token_cache) == 0
@@ -0,0 +1,112 @@
+"""
+Test suite for server-side search continuation ("load more").
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from app.services.continuation_service import ContinuationService, InvalidCursorError, decode_cursor
+
+
+class FakeContinuationCollection:
+    """In-memory stand-in for the search_continuations collection ($slice projection only)."""
+
+    def __init__(self):
+        self.docs = {}
+        self.find_calls = []
+
+    def insert_one(self, doc):
+        self.docs[doc["_id"]] = dict(doc)
+
+    def find_one(self, query, projection=None):
+        self.find_calls.append(projection)
+        doc = self.docs.get(query["_id"])
+        if doc is None or doc["user_id"] != query["user_id"] or doc["expires_at"] <= query["expires_at"]["$gt"]:
+            return None
+        offset, limit = projection["results"]["$slice"]
+        return {**doc, "results": doc["results"][offset:offset + limit]}
+
+
+def raw_result(i: int) -> dict:
+    return {
+        "id": f"https://www.linkedin.com/in/person-{i}",
+        "url": f"https://www.linkedin.com/in/person-{i}",
+        "title": f"Person {i}",
+        "author": f"Person {i}",
+        "image": None,
+        "text": f"- ### Engineer at [Company {i}]\n2020 - Present",
+    }
+
+
+@pytest.fixture
+def service():
+    service = ContinuationService()
+    collection = FakeContinuationCollection()
+    service._db = MagicMock()
+    service._db.__getitem__.side_effect = lambda name: collection
+    return service
+
+
+class TestContinuationService:
+    """Tests for storing a result window and paging through it."""
+
+    def test_pages_through_stored_window(self, service):
+        cursor = service.save("user-1", "find engineers", "linkedin profile", None, [raw_result(i) for i in range(25)])
+
+        first = service.load_page("user-1", cursor, limit=10)
+        second = service.load_page("user-1", first.metadata.next_cursor, limit=10)
+        last = service.load_page("user-1", second.metadata.next_cursor, limit=10)
+
+        assert [r.author for r in first.results] == [f"Person {i}" for i in range(10)]
+        assert second.results[0].author == "Person 10"
+        assert len(last.results) == 5
+        assert last.metadata.next_cursor is None
+        assert last.results[0].work_experience[0].company == "Company 20"
+
+    def test_only_requested_slice_is_read(self, service):
+        cursor = service.save("user-1", "q", "linkedin profile", None, [raw_result(i) for i in range(30)])
+        token, _ = decode_cursor(cursor)
+
+        service.load_page("user-1", f"{token}.20", limit=5)
+
+        assert service.continuations.find_calls[-1] == {"results": {"$slice": [20, 5]}}
+
+    def test_other_users_cannot_use_the_cursor(self, service):
+        cursor = service.save("user-1", "q", "linkedin profile", None, [raw_result(0)])
+
+        assert service.load_page("user-2", cursor) is None
+
+    def test_expired_window_is_not_served(self, service):
+        cursor = service.save("user-1", "q", "linkedin profile", None, [raw_result(0)])
+        token, _ = decode_cursor(cursor)
+        service.continuations.docs[token]["expires_at"] = datetime.utcnow() - timedelta(seconds=1)
+
+        assert service.load_page("user-1", cursor) is None
+
+    def test_malformed_cursor_is_rejected(self, service):
+        with pytest.raises(InvalidCursorError):
+            service.load_page("user-1", "no-offset")
+
+
+class TestExaWindow:
+    """Tests for fetching a window while parsing only the first page."""
+
+    def test_only_first_page_is_parsed(self):
+        from app.services import exa_service as module
+
+        response = MagicMock()
+        response.results = [raw_result(i) for i in range(30)]
+        response.auto_date = response.autoprompt_string = response.resolved_search_type = None
+        response.cost_dollars = None
+        with patch.object(module.exa_py, "Exa") as exa_cls:
+            exa_cls.return_value.search_and_contents.return_value = response
+            service = module.ExaService()
+            with patch("app.models.parsers.PersonResultParser.extract_fields", wraps=module.PersonResultParser.extract_fields) as extract:
+                page, remaining = service.search_window("find engineers", limit=10, window=30)
+
+        assert exa_cls.return_value.search_and_contents.call_args.kwargs["num_results"] == 30
+        assert len(page.results) == 10
+        assert extract.call_count == 10
+        assert len(remaining) == 20
+        assert remaining[0]["id"] == "https://www.linkedin.com/in/person-10"
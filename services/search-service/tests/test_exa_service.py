@@ -61,7 +61,7 @@ class TestExaServiceInitialization:
             ExaService()
 
     @patch('app.services.exa_service.settings')
-    @patch('app.services.exa_service.Exa')
+    @patch('app.services.exa_service.exa_py.Exa')
     def test_init_with_valid_api_key(self, mock_exa, mock_settings):
         """Test successful initialization with valid API key."""
         mock_settings.exa_api_key = "test_api_key"
@@ -78,7 +78,7 @@ class TestExaServiceSearchLinkedIn:
     """Tests for the search_linkedin method."""
 
     @patch('app.services.exa_service.settings')
-    @patch('app.services.exa_service.Exa')
+    @patch('app.services.exa_service.exa_py.Exa')
     def test_search_linkedin_success(self, mock_exa, mock_settings):
         """Test successful LinkedIn search."""
         # Setup
@@ -110,7 +110,7 @@ class TestExaServiceSearchLinkedIn:
         assert result == {"results": [{"id": "test", "title": "Test Person"}], "searchTime": 1234.5}
 
     @patch('app.services.exa_service.settings')
-    @patch('app.services.exa_service.Exa')
+    @patch('app.services.exa_service.exa_py.Exa')
     def test_search_linkedin_default_parameters(self, mock_exa, mock_settings):
         """Test LinkedIn search with default parameters."""
         mock_settings.exa_api_key = "test_key"
@@ -136,7 +136,7 @@ class TestExaServiceSearchLinkedIn:
         )
 
     @patch('app.services.exa_service.settings')
-    @patch('app.services.exa_service.Exa')
+    @patch('app.services.exa_service.exa_py.Exa')
     def test_search_linkedin_api_exception(self, mock_exa, mock_settings):
         """Test LinkedIn search when API raises exception."""
         mock_settings.exa_api_key = "test_key"
@@ -409,7 +409,7 @@ def mock_exa_service():
 def exa_service_with_mock_client():
     """Fixture that provides an ExaService with a mocked Exa client."""
     with patch('app.services.exa_service.settings') as mock_settings, \
-         patch('app.services.exa_service.Exa') as mock_exa:
+         patch('app.services.exa_service.exa_py.Exa') as mock_exa:
         
         mock_settings.exa_api_key = "test_key"
         mock_client = Mock()
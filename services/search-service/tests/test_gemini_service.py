@@ -3,6 +3,8 @@ Test suite for the Gemini Service.
 Includes smoke tests, unit tests, and integration tests for query enhancement functionality.
 """
 
+import logging
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from app.services.gemini_service import GeminiService, gemini_service
@@ -146,7 +148,7 @@ class TestGeminiServiceQueryEnhancement:
 
     @patch('app.services.gemini_service.settings')
     @patch('app.services.gemini_service.genai.Client')
-    def test_enhance_query_api_exception(self, mock_client, mock_settings):
+    def test_enhance_query_api_exception(self, mock_client, mock_settings, caplog):
         """Test query enhancement when API call raises exception."""
         # Arrange
         mock_settings.gemini_api_key = "test_key"
@@ -160,12 +162,12 @@ class TestGeminiServiceQueryEnhancement:
         original_query = "find engineers"
 
         # Act
-        with patch('builtins.print') as mock_print:
+        with caplog.at_level(logging.WARNING, logger="app.services.gemini_service"):
             result = service.enhance_query(original_query, "linkedin profile", 10)
 
         # Assert
         assert result == original_query
-        mock_print.assert_called_once_with("Gemini enhancement failed: API Error")
+        assert "Gemini enhancement failed: API Error" in caplog.text
 
     @patch('app.services.gemini_service.settings')
     @patch('app.services.gemini_service.genai.Client')
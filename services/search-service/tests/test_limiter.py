@@ -0,0 +1,159 @@
+"""
+Test suite for the per-provider upstream limiter.
+"""
+
+import threading
+import time
+
+from unittest.mock import patch
+
+import pytest
+from app.core.config import settings
+from app.core.limiter import (
+    AdaptiveConcurrencyLimiter,
+    ProviderLimiter,
+    ProviderOverloadedError,
+    TokenBucket,
+    _build_limiter,
+    get_latency_tracker,
+    is_rate_limited,
+)
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def make_limiter(**overrides) -> ProviderLimiter:
+    options = dict(
+        provider="test",
+        rate_per_second=1000.0,
+        burst=1000,
+        max_concurrency=4,
+        max_queue=10,
+        queue_timeout=0.2,
+    )
+    options.update(overrides)
+    return ProviderLimiter(**options)
+
+
+class TestTokenBucket:
+    """Tests for quota enforcement."""
+
+    def test_burst_is_available_immediately(self):
+        bucket = TokenBucket(rate=1.0, capacity=3)
+        assert [bucket.reserve(max_wait=0) for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    def test_reservation_beyond_deadline_is_refused(self):
+        bucket = TokenBucket(rate=1.0, capacity=1)
+        bucket.reserve(max_wait=0)
+        assert bucket.reserve(max_wait=0.1) is None
+        assert bucket.reserve(max_wait=2.0) == pytest.approx(1.0, abs=0.05)
+
+
+class TestAdaptiveConcurrency:
+    """Tests for AIMD adjustments."""
+
+    def test_rate_limit_halves_the_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(max_limit=8, max_queue=10)
+        assert limiter.enter(time.monotonic() + 1)
+        limiter.exit(0.1, rate_limited=True)
+        assert limiter.limit == 4
+
+    def test_fast_successes_grow_the_limit_back(self):
+        limiter = AdaptiveConcurrencyLimiter(max_limit=8, max_queue=10)
+        limiter.limit = 2.0
+        for _ in range(10):
+            limiter.enter(time.monotonic() + 1)
+            limiter.exit(0.1)
+        assert limiter.limit > 2.0
+
+    def test_full_queue_is_rejected_without_waiting(self):
+        limiter = AdaptiveConcurrencyLimiter(max_limit=1, max_queue=0)
+        assert limiter.enter(time.monotonic() + 1)
+        started = time.monotonic()
+        assert limiter.enter(time.monotonic() + 1) is False
+        assert time.monotonic() - started < 0.1
+
+
+class TestProviderLimiter:
+    """Tests for admission, queueing and overload behaviour."""
+
+    def test_exhausted_quota_raises_with_retry_after(self):
+        limiter = make_limiter(rate_per_second=0.5, burst=1, queue_timeout=0.1)
+        with limiter.acquire():
+            pass
+        with pytest.raises(ProviderOverloadedError) as exc_info:
+            with limiter.acquire():
+                pass
+        assert exc_info.value.retry_after > 1.0
+
+    def test_queued_call_runs_when_slot_frees(self):
+        limiter = make_limiter(max_concurrency=1, queue_timeout=1.0)
+        release = threading.Event()
+        admitted = []
+
+        def hold_slot():
+            with limiter.acquire():
+                release.wait(1)
+
+        holder = threading.Thread(target=hold_slot)
+        holder.start()
+        time.sleep(0.05)
+        threading.Timer(0.05, release.set).start()
+
+        with limiter.acquire():
+            admitted.append(True)
+        holder.join()
+        assert admitted == [True]
+
+    def test_latency_window_excludes_time_queued_for_a_slot(self):
+        limiter = make_limiter(max_concurrency=1, queue_timeout=1.0)
+        release = threading.Event()
+
+        def hold_slot():
+            with limiter.acquire():
+                release.wait(1)
+
+        holder = threading.Thread(target=hold_slot)
+        holder.start()
+        time.sleep(0.05)
+        threading.Timer(0.2, release.set).start()
+
+        started = time.monotonic()
+        with limiter.acquire():
+            time.sleep(0.01)
+        queued_call = time.monotonic() - started
+        holder.join()
+
+        samples = sorted(get_latency_tracker("test")._samples)
+        assert queued_call > 0.1
+        assert len(samples) == 2 and samples[0] < 0.1
+
+    def test_deadline_exceeded_while_queued(self):
+        limiter = make_limiter(max_concurrency=1, queue_timeout=0.05)
+        with limiter.acquire():
+            with pytest.raises(ProviderOverloadedError, match="concurrency_limited"):
+                with limiter.acquire():
+                    pass
+
+    def test_upstream_429_shrinks_concurrency(self):
+        limiter = make_limiter(max_concurrency=4)
+        with pytest.raises(RateLimitError):
+            with limiter.acquire():
+                raise RateLimitError()
+        assert int(limiter.concurrency.limit) == 2
+
+
+def test_is_rate_limited_detects_common_shapes():
+    assert is_rate_limited(RateLimitError())
+    assert is_rate_limited(Exception("Request failed with status code 429"))
+    assert not is_rate_limited(ValueError("bad request"))
+
+
+def test_provider_quota_is_split_across_processes():
+    with patch.object(settings, "process_count", 4):
+        limiter = _build_limiter("exa")
+    assert limiter.bucket.rate == pytest.approx(settings.exa_requests_per_second / 4)
+    assert limiter.bucket.capacity == max(1, settings.exa_burst // 4)
+    assert limiter.concurrency.max_limit == -(-settings.exa_max_concurrency // 4)
@@ -0,0 +1,167 @@
+"""
+Test suite for pre-warming the query cache from popular historical queries.
+"""
+
+import time
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pymongo
+import pytest
+from app.core.config import settings
+from app.core.limiter import ProviderOverloadedError
+from app.models.search import PersonResult, SearchMetadata, SearchResponse
+from app.services.prewarm_service import PrewarmService, popular_queries_pipeline
+from app.services.query_cache import SemanticQueryCache
+
+
+class FakeDatabase:
+    """user_searches (aggregate / count), prewarmed_searches (upsert / find) and prewarm_runs (lease)."""
+
+    def __init__(self, popular, total_searches):
+        self.popular = popular
+        self.total_searches = total_searches
+        self.prewarmed = {}
+        self.lease = None
+
+    def __getitem__(self, name):
+        return self
+
+    def aggregate(self, pipeline):
+        return list(self.popular)
+
+    def count_documents(self, query):
+        return self.total_searches
+
+    def replace_one(self, query, doc, upsert=False):
+        self.prewarmed[query["_id"]] = {"_id": query["_id"], **doc}
+
+    def find(self, query):
+        return [doc for doc in self.prewarmed.values() if doc["expires_at"] > query["expires_at"]["$gt"]]
+
+    def find_one_and_update(self, query, update, upsert=False, return_document=None):
+        if self.lease is not None and self.lease["expires_at"] >= query["expires_at"]["$lt"]:
+            raise pymongo.errors.DuplicateKeyError("lease held")
+        self.lease = dict(update["$set"])
+        return self.lease
+
+
+class FakePipeline:
+    def __init__(self, overloaded_after=None):
+        self.queries = []
+        self.overloaded_after = overloaded_after
+
+    async def warm(self, request):
+        if self.overloaded_after is not None and len(self.queries) >= self.overloaded_after:
+            raise ProviderOverloadedError("exa", 1.0)
+        self.queries.append(request.query)
+        response = SearchResponse(
+            results=[PersonResult(id=request.query, url="https://www.linkedin.com/in/x")],
+            metadata=SearchMetadata(total_results=1, search_time_ms=5.0, enhanced_query=f"{request.query} (enhanced)")
+        )
+        return response, [{"id": "tail"}], f"{request.query} (enhanced)"
+
+
+POPULAR = [
+    {"query": "senior python devs in Berlin", "category": "linkedin profile", "users": 6},
+    {"query": "fintech startups in London", "category": "company", "users": 3},
+    {"query": "data scientists in Paris", "category": "linkedin profile", "users": 2},
+]
+
+
+@pytest.fixture(autouse=True)
+def fast_runs(monkeypatch):
+    monkeypatch.setattr(settings, "prewarm_search_spacing_ms", 0)
+    monkeypatch.setattr(settings, "prewarm_max_searches", 25)
+
+
+def make_service(pipeline, cache=None, popular=POPULAR, total_searches=20):
+    service = PrewarmService(pipeline, cache or SemanticQueryCache())
+    service._db = FakeDatabase(popular, total_searches)
+    return service
+
+
+class TestPrewarmService:
+    """Tests for refreshing popular queries and loading them into worker caches."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_warms_popular_queries_within_budget(self, monkeypatch):
+        monkeypatch.setattr(settings, "prewarm_max_searches", 2)
+        pipeline = FakePipeline()
+        service = make_service(pipeline)
+
+        summary = await service.refresh()
+
+        assert pipeline.queries == ["senior python devs in Berlin", "fintech startups in London"]
+        assert summary["warmed"] == 2
+        assert summary["coverage_pct"] == 45.0
+        assert len(service.db.prewarmed) == 2
+
+    @pytest.mark.asyncio
+    async def test_provider_overload_stops_the_run(self):
+        pipeline = FakePipeline(overloaded_after=1)
+        service = make_service(pipeline)
+
+        summary = await service.refresh()
+
+        assert summary["warmed"] == 1
+        assert summary["failed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_all_workers_load_warmed_results(self):
+        leader = make_service(FakePipeline())
+        await leader.run_once()
+
+        cache = SemanticQueryCache()
+        worker = make_service(MagicMock(), cache)
+        worker._db = leader.db
+        assert await worker.run_once() is None
+        assert worker.load() == 0
+
+        entry, _ = cache.lookup("linkedin profile", settings.prewarm_limit, "Berlin-based senior Python engineers")
+        assert [r.id for r in entry.response.results] == ["senior python devs in Berlin"]
+        assert entry.remaining == [{"id": "tail"}]
+        assert cache.lookup("company", settings.prewarm_limit, "fintech startups in London (enhanced)") is not None
+
+    @pytest.mark.asyncio
+    async def test_warmed_results_expire_like_any_cache_hit(self):
+        leader = make_service(FakePipeline())
+        await leader.run_once()
+
+        def load_into_new_worker():
+            cache = SemanticQueryCache()
+            worker = make_service(MagicMock(), cache)
+            worker._db = leader.db
+            return worker.load(), cache
+
+        loaded, cache = load_into_new_worker()
+        assert loaded == 3
+        # --- Warmed docs live 2x prewarm_interval_seconds; the cache entry must not outlive the usual TTL ---
+        assert cache._categories["linkedin profile"].expires_at.max() <= time.monotonic() + settings.query_cache_ttl_seconds
+
+        for doc in leader.db.prewarmed.values():
+            doc["refreshed_at"] -= timedelta(seconds=settings.query_cache_ttl_seconds + 1)
+        loaded, cache = load_into_new_worker()
+        assert loaded == 0
+        assert cache.lookup("linkedin profile", settings.prewarm_limit, "Berlin-based senior Python engineers") is None
+
+    def test_one_process_per_interval_holds_the_lease(self):
+        first = make_service(FakePipeline())
+        second = make_service(FakePipeline())
+        second._db = first.db
+        second.owner = "other-host:1"
+
+        assert first.acquire_lease() is True
+        assert second.acquire_lease() is False
+
+        first.db.lease["expires_at"] = datetime.utcnow() - timedelta(seconds=1)
+        assert second.acquire_lease() is True
+
+    def test_popular_queries_pipeline_groups_canonical_queries(self):
+        since = datetime.utcnow()
+        stages = popular_queries_pipeline(since, top=25, min_users=2)
+
+        assert stages[0]["$match"]["timestamp"] == {"$gte": since}
+        assert stages[2]["$group"]["_id"]["query"] == {"$toLower": {"$trim": {"input": "$query"}}}
+        assert {"$match": {"users": {"$gte": 2}}} in stages
+        assert {"$limit": 25} in stages
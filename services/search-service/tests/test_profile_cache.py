@@ -0,0 +1,164 @@
+"""
+Test suite for the profile-level entity cache and its use by ExaService.
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from app.models.parsers import PersonResultParser
+from app.services.profile_cache_service import ProfileCacheService, canonical_profile_url
+
+
+class FakeProfileCollection:
+    """In-memory stand-in for the profile_entities collection ($in lookups, bulk upserts)."""
+
+    def __init__(self):
+        self.docs = {}
+        self.find_calls = 0
+        self.fail = False
+
+    def find(self, query, projection=None):
+        self.find_calls += 1
+        if self.fail:
+            raise ConnectionError("mongo down")
+        now = query["expires_at"]["$gt"]
+        return [
+            {"_id": key, **self.docs[key]}
+            for key in query["_id"]["$in"]
+            if key in self.docs and self.docs[key]["expires_at"] > now
+        ]
+
+    def bulk_write(self, operations, ordered=True):
+        for operation in operations:
+            self.docs[operation._filter["_id"]] = dict(operation._doc)
+
+
+def raw_result(i: int, role: str = "Engineer") -> dict:
+    return {
+        "id": f"https://www.linkedin.com/in/person-{i}",
+        "url": f"https://www.linkedin.com/in/person-{i}",
+        "title": f"Person {i}",
+        "author": f"Person {i}",
+        "image": None,
+        "text": f"- ### {role} at [Company {i}]\n2020 - Present",
+    }
+
+
+def exa_response(results):
+    return SimpleNamespace(
+        results=results, auto_date=None, autoprompt_string=None, resolved_search_type=None, cost_dollars=None
+    )
+
+
+@pytest.fixture
+def collection():
+    return FakeProfileCollection()
+
+
+@pytest.fixture
+def cache(collection):
+    cache = ProfileCacheService()
+    cache._db = MagicMock()
+    cache._db.__getitem__.side_effect = lambda name: collection
+    return cache
+
+
+@pytest.fixture
+def exa(cache):
+    from app.services import exa_service as module
+
+    with patch.object(module.exa_py, "Exa") as exa_cls:
+        service = module.ExaService(profile_cache=cache)
+    return service
+
+
+class TestCanonicalProfileUrl:
+    """Tests for collapsing URL variants of one profile."""
+
+    @pytest.mark.parametrize("url", [
+        "https://www.linkedin.com/in/Jane-Doe/",
+        "http://uk.linkedin.com/in/jane-doe?trk=public_profile#about",
+        "linkedin.com/in/jane-doe",
+    ])
+    def test_variants_share_a_key(self, url):
+        assert canonical_profile_url(url) == "linkedin.com/in/jane-doe"
+
+
+class TestProfileCacheService:
+    """Tests for storing and looking up parsed profiles."""
+
+    def test_round_trip_by_canonical_url(self, cache):
+        raw = raw_result(1)
+        cache.put_many([(raw, {"author": "Person 1"})])
+
+        hits = cache.get_many(["https://uk.linkedin.com/in/person-1/", "https://www.linkedin.com/in/person-2"])
+
+        assert list(hits) == ["linkedin.com/in/person-1"]
+        assert hits["linkedin.com/in/person-1"]["raw"] == raw
+
+    def test_expired_profiles_are_misses(self, cache, collection):
+        cache.put_many([(raw_result(1), {})])
+        collection.docs["linkedin.com/in/person-1"]["expires_at"] = datetime.utcnow() - timedelta(seconds=1)
+
+        assert cache.get_many([raw_result(1)["url"]]) == {}
+
+    def test_errors_bypass_the_cache(self, cache, collection):
+        collection.fail = True
+
+        assert cache.get_many([raw_result(1)["url"]]) == {}
+        assert cache.get_many([raw_result(1)["url"]]) == {}
+        assert collection.find_calls == 1
+        assert cache.available is False
+
+
+class TestExaServiceWithProfileCache:
+    """Tests for reusing cached profiles across searches."""
+
+    def test_unchanged_profiles_are_not_reparsed(self, exa):
+        exa.client.search_and_contents.return_value = exa_response([raw_result(i) for i in range(5)])
+        first = exa.search_linkedin("find engineers", limit=5)
+
+        exa.client.search_and_contents.return_value = exa_response(
+            [raw_result(i) for i in range(5)] + [raw_result(5)]
+        )
+        with patch.object(PersonResultParser, "extract_fields", wraps=PersonResultParser.extract_fields) as extract:
+            second = exa.search_linkedin("engineers please", limit=6)
+
+        assert extract.call_count == 1
+        assert [r.model_dump() for r in second.results[:5]] == [r.model_dump() for r in first.results]
+        assert second.results[5].author == "Person 5"
+
+    def test_changed_profiles_are_reparsed(self, exa):
+        exa.client.search_and_contents.return_value = exa_response([raw_result(1)])
+        exa.search_linkedin("q", limit=1)
+
+        exa.client.search_and_contents.return_value = exa_response([raw_result(1, role="Director")])
+        page = exa.search_linkedin("q", limit=1)
+
+        assert page.results[0].work_experience[0].title == "Director"
+
+    def test_ids_first_fetches_contents_only_for_misses(self, exa):
+        exa.client.search_and_contents.return_value = exa_response([raw_result(i) for i in range(3)])
+        exa.search_linkedin("q", limit=3)
+        exa._hit_ratio = 1.0
+
+        listing = [SimpleNamespace(**{**raw_result(i), "text": None}) for i in (4, 0, 1, 2)]
+        exa.client.search.return_value = exa_response(listing)
+        exa.client.get_contents.return_value = exa_response([raw_result(4)])
+        page, remaining = exa.search_window("q", limit=2, window=4)
+
+        assert exa.client.search.call_args.kwargs["contents"] is False
+        assert exa.client.get_contents.call_args.args[0] == [raw_result(4)["url"]]
+        assert [r.author for r in page.results] == ["Person 4", "Person 0"]
+        assert [r["author"] for r in remaining] == ["Person 1", "Person 2"]
+        assert remaining[0]["text"] == raw_result(1)["text"]
+
+    def test_low_hit_ratio_uses_one_contents_call(self, exa):
+        exa.client.search_and_contents.return_value = exa_response([raw_result(i) for i in range(3)])
+
+        exa.search_linkedin("q", limit=3)
+
+        exa.client.search.assert_not_called()
+        exa.client.get_contents.assert_not_called()
@@ -0,0 +1,110 @@
+"""
+Test suite for the local profile index (hashed embeddings + inverted index, mmap snapshots).
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from app.core.embeddings import embed, query_terms
+from app.services import profile_index as module
+from app.services.profile_index import ProfileIndex
+
+
+class FakeProfileCache:
+    """Stand-in for ProfileCacheService.updated_since over an in-memory profile list."""
+
+    def __init__(self):
+        self.docs = []
+
+    def add(self, key, title, skills, location="Berlin, Germany", company="Acme"):
+        self.docs.append({
+            "_id": key,
+            "updated_at": datetime.utcnow() + timedelta(milliseconds=len(self.docs)),
+            "fields": {
+                "id": key, "url": f"https://{key}", "title": title, "author": key, "location": location,
+                "summary": None, "image": None, "skills": skills,
+                "work_experience": [{"title": title, "company": company, "duration": None, "location": None}],
+                "education": [],
+            },
+        })
+
+    def updated_since(self, since, limit):
+        return sorted((doc for doc in self.docs if doc["updated_at"] > since), key=lambda doc: doc["updated_at"])[:limit]
+
+
+@pytest.fixture
+def cache():
+    cache = FakeProfileCache()
+    cache.add("linkedin.com/in/ana", "Senior Python Engineer", ["Python", "Django"])
+    cache.add("linkedin.com/in/ben", "Python Backend Engineer", ["Python", "FastAPI"])
+    cache.add("linkedin.com/in/cem", "Data Scientist", ["Python", "PyTorch"], location="Paris, France")
+    cache.add("linkedin.com/in/dan", "Frontend Engineer", ["React", "TypeScript"])
+    return cache
+
+
+@pytest.fixture
+def index(cache, tmp_path):
+    index = ProfileIndex(str(tmp_path), cache, dim=256)
+    index.refresh()
+    return index
+
+
+class TestEmbeddings:
+    """Tests for the hashed embedding and query tokenization."""
+
+    def test_rows_are_normalized_and_deterministic(self):
+        vectors = embed(["python engineer in berlin", "python engineer in berlin", ""], 128)
+
+        assert abs(float(vectors[0] @ vectors[0]) - 1.0) < 1e-5
+        assert (vectors[0] == vectors[1]).all()
+        assert not vectors[2].any()
+
+    def test_query_terms_drop_stopwords_and_fold_plurals(self):
+        assert query_terms("Find Python engineers in Berlin") == ["python", "engineer", "berlin"]
+
+
+class TestProfileIndex:
+    """Tests for building, sharing and querying index snapshots."""
+
+    def test_term_filter_and_ranking(self, index):
+        results = index.search("python engineers in berlin", limit=2)
+
+        assert [r.author for r in results] == ["linkedin.com/in/ana", "linkedin.com/in/ben"]
+
+    def test_insufficient_matches_fall_back(self, index):
+        assert index.search("python engineers in berlin", limit=3) is None
+        assert index.search("rust engineers", limit=1) is None
+
+    def test_incremental_refresh_embeds_only_new_profiles(self, index, cache):
+        cache.add("linkedin.com/in/eva", "Staff Python Engineer", ["Python", "Go"])
+
+        with patch.object(module, "embed", wraps=module.embed) as embed_spy:
+            assert index.refresh() is True
+
+        assert len(embed_spy.call_args.args[0]) == 1
+        assert index.size == 5
+        assert len(index.search("python engineers in berlin", limit=3)) == 3
+
+    def test_changed_profile_replaces_its_row(self, index, cache):
+        cache.add("linkedin.com/in/dan", "Python Engineer", ["Python"])
+        index.refresh()
+
+        assert index.size == 4
+        assert len(index.search("python engineers in berlin", limit=3)) == 3
+
+    def test_other_workers_load_the_same_snapshot_without_building(self, index, cache, tmp_path):
+        worker = ProfileIndex(str(tmp_path), cache, dim=256)
+
+        with patch.object(cache, "updated_since") as updated_since:
+            assert worker.refresh(build=False) is True
+
+        updated_since.assert_not_called()
+        assert worker.search("react", limit=1)[0].author == "linkedin.com/in/dan"
+
+    def test_old_snapshots_are_pruned(self, index, cache, tmp_path):
+        for name in ("eva", "fay", "gus"):
+            cache.add(f"linkedin.com/in/{name}", "Engineer", ["Go"])
+            index.refresh()
+
+        assert sorted(p.name for p in tmp_path.glob("v*")) == ["v3", "v4"]
@@ -0,0 +1,111 @@
+"""
+Test suite for the semantic near-duplicate query cache.
+"""
+
+import pytest
+from app.models.search import PersonResult, SearchMetadata, SearchResponse
+from app.services.query_cache import SemanticQueryCache
+
+
+def make_response(*ids) -> SearchResponse:
+    return SearchResponse(
+        results=[PersonResult(id=i, url=f"https://www.linkedin.com/in/{i}") for i in ids],
+        metadata=SearchMetadata(total_results=len(ids), search_time_ms=1.0, next_cursor="token.0")
+    )
+
+
+@pytest.fixture
+def cache():
+    cache = SemanticQueryCache(capacity=4, dim=512, threshold=0.9, ttl_seconds=60)
+    cache.store("linkedin profile", ["senior Python devs in Berlin"], make_response("a", "b"), [{"id": "c"}], limit=2)
+    return cache
+
+
+class TestSemanticQueryCache:
+    """Tests for matching paraphrased queries to cached searches."""
+
+    def test_paraphrase_is_a_hit(self, cache):
+        entry, similarity = cache.lookup("linkedin profile", 2, "Berlin-based senior Python engineers")
+
+        assert similarity >= 0.9
+        assert [r.id for r in entry.response.results] == ["a", "b"]
+        assert entry.remaining == [{"id": "c"}]
+        assert entry.response.metadata.next_cursor is None
+
+    @pytest.mark.parametrize("query", [
+        "senior Python devs in Paris",
+        "junior Python devs in Berlin",
+        "senior Rust devs in Berlin",
+    ])
+    def test_different_searches_miss(self, cache, query):
+        assert cache.lookup("linkedin profile", 2, query) is None
+
+    def test_enhanced_queries_differing_in_one_constraint_miss(self):
+        # --- Gemini-enhanced queries are long enough that one swapped term keeps cosine above 0.9 ---
+        enhanced = (
+            "Senior backend software engineers in {city} with Python, Django, PostgreSQL, AWS, Docker, "
+            "Kubernetes, microservices, REST APIs and CI/CD experience at fintech or SaaS companies"
+        )
+        cache = SemanticQueryCache(capacity=8, dim=512, threshold=0.9, ttl_seconds=60)
+        cache.store("linkedin profile", [enhanced.format(city="Berlin")], make_response("a"), [], limit=1)
+
+        munich = enhanced.format(city="Munich")
+        junior = enhanced.format(city="Berlin").replace("Senior", "Junior")
+        for query in (munich, junior):
+            assert float(cache._embed(query) @ cache._embed(enhanced.format(city="Berlin"))) >= 0.9
+            assert cache.lookup("linkedin profile", 1, query) is None
+
+        reordered = (
+            "Berlin senior backend software engineers with Python, Django, PostgreSQL, AWS, Docker, "
+            "Kubernetes, microservices, REST APIs and CI/CD experience at SaaS or fintech companies"
+        )
+        entry, _ = cache.lookup("linkedin profile", 1, reordered)
+        assert [r.id for r in entry.response.results] == ["a"]
+
+    @pytest.mark.parametrize("threshold, hit", [(0.9, False), (0.7, True)])
+    def test_threshold_bounds_how_much_soft_wording_may_differ(self, threshold, hit):
+        cache = SemanticQueryCache(capacity=8, dim=512, threshold=threshold, ttl_seconds=60)
+        cache.store("linkedin profile", ["senior Python devs in Berlin"], make_response("a"), [], limit=1)
+
+        # --- Same constraints plus three soft descriptors: cosine ~0.76 ---
+        result = cache.lookup("linkedin profile", 1, "experienced senior Python engineers in Berlin with strong skills")
+
+        assert (result is not None) == hit
+
+    def test_soft_wording_never_excuses_a_different_constraint(self):
+        cache = SemanticQueryCache(capacity=8, dim=512, threshold=0.5, ttl_seconds=60)
+        cache.store("linkedin profile", ["experienced senior Python devs in Berlin"], make_response("a"), [], limit=1)
+
+        assert cache.lookup("linkedin profile", 1, "experienced senior Python devs in Munich") is None
+        assert cache.lookup("linkedin profile", 1, "senior Python devs in Berlin") is not None
+
+    def test_vetoed_candidate_does_not_hide_an_exact_match(self):
+        cache = SemanticQueryCache(capacity=8, dim=512, threshold=0.5, ttl_seconds=60)
+        cache.store("linkedin profile", ["senior Python devs in Berlin"], make_response("berlin"), [], limit=1)
+        cache.store("linkedin profile", ["senior Python devs in Munich"], make_response("munich"), [], limit=1)
+
+        entry, _ = cache.lookup("linkedin profile", 1, "Munich senior Python engineers")
+        assert [r.id for r in entry.response.results] == ["munich"]
+
+    def test_category_and_page_size_must_match(self, cache):
+        assert cache.lookup("company", 2, "senior Python devs in Berlin") is None
+        assert cache.lookup("linkedin profile", 5, "senior Python devs in Berlin") is None
+
+    def test_expired_and_evicted_entries_miss(self, cache):
+        entry, _ = cache.lookup("linkedin profile", 2, "senior Python devs in Berlin")
+        cache.evict("linkedin profile", entry)
+        assert cache.lookup("linkedin profile", 2, "senior Python devs in Berlin") is None
+
+        expired = SemanticQueryCache(ttl_seconds=0)
+        expired.store("company", ["fintech startups"], make_response("x"), [], limit=1)
+        assert expired.lookup("company", 1, "fintech startups") is None
+
+    def test_capacity_replaces_oldest(self, cache):
+        for city in ("Paris", "Madrid", "Rome", "Oslo"):
+            cache.store("linkedin profile", [f"designers in {city}"], make_response(city), [], limit=2)
+
+        assert cache.lookup("linkedin profile", 2, "senior Python devs in Berlin") is None
+        assert cache.lookup("linkedin profile", 2, "designers in Oslo") is not None
+
+    def test_overlap(self):
+        assert SemanticQueryCache.overlap(make_response("a", "b"), make_response("b", "c")) == 0.5
@@ -0,0 +1,169 @@
+"""
+Test suite for upstream retries, hedging and circuit breaking.
+"""
+
+import threading
+import time
+
+import pytest
+from app.core import resilience
+from app.core.config import settings
+from app.core.limiter import ProviderOverloadedError
+from app.core.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ErrorClass,
+    call_with_resilience,
+    classify_error,
+)
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    """Keep backoff delays negligible; breaker/latency state is reset in conftest."""
+    monkeypatch.setattr(settings, "retry_base_delay_seconds", 0.001)
+    monkeypatch.setattr(settings, "retry_max_delay_seconds", 0.01)
+
+
+class TestClassifyError:
+    """Tests for retryable vs fatal classification."""
+
+    def test_server_errors_and_timeouts_are_retryable(self):
+        assert classify_error(StatusError(503)) == ErrorClass.RETRYABLE
+        assert classify_error(TimeoutError("read timed out")) == ErrorClass.RETRYABLE
+        assert classify_error(ConnectionError("reset")) == ErrorClass.RETRYABLE
+
+    def test_rate_limits_have_their_own_class(self):
+        assert classify_error(StatusError(429)) == ErrorClass.RATE_LIMITED
+
+    def test_client_errors_and_local_rejections_are_fatal(self):
+        assert classify_error(StatusError(400)) == ErrorClass.FATAL
+        assert classify_error(ValueError("bad input")) == ErrorClass.FATAL
+        assert classify_error(ProviderOverloadedError("exa", 1.0)) == ErrorClass.FATAL
+
+
+class TestRetries:
+    """Tests for call_with_resilience retry behaviour."""
+
+    def test_transient_failure_is_retried(self):
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise StatusError(502)
+            return "ok"
+
+        assert call_with_resilience("test", flaky) == "ok"
+        assert len(calls) == 3
+
+    def test_fatal_failure_is_not_retried(self):
+        calls = []
+
+        def bad_request():
+            calls.append(1)
+            raise StatusError(400)
+
+        with pytest.raises(StatusError):
+            call_with_resilience("test", bad_request)
+        assert len(calls) == 1
+
+    def test_attempts_are_bounded(self):
+        calls = []
+
+        def down():
+            calls.append(1)
+            raise StatusError(503)
+
+        with pytest.raises(StatusError):
+            call_with_resilience("test", down, max_attempts=2)
+        assert len(calls) == 2
+
+
+class TestCircuitBreaker:
+    """Tests for open / half-open / closed transitions."""
+
+    def test_opens_after_threshold_and_fails_fast(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        breaker.record_failure()
+        with pytest.raises(CircuitOpenError) as exc_info:
+            breaker.before_call()
+        assert exc_info.value.retry_after > 1
+
+    def test_half_open_probe_closes_on_success(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()  # --- Only one probe at a time ---
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_open_circuit_skips_the_provider(self, monkeypatch):
+        monkeypatch.setattr(settings, "circuit_failure_threshold", 2)
+        calls = []
+
+        def down():
+            calls.append(1)
+            raise StatusError(503)
+
+        with pytest.raises(StatusError):
+            call_with_resilience("test", down, max_attempts=2)
+        with pytest.raises(CircuitOpenError):
+            call_with_resilience("test", down)
+        assert len(calls) == 2
+
+    def test_reset_closes_open_circuits(self, monkeypatch):
+        monkeypatch.setattr(settings, "circuit_failure_threshold", 1)
+
+        def down():
+            raise StatusError(503)
+
+        with pytest.raises(StatusError):
+            call_with_resilience("test", down, max_attempts=1)
+        assert resilience.get_circuit_breaker("test").state == CircuitBreaker.OPEN
+
+        resilience.reset()
+        assert resilience.get_circuit_breaker("test").state == CircuitBreaker.CLOSED
+
+
+class TestHedging:
+    """Tests for hedged requests on slow idempotent calls."""
+
+    def test_slow_call_is_hedged_and_fastest_wins(self, monkeypatch):
+        monkeypatch.setattr(settings, "hedge_min_samples", 5)
+        tracker = resilience.get_latency_tracker("test")
+        for _ in range(10):
+            tracker.record(0.01)
+
+        calls = []
+        lock = threading.Lock()
+
+        def first_slow():
+            with lock:
+                calls.append(1)
+                attempt = len(calls)
+            time.sleep(0.5 if attempt == 1 else 0.0)
+            return attempt
+
+        started = time.monotonic()
+        assert call_with_resilience("test", first_slow, hedge=True) == 2
+        assert time.monotonic() - started < 0.4
+
+    def test_no_hedge_without_latency_history(self):
+        calls = []
+
+        def call():
+            calls.append(1)
+            return "ok"
+
+        assert call_with_resilience("test", call, hedge=True) == "ok"
+        assert len(calls) == 1
@@ -0,0 +1,60 @@
+"""
+Test suite for server-side result filtering and re-ranking.
+"""
+
+import pytest
+from app.models.search import PersonResult, SearchFilters, WorkExperienceItem
+from app.services.result_filters import ResultFeatures
+
+
+def make_result(result_id, title=None, location=None, skills=(), companies=()) -> PersonResult:
+    return PersonResult(
+        id=result_id,
+        url=f"https://www.linkedin.com/in/{result_id}",
+        title=title,
+        location=location,
+        skills=list(skills),
+        work_experience=[WorkExperienceItem(company=company) for company in companies]
+    )
+
+
+@pytest.fixture
+def features():
+    return ResultFeatures([
+        make_result("a", title="Frontend Developer", location="Paris, France", skills=["React"]),
+        make_result("b", title="Senior Backend Engineer", location="Berlin, Germany",
+                    skills=["Python", "Machine Learning"], companies=["Stripe"]),
+        make_result("c", title="Backend Engineer", location="Berlin", skills=["Python"]),
+        make_result("d", title="Data Engineer", location="Munich", skills=["python", "SQL"], companies=["Google"]),
+    ])
+
+
+def ids(features, order):
+    return ["abcd"[i] for i in order]
+
+
+class TestResultFeatures:
+    """Tests for vectorized filter matching and ranking."""
+
+    def test_phrase_requires_every_term(self, features):
+        assert features.matches("skills", "machine learning").tolist() == [False, True, False, False]
+        assert features.matches("skills", "PYTHON").tolist() == [False, True, True, True]
+        assert not features.matches("skills", "").any()
+
+    def test_strict_keeps_only_full_matches_in_exa_order(self, features):
+        order = features.rank(SearchFilters(skills=["Python"], location="Berlin"))
+
+        assert ids(features, order) == ["b", "c"]
+
+    def test_relaxed_ranks_by_matched_criteria(self, features):
+        order = features.rank(SearchFilters(skills=["Python", "SQL"], companies=["Google", "Stripe"], strict=False))
+
+        assert ids(features, order) == ["d", "b", "c", "a"]
+
+    def test_title_keywords_score_by_share_found(self, features):
+        order = features.rank(SearchFilters(title_keywords=["senior", "backend"]))
+
+        assert ids(features, order) == ["b", "c"]
+
+    def test_no_criteria_keeps_exa_order(self, features):
+        assert ids(features, features.rank(SearchFilters())) == ["a", "b", "c", "d"]
@@ -1 +1,129 @@
-# Integration tests for the API endpoints.
\ No newline at end of file
+# Integration tests for the API endpoints.
+"""
+Tests for the search router: history caching headers and background history writes.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.auth import get_current_user
+from app.models.history import HistoryItem
+from app.models.search import SearchMetadata, SearchResponse
+from app.services import get_cache_service, get_continuation_service, get_search_pipeline
+from app.services.continuation_service import InvalidCursorError
+from main import app
+
+
+class FakePipeline:
+    async def run(self, request, user_id=None):
+        return SearchResponse(
+            results=[],
+            metadata=SearchMetadata(total_results=0, search_time_ms=1.0, enhanced_query=request.query)
+        )
+
+
+@pytest.fixture
+def cache_service():
+    return MagicMock()
+
+
+@pytest.fixture
+def continuation_service():
+    return MagicMock()
+
+
+@pytest.fixture
+def client(cache_service, continuation_service):
+    app.dependency_overrides[get_current_user] = lambda: "user-1"
+    app.dependency_overrides[get_cache_service] = lambda: cache_service
+    app.dependency_overrides[get_continuation_service] = lambda: continuation_service
+    app.dependency_overrides[get_search_pipeline] = lambda: FakePipeline()
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+class TestHistoryEndpoint:
+    """Tests for GET /search/history."""
+
+    def test_returns_history_with_private_cache_header(self, client, cache_service):
+        cache_service.get_history.return_value = [
+            HistoryItem(query="python developers", timestamp=datetime.now(timezone.utc), results_count=3)
+        ]
+
+        response = client.get("/search/history", params={"limit": 5})
+
+        assert response.status_code == 200
+        assert response.json()["history"][0]["query"] == "python developers"
+        assert response.headers["cache-control"].startswith("private, max-age=")
+        cache_service.get_history.assert_called_once_with("user-1", 5)
+
+    def test_database_failure_returns_503(self, client, cache_service):
+        cache_service.get_history.side_effect = RuntimeError("mongo down")
+
+        response = client.get("/search/history")
+
+        assert response.status_code == 503
+        assert "cache-control" not in response.headers
+
+
+class TestSearchEndpoint:
+    """Tests for POST /search/linkedin history recording."""
+
+    def test_search_is_recorded_in_history(self, client, cache_service):
+        response = client.post("/search/linkedin", json={"query": "data engineers in Paris"})
+
+        assert response.status_code == 200
+        cache_service.save_search.assert_called_once()
+        assert cache_service.save_search.call_args.kwargs["user_id"] == "user-1"
+
+    def test_response_is_serialized_directly_from_the_model(self, client):
+        response = client.post("/search/linkedin", json={"query": "data engineers in Paris"})
+
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == {
+            "results": [],
+            "metadata": {
+                "total_results": 0,
+                "search_time_ms": 1.0,
+                "enhanced_query": "data engineers in Paris",
+                "query_path": None,
+                "enhancement_ms": None,
+                "next_cursor": None
+            }
+        }
+
+    def test_history_write_failure_does_not_fail_search(self, client, cache_service):
+        cache_service.save_search.side_effect = RuntimeError("mongo down")
+
+        response = client.post("/search/linkedin", json={"query": "data engineers in Paris"})
+
+        assert response.status_code == 200
+
+
+class TestNextPageEndpoint:
+    """Tests for GET /search/linkedin/next."""
+
+    def test_serves_stored_page(self, client, continuation_service):
+        continuation_service.load_page.return_value = SearchResponse(
+            results=[],
+            metadata=SearchMetadata(total_results=0, search_time_ms=0.5, next_cursor="token.20")
+        )
+
+        response = client.get("/search/linkedin/next", params={"cursor": "token.10", "limit": 10})
+
+        assert response.status_code == 200
+        assert response.json()["metadata"]["next_cursor"] == "token.20"
+        continuation_service.load_page.assert_called_once_with("user-1", "token.10", 10)
+
+    def test_expired_window_returns_404(self, client, continuation_service):
+        continuation_service.load_page.return_value = None
+
+        assert client.get("/search/linkedin/next", params={"cursor": "token.10"}).status_code == 404
+
+    def test_malformed_cursor_returns_400(self, client, continuation_service):
+        continuation_service.load_page.side_effect = InvalidCursorError("bad")
+
+        assert client.get("/search/linkedin/next", params={"cursor": "garbage"}).status_code == 400
@@ -0,0 +1,292 @@
+"""
+Test suite for the latency-budget search pipeline.
+"""
+
+import asyncio
+import time
+
+import pytest
+from app.core.config import settings
+from app.models.search import QueryPath, SearchMetadata, SearchRequest, SearchResponse
+from app.services.search_pipeline import SearchPipeline
+
+
+class FakeGemini:
+    def __init__(self, delay: float, enhanced: str = "enhanced query"):
+        self.delay = delay
+        self.enhanced = enhanced
+
+    def enhance_query(self, original_query: str, category: str, limit: int) -> str:
+        time.sleep(self.delay)
+        return self.enhanced
+
+
+class FakeExa:
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.queries = []
+
+    def search_linkedin(self, query, limit=10, category="linkedin profile", enhanced_query=None):
+        self.queries.append(query)
+        time.sleep(self.delays.get(query, 0.0))
+        return SearchResponse(
+            results=[],
+            metadata=SearchMetadata(total_results=0, search_time_ms=0.0, enhanced_query=enhanced_query)
+        )
+
+
+class FakeWindowExa(FakeExa):
+    def search_window(self, query, limit=10, window=50, category="linkedin profile", enhanced_query=None):
+        page = self.search_linkedin(query, limit, category, enhanced_query)
+        return page, [{"id": f"r{i}", "url": f"u{i}", "text": ""} for i in range(window - limit)]
+
+
+class FakeContinuations:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.saved = []
+
+    def save(self, user_id, query, category, enhanced_query, raw_results):
+        if self.fail:
+            raise ConnectionError("mongo down")
+        self.saved.append((user_id, raw_results))
+        return "token.0"
+
+
+def make_request(**overrides) -> SearchRequest:
+    options = dict(query="find engineers", latency_budget_ms=1000)
+    options.update(overrides)
+    return SearchRequest(**options)
+
+
+@pytest.mark.asyncio
+async def test_fast_enhancement_is_used():
+    exa = FakeExa()
+    response = await SearchPipeline(exa, FakeGemini(delay=0.0)).run(make_request())
+
+    assert exa.queries == ["enhanced query"]
+    assert response.metadata.query_path == QueryPath.ENHANCED
+    assert response.metadata.enhanced_query == "enhanced query"
+    assert response.metadata.search_time_ms > 0
+
+
+@pytest.mark.asyncio
+async def test_slow_enhancement_is_skipped_within_budget():
+    exa = FakeExa()
+    started = time.monotonic()
+    response = await SearchPipeline(exa, FakeGemini(delay=1.0)).run(make_request(latency_budget_ms=500))
+
+    assert time.monotonic() - started < 0.5
+    assert exa.queries == ["find engineers"]
+    assert response.metadata.query_path == QueryPath.ENHANCEMENT_TIMEOUT
+    assert response.metadata.enhanced_query is None
+
+
+@pytest.mark.asyncio
+async def test_unchanged_query_reports_original_path():
+    exa = FakeExa()
+    response = await SearchPipeline(exa, FakeGemini(delay=0.0, enhanced="find engineers")).run(make_request())
+    assert response.metadata.query_path == QueryPath.ORIGINAL
+
+
+@pytest.mark.asyncio
+async def test_speculative_mode_prefers_enhanced_results_in_time():
+    exa = FakeExa()
+    response = await SearchPipeline(exa, FakeGemini(delay=0.05)).run(make_request(speculative=True))
+
+    assert sorted(exa.queries) == ["enhanced query", "find engineers"]
+    assert response.metadata.query_path == QueryPath.SPECULATIVE_ENHANCED
+
+
+@pytest.mark.asyncio
+async def test_speculative_mode_falls_back_when_enhanced_search_is_late():
+    exa = FakeExa(delays={"enhanced query": 2.0})
+    started = time.monotonic()
+    response = await SearchPipeline(exa, FakeGemini(delay=0.0)).run(make_request(speculative=True, latency_budget_ms=500))
+
+    assert time.monotonic() - started < 1.0
+    assert response.metadata.query_path == QueryPath.SPECULATIVE_ORIGINAL
+    assert response.metadata.enhanced_query is None
+
+
+@pytest.mark.asyncio
+async def test_result_window_tail_is_stored_for_next_page():
+    continuations = FakeContinuations()
+    pipeline = SearchPipeline(FakeWindowExa(), FakeGemini(delay=0.0), continuations)
+
+    response = await pipeline.run(make_request(limit=10), user_id="user-1")
+
+    assert response.metadata.next_cursor == "token.0"
+    user_id, stored = continuations.saved[0]
+    assert user_id == "user-1"
+    assert len(stored) == settings.continuation_window_size - 10
+
+
+@pytest.mark.asyncio
+async def test_continuation_store_failure_does_not_fail_search():
+    pipeline = SearchPipeline(FakeWindowExa(), FakeGemini(delay=0.0), FakeContinuations(fail=True))
+
+    response = await pipeline.run(make_request(limit=10), user_id="user-1")
+
+    assert response.metadata.next_cursor is None
+
+
+class FakeProfileIndex:
+    def __init__(self, results=None):
+        self.results = results
+
+    def search(self, query, limit):
+        return self.results
+
+
+@pytest.mark.asyncio
+async def test_local_first_is_answered_from_the_profile_index():
+    from app.models.search import PersonResult
+
+    exa, gemini = FakeExa(), FakeGemini(delay=0.0)
+    index = FakeProfileIndex([PersonResult(id="p1", url="https://www.linkedin.com/in/p1")])
+    response = await SearchPipeline(exa, gemini, profile_index=index).run(make_request(local_first=True))
+
+    assert exa.queries == []
+    assert response.metadata.query_path == QueryPath.LOCAL_INDEX
+    assert [r.id for r in response.results] == ["p1"]
+
+
+@pytest.mark.asyncio
+async def test_local_first_falls_back_to_exa_without_enough_matches():
+    exa = FakeExa()
+    pipeline = SearchPipeline(exa, FakeGemini(delay=0.0), profile_index=FakeProfileIndex(None))
+
+    response = await pipeline.run(make_request(local_first=True))
+
+    assert exa.queries == ["enhanced query"]
+    assert response.metadata.query_path == QueryPath.ENHANCED
+
+
+class FakeIdExa(FakeExa):
+    """Returns one result per call, identified by the query and call number."""
+
+    def search_linkedin(self, query, limit=10, category="linkedin profile", enhanced_query=None):
+        from app.models.search import PersonResult
+
+        self.queries.append(query)
+        result_id = f"{query}-{len(self.queries)}"
+        return SearchResponse(
+            results=[PersonResult(id=result_id, url=f"https://www.linkedin.com/in/{len(self.queries)}")],
+            metadata=SearchMetadata(total_results=1, search_time_ms=0.0, enhanced_query=enhanced_query)
+        )
+
+
+@pytest.mark.asyncio
+async def test_paraphrased_query_is_served_from_the_semantic_cache():
+    from app.services.query_cache import SemanticQueryCache
+
+    exa = FakeExa()
+    pipeline = SearchPipeline(exa, FakeGemini(delay=0.0), query_cache=SemanticQueryCache())
+
+    await pipeline.run(make_request(query="senior Python devs in Berlin"))
+    response = await pipeline.run(make_request(query="Berlin-based senior Python engineers"))
+
+    assert exa.queries == ["enhanced query"]
+    assert response.metadata.query_path == QueryPath.SEMANTIC_CACHE
+
+
+@pytest.mark.asyncio
+async def test_near_identical_enhanced_queries_share_results():
+    from app.services.query_cache import SemanticQueryCache
+
+    exa = FakeExa()
+    pipeline = SearchPipeline(exa, FakeGemini(delay=0.0, enhanced="machine learning engineers in Munich"),
+                              query_cache=SemanticQueryCache())
+
+    await pipeline.run(make_request(query="ML people Munich"))
+    response = await pipeline.run(make_request(query="find machine learning folks near Munich"))
+
+    assert exa.queries == ["machine learning engineers in Munich"]
+    assert response.metadata.query_path == QueryPath.SEMANTIC_CACHE
+    assert response.metadata.enhanced_query == "machine learning engineers in Munich"
+
+
+@pytest.mark.asyncio
+async def test_audited_false_hit_is_evicted(monkeypatch):
+    from app.services.query_cache import SemanticQueryCache
+
+    monkeypatch.setattr(settings, "query_cache_audit_rate", 1.0)
+    exa = FakeIdExa()
+    pipeline = SearchPipeline(exa, FakeGemini(delay=0.0, enhanced="find engineers"), query_cache=SemanticQueryCache())
+
+    await pipeline.run(make_request())
+    hit = await pipeline.run(make_request())
+    await asyncio.gather(*pipeline._audits)
+    after_audit = await pipeline.run(make_request())
+
+    assert hit.metadata.query_path == QueryPath.SEMANTIC_CACHE
+    assert after_audit.metadata.query_path == QueryPath.ORIGINAL
+    assert len(exa.queries) == 3
+
+
+@pytest.mark.asyncio
+async def test_warm_bypasses_the_semantic_cache():
+    from app.services.query_cache import SemanticQueryCache
+
+    exa = FakeExa()
+    pipeline = SearchPipeline(exa, FakeGemini(delay=0.0), query_cache=SemanticQueryCache())
+    await pipeline.run(make_request())
+
+    response, remaining, query = await pipeline.warm(make_request())
+
+    assert exa.queries == ["enhanced query", "enhanced query"]
+    assert query == "enhanced query"
+    assert response.metadata.enhanced_query == "enhanced query"
+
+
+class FakeTitledWindowExa(FakeExa):
+    """A window whose first page holds no backend engineer; the tail holds two."""
+
+    def search_window(self, query, limit=10, window=50, category="linkedin profile", enhanced_query=None):
+        from app.models.search import PersonResult
+
+        self.queries.append(query)
+        page = SearchResponse(
+            results=[PersonResult(id="p0", url="u0", title="Product Designer")],
+            metadata=SearchMetadata(total_results=1, search_time_ms=0.0, enhanced_query=enhanced_query)
+        )
+        tail = [
+            {"id": "t1", "url": "u1", "title": "Backend Engineer", "text": ""},
+            {"id": "t2", "url": "u2", "title": "Recruiter", "text": ""},
+            {"id": "t3", "url": "u3", "title": "Senior Backend Engineer", "text": ""},
+        ]
+        return page, tail
+
+
+@pytest.mark.asyncio
+async def test_filters_rank_the_whole_window_and_keep_the_tail_pageable():
+    from app.models.search import SearchFilters
+
+    continuations = FakeContinuations()
+    pipeline = SearchPipeline(FakeTitledWindowExa(), FakeGemini(delay=0.0), continuations=continuations)
+    request = make_request(limit=1, filters=SearchFilters(title_keywords=["senior", "backend"]))
+
+    response = await pipeline.run(request, user_id="user-1")
+
+    assert [r.id for r in response.results] == ["t3"]
+    assert continuations.saved == [("user-1", [{"id": "t1", "url": "u1", "title": "Backend Engineer", "text": ""}])]
+
+
+@pytest.mark.asyncio
+async def test_refining_a_cached_search_makes_no_exa_call():
+    from app.models.search import SearchFilters
+    from app.services.query_cache import SemanticQueryCache
+
+    exa = FakeTitledWindowExa()
+    pipeline = SearchPipeline(exa, FakeGemini(delay=0.0), continuations=FakeContinuations(),
+                              query_cache=SemanticQueryCache())
+
+    unfiltered = await pipeline.run(make_request(limit=1))
+    refined = await pipeline.run(make_request(limit=1, filters=SearchFilters(title_keywords=["backend"])))
+    again = await pipeline.run(make_request(limit=1))
+
+    assert len(exa.queries) == 1
+    assert refined.metadata.query_path == QueryPath.SEMANTIC_CACHE
+    assert [r.id for r in refined.results] == ["t1"]
+    assert [r.id for r in unfiltered.results] == [r.id for r in again.results] == ["p0"]
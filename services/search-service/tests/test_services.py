@@ -154,4 +154,39 @@ def test_search_handles_exa_api_error(monkeypatch):
     # Act & Assert: Use pytest.raises to confirm that an exception is thrown.
     # The test passes only if the code inside the 'with' block raises the expected error.
     with pytest.raises(Exception, match=error_message):
-        exa_service.search_linkedin(query="a query that will fail")
\ No newline at end of file
+        exa_service.search_linkedin(query="a query that will fail")
+
+# --- PARSER TESTS ---
+
+def test_parser_validates_the_page_once_into_nested_models():
+    """
+    The parser extracts plain dicts and validates the whole page in one pass;
+    the result must still be fully built PersonResult models.
+    """
+    from app.models.parsers import PersonResultParser
+    from app.models.search import EducationItem, PersonResult, WorkExperienceItem
+
+    raw = [{
+        "id": "https://www.linkedin.com/in/jane",
+        "url": "https://www.linkedin.com/in/jane",
+        "title": "Jane Doe",
+        "author": "Jane Doe",
+        "text": "- ### Engineer at [Acme]\n2020 - Present\n## Education\n- ### Master's degree || Physics at [ETH]\nskills: [Python, Go]",
+    }]
+
+    results = PersonResultParser.parse_results(raw)
+
+    assert isinstance(results[0], PersonResult)
+    assert isinstance(results[0].work_experience[0], WorkExperienceItem)
+    assert results[0].work_experience[0].company == "Acme"
+    assert isinstance(results[0].education[0], EducationItem)
+    assert results[0].education[0].institution == "ETH"
+    assert results[0].skills == ["Python", "Go"]
+
+
+def test_parser_still_rejects_malformed_results():
+    from pydantic import ValidationError
+    from app.models.parsers import PersonResultParser
+
+    with pytest.raises(ValidationError):
+        PersonResultParser.parse_results([{"id": None, "url": "https://x", "text": ""}])
@@ -0,0 +1,51 @@
+"""
+Test suite for lazy service initialization and the startup warm-up.
+"""
+
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+from app.services.cache_service import CacheService
+
+
+def test_cache_service_construction_does_no_io():
+    with patch("app.services.cache_service.get_database") as mock_get_database:
+        CacheService()
+    mock_get_database.assert_not_called()
+
+
+def test_indexes_are_created_once():
+    collections = {"user_searches": MagicMock(), "search_cache": MagicMock()}
+    db = MagicMock()
+    db.__getitem__.side_effect = collections.__getitem__
+    with patch("app.services.cache_service.get_database", return_value=db):
+        service = CacheService()
+        service.ensure_indexes()
+        service.ensure_indexes()
+    assert collections["user_searches"].create_index.call_count == 3
+    assert collections["search_cache"].create_index.call_count == 2
+
+
+def test_app_serves_requests_while_mongodb_is_down():
+    from app.core.metrics import metrics
+    from app.services import get_cache_service
+    import main
+
+    get_cache_service.cache_clear()
+    metrics.reset()
+    with patch("app.services.cache_service.get_database", side_effect=ConnectionError("mongo down")):
+        with TestClient(main.app) as client:
+            assert client.get("/").status_code == 200
+    get_cache_service.cache_clear()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["startup_warmup_failed_total{component=mongodb}"] == 1
+    assert "startup_import_ms" in snapshot["gauges"]
+
+
+def test_importing_the_app_defers_heavy_sdks():
+    code = "import sys, main; print(sorted(m for m in ('exa_py', 'google.genai', 'pymongo') if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip().splitlines()[-1] == "[]"